@@ -1,10 +1,10 @@
 from django.contrib import admin
-from .models import JobData, Skill, Benefit, ScrapedHTML  # Added ScrapedHTML import here
+from .models import JobData, Skill, Benefit, ScrapedHTML, HTMLBlob, CrawlTask, GeminiExtraction
 
 @admin.register(JobData)
 class JobDataAdmin(admin.ModelAdmin):
     list_display = ('jobTitle', 'company', 'jobLocation', 'datePosted', 'link')
-    list_filter = ('jobCategory', 'jobIndustry', 'jobType')
+    list_filter = ('jobCategory', 'jobIndustry', 'jobType', 'enrichment_status')
     search_fields = ('jobTitle', 'company', 'jobLocation')
     date_hierarchy = 'datePosted'
 
@@ -20,7 +20,27 @@ class BenefitAdmin(admin.ModelAdmin):
 
 @admin.register(ScrapedHTML)
 class ScrapedHTMLAdmin(admin.ModelAdmin):
-    list_display = ('url', 'scraped_at', 'last_processed', 'processing_success', 'source_domain')
+    list_display = ('url', 'scraped_at', 'last_seen_at', 'last_processed', 'processing_success', 'source_domain')
     list_filter = ('processing_success', 'source_domain')
-    search_fields = ('url',)
-    date_hierarchy = 'scraped_at'
\ No newline at end of file
+    search_fields = ('url', 'content_hash')
+    date_hierarchy = 'scraped_at'
+    raw_id_fields = ('blob',)
+
+@admin.register(HTMLBlob)
+class HTMLBlobAdmin(admin.ModelAdmin):
+    list_display = ('content_hash', 'codec', 'size', 'compressed_size', 'created_at')
+    list_filter = ('codec',)
+    search_fields = ('content_hash',)
+    exclude = ('data',)
+
+@admin.register(CrawlTask)
+class CrawlTaskAdmin(admin.ModelAdmin):
+    list_display = ('url', 'kind', 'state', 'attempts', 'domain_link', 'query', 'updated_at')
+    list_filter = ('kind', 'state', 'domain_link')
+    search_fields = ('url', 'query')
+
+@admin.register(GeminiExtraction)
+class GeminiExtractionAdmin(admin.ModelAdmin):
+    list_display = ('key', 'prompt_version', 'hits', 'created_at', 'last_used_at')
+    list_filter = ('prompt_version',)
+    search_fields = ('key',)
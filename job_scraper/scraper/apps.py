@@ -1,5 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def enable_sqlite_wal(sender, connection, **kwargs):
+    """Switch SQLite databases to write-ahead logging
+
+    With the default rollback journal every reader blocks a committing
+    writer, so under the crawl engines' worker threads a write can wait out
+    the whole busy timeout and the job is lost. In WAL mode readers never
+    block the writer and a commit is a single append to the log.
+    """
+    if connection.vendor == 'sqlite' and getattr(settings, 'SCRAPER_SQLITE_WAL', True):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
 
 class ScraperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'scraper'
\ No newline at end of file
+    name = 'scraper'
+
+    def ready(self):
+        connection_created.connect(enable_sqlite_wal)
@@ -0,0 +1,250 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+import os
+import json
+import math
+import platform
+import time
+import tracemalloc
+from ...models import ScrapedHTML
+from ...scrapers.job_description import JobDescription
+
+STAGES = ['parse', 'clean_html', 'extract', 'clean_data']
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[index]
+
+def summarize(timings, peak_bytes=None):
+    """Per-stage p50/p95 in milliseconds plus pages/sec for a list of page timings"""
+    totals = [sum(timing[stage] for stage in STAGES) for timing in timings]
+    summary = {
+        'pages': len(timings),
+        'pages_per_sec': round(len(totals) / sum(totals), 2) if sum(totals) else 0.0,
+        'stages': {}
+    }
+    for stage in STAGES + ['total']:
+        values = totals if stage == 'total' else [timing[stage] for timing in timings]
+        summary['stages'][stage] = {
+            'p50_ms': round(percentile(values, 50) * 1000, 3),
+            'p95_ms': round(percentile(values, 95) * 1000, 3),
+            'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else 0.0
+        }
+    if peak_bytes is not None:
+        summary['peak_memory_kb'] = round(peak_bytes / 1024, 1)
+    return summary
+
+class Command(BaseCommand):
+    help = 'Benchmark job page extraction over stored HTML and save the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=200,
+                            help='Maximum number of stored pages to benchmark')
+        parser.add_argument('--domain', type=str, default=None,
+                            help='Optional domain to filter by')
+        parser.add_argument('--fixtures', type=str, default=None,
+                            help='Benchmark a fixture set laid out as <host>/*.html instead of the database')
+        parser.add_argument('--export', type=str, default=None,
+                            help='Write the loaded pages to this directory as a fixture set')
+        parser.add_argument('--repeat', type=int, default=1,
+                            help='Times to run over the page set; later runs are warmer')
+        parser.add_argument('--no-memory', action='store_true',
+                            help='Skip the tracemalloc pass that measures peak memory')
+        parser.add_argument('--fake-llm', action='store_true',
+                            help='Include Gemini enrichment through the offline stand-in in the extract stage')
+        parser.add_argument('--llm-latency-ms', type=float, default=500,
+                            help='Stand-in Gemini response latency')
+        parser.add_argument('--output', type=str, default=None,
+                            help='JSON file for the results (defaults to a timestamped file)')
+        parser.add_argument('--compare', type=str, default=None,
+                            help='Earlier results JSON to compare this run against')
+
+    def handle(self, *args, **options):
+        if options['fake_llm']:
+            # Gemini calls are answered offline, so extract includes a simulated round-trip
+            with override_settings(SCRAPER_USE_GEMINI=True, LLM_BACKEND='fake',
+                                   FAKE_LLM_LATENCY_MS=options['llm_latency_ms'], GEMINI_ENRICHMENT_MODE='sync'):
+                processor = JobDescription()
+        else:
+            # Gemini is stubbed out so only local extraction work is measured
+            processor = JobDescription(use_gemini=False)
+            processor.gemini_model = True
+            processor._enhance_with_gemini = lambda job_data, content: job_data
+
+        hosts = {domain.host: domain.link for domain in processor.domains}
+        if options['fixtures']:
+            pages = self._load_fixtures(options['fixtures'], hosts, options['domain'])
+        else:
+            pages = self._load_stored_pages(options['limit'], options['domain'])
+        if not pages:
+            raise CommandError("No pages to benchmark")
+
+        if options['export']:
+            self._export_fixtures(pages, options['export'])
+
+        known_domains = set(hosts.values())
+        skipped = [url for url, domain_link, _ in pages if domain_link not in known_domains]
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"Skipping {len(skipped)} pages from domains missing in domain.csv"))
+        pages = [page for page in pages if page[1] in known_domains]
+
+        self.stdout.write(f"Benchmarking extraction over {len(pages)} pages x {options['repeat']}")
+
+        timings = {}
+        failures = 0
+        for _ in range(options['repeat']):
+            for url, domain_link, html_content in pages:
+                try:
+                    timing = self._time_page(processor, html_content, url, domain_link)
+                except Exception as e:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"  Error extracting {url}: {str(e)}"))
+                    continue
+                timings.setdefault(domain_link, []).append(timing)
+
+        peaks = {} if options['no_memory'] else self._measure_memory(processor, pages)
+
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'parser': processor.html_parser,
+            'source': options['fixtures'] or 'database',
+            'repeat': options['repeat'],
+            'gemini': 'fake' if options['fake_llm'] else 'stub',
+            'failures': failures,
+            'overall': summarize(
+                [timing for domain_timings in timings.values() for timing in domain_timings],
+                max(peaks.values()) if peaks else None
+            ),
+            'domains': {
+                domain_link: summarize(domain_timings, peaks.get(domain_link))
+                for domain_link, domain_timings in sorted(timings.items())
+            }
+        }
+
+        self._report(results)
+
+        output = options['output'] or f"extraction_benchmark_{timezone.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Error reading baseline results: {str(e)}")
+            self._compare(baseline, results)
+
+    def _load_stored_pages(self, limit, domain):
+        """Load (url, domain_link, html) tuples from ScrapedHTML"""
+        query = ScrapedHTML.objects.select_related('blob').order_by('-scraped_at')
+        if domain:
+            query = query.filter(source_domain__contains=domain)
+        return [(record.url, record.source_domain, record.html) for record in query[:limit]]
+
+    def _load_fixtures(self, fixtures_dir, hosts, domain):
+        """Load (url, domain_link, html) tuples from <fixtures_dir>/<host>/*.html"""
+        if not os.path.isdir(fixtures_dir):
+            raise CommandError(f"Fixture directory not found: {fixtures_dir}")
+        pages = []
+        for host in sorted(os.listdir(fixtures_dir)):
+            host_dir = os.path.join(fixtures_dir, host)
+            if not os.path.isdir(host_dir) or (domain and domain not in host):
+                continue
+            domain_link = hosts.get(host.lower(), f"https://{host}")
+            for name in sorted(os.listdir(host_dir)):
+                if name.endswith('.html'):
+                    with open(os.path.join(host_dir, name), encoding='utf-8') as f:
+                        pages.append((f"https://{host}/{name[:-5]}", domain_link, f.read()))
+        return pages
+
+    def _export_fixtures(self, pages, export_dir):
+        """Write pages as a fixture set that --fixtures and replay_crawl can read"""
+        for index, (url, domain_link, html_content) in enumerate(pages):
+            host_dir = os.path.join(export_dir, urlsplit(domain_link).netloc.lower())
+            os.makedirs(host_dir, exist_ok=True)
+            with open(os.path.join(host_dir, f"page-{index:05d}.html"), 'w', encoding='utf-8') as f:
+                f.write(html_content)
+        self.stdout.write(f"Exported {len(pages)} pages to {export_dir}")
+
+    def _time_page(self, processor, html_content, url, domain_link):
+        """Run every extraction stage on one page, returning seconds per stage"""
+        domain_config = processor.domains.get(domain_link)
+        description_tags = domain_config.description_tags
+
+        started = time.perf_counter()
+        soup = BeautifulSoup(html_content, processor.html_parser)
+        parsed_at = time.perf_counter()
+        processor._clean_soup(soup)
+        cleaned_at = time.perf_counter()
+        job_data = processor._extract_job_data(soup, description_tags, url, domain_config)
+        extracted_at = time.perf_counter()
+        if job_data:
+            processor._clean_job_data(job_data)
+        finished = time.perf_counter()
+
+        return {
+            'parse': parsed_at - started,
+            'clean_html': cleaned_at - parsed_at,
+            'extract': extracted_at - cleaned_at,
+            'clean_data': finished - extracted_at
+        }
+
+    def _measure_memory(self, processor, pages):
+        """Peak traced memory per domain, measured in a separate untimed pass"""
+        peaks = {}
+        tracemalloc.start()
+        try:
+            for url, domain_link, html_content in pages:
+                tracemalloc.reset_peak()
+                baseline, _ = tracemalloc.get_traced_memory()
+                try:
+                    self._time_page(processor, html_content, url, domain_link)
+                except Exception:
+                    continue
+                _, peak = tracemalloc.get_traced_memory()
+                peaks[domain_link] = max(peaks.get(domain_link, 0), peak - baseline)
+        finally:
+            tracemalloc.stop()
+        return peaks
+
+    def _report(self, results):
+        """Print a per-domain summary table"""
+        rows = [('ALL', results['overall'])] + list(results['domains'].items())
+        self.stdout.write(f"{'domain':<32} {'pages':>6} {'pages/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'peak KB':>9}")
+        for name, summary in rows:
+            total = summary['stages']['total']
+            self.stdout.write(
+                f"{name:<32} {summary['pages']:>6} {summary['pages_per_sec']:>9} "
+                f"{total['p50_ms']:>9} {total['p95_ms']:>9} {summary.get('peak_memory_kb', '-'):>9}"
+            )
+        self.stdout.write("Stage p50 / p95 (ms), all pages:")
+        for stage in STAGES:
+            stats = results['overall']['stages'][stage]
+            self.stdout.write(f"  {stage:<12} {stats['p50_ms']:>9} {stats['p95_ms']:>9}")
+
+    def _compare(self, baseline, results):
+        """Print p50 changes against an earlier run"""
+        self.stdout.write(f"Compared with {baseline.get('created_at', 'baseline')}:")
+        rows = [('ALL', baseline.get('overall'), results['overall'])]
+        rows += [(name, baseline.get('domains', {}).get(name), summary) for name, summary in results['domains'].items()]
+        for name, before, after in rows:
+            if not before:
+                continue
+            changes = []
+            for stage in STAGES + ['total']:
+                old = before['stages'].get(stage, {}).get('p50_ms')
+                new = after['stages'][stage]['p50_ms']
+                if old:
+                    changes.append(f"{stage} {(new - old) / old * 100:+.0f}%")
+            speedup = after['pages_per_sec'] / before['pages_per_sec'] if before['pages_per_sec'] else 0
+            self.stdout.write(f"  {name:<32} {speedup:.2f}x pages/sec; p50 " + ', '.join(changes))
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import time
+from ...scrapers.query_search import QuerySearch
+from ...scrapers.async_query_search import AsyncQuerySearch
+from ...scrapers.queue_query_search import QueueQuerySearch
+from ...scrapers.pipeline_query_search import PipelineQuerySearch
+from ...scrapers.config_cache import get_job_titles
+from ...models import JobData
+from ...services.llm_usage import get_llm_usage
+
+class Command(BaseCommand):
+    help = 'Crawl all configured domains for the given job titles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=['sequential', 'async', 'queue', 'pipeline'], default=None,
+                            help='Crawl engine to use (defaults to settings.SCRAPER_ENGINE)')
+        parser.add_argument('--query', action='append', default=None,
+                            help='Job title to search; repeatable. Defaults to jobtitlestosearch.csv')
+        parser.add_argument('--domain-concurrency', type=int, default=None,
+                            help='Concurrent requests per domain for the async engine')
+        parser.add_argument('--fetch-workers', type=int, default=None,
+                            help='Download threads for the pipeline engine')
+        parser.add_argument('--parse-workers', type=int, default=None,
+                            help='Parser processes for the pipeline engine (defaults to the CPU count)')
+        parser.add_argument('--resume', action='store_true',
+                            help='Only drain tasks left in the crawl queue by an interrupted run')
+
+    def handle(self, *args, **options):
+        engine = options['engine'] or getattr(settings, 'SCRAPER_ENGINE', 'sequential')
+
+        if options['resume']:
+            scraper = QueueQuerySearch()
+            self.stdout.write(f"Resuming crawl queue: {scraper.queue.counts()}")
+            scraper.resume()
+            self.stdout.write(self.style.SUCCESS(f"Crawl queue drained: {scraper.queue.counts()}"))
+            return
+
+        job_titles = options['query']
+        if not job_titles:
+            try:
+                job_titles = get_job_titles()
+            except Exception as e:
+                raise CommandError(f"Error reading job titles file: {str(e)}")
+
+        self.stdout.write(f"Crawling {len(job_titles)} job titles with the {engine} engine")
+        started = time.monotonic()
+
+        if engine == 'queue':
+            QueueQuerySearch().search_many(job_titles)
+        elif engine in ('async', 'pipeline'):
+            if engine == 'async':
+                scraper = AsyncQuerySearch(domain_concurrency=options['domain_concurrency'])
+            else:
+                scraper = PipelineQuerySearch(fetch_workers=options['fetch_workers'],
+                                              parse_workers=options['parse_workers'])
+            scraper.search_many(
+                job_titles,
+                on_query_done=lambda job_title: self.stdout.write(f"  Finished: {job_title}")
+            )
+        else:
+            scraper = QuerySearch()
+            for job_title in job_titles:
+                scraper.search(job_title)
+                self.stdout.write(f"  Finished: {job_title}")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Crawl finished in {elapsed:.1f}s"))
+
+        usage = get_llm_usage().snapshot()['(total)']
+        if usage['calls']:
+            self.stdout.write(
+                f"Gemini: {usage['calls']} job calls, {usage['errors']} errors, "
+                f"{usage['avg_prompt_tokens']} prompt / {usage['avg_response_tokens']} response tokens on average, "
+                f"{usage['avg_latency_ms']}ms average latency"
+            )
+
+        if getattr(settings, 'GEMINI_ENRICHMENT_MODE', 'sync') == 'deferred':
+            pending = JobData.objects.filter(enrichment_status=JobData.ENRICHMENT_PENDING).count()
+            self.stdout.write(f"{pending} jobs pending enrichment; run 'manage.py enrich_jobs' to fill them in")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+import time
+from ...scrapers.enrichment_worker import EnrichmentWorker
+
+class Command(BaseCommand):
+    help = 'Fill in Gemini fields for jobs saved with enrichment pending'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Enrich at most N jobs')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Jobs claimed and sent to Gemini together')
+        parser.add_argument('--follow', action='store_true',
+                            help='Keep polling for newly saved jobs until interrupted')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Queue jobs that used up their attempts again first')
+
+    def handle(self, *args, **options):
+        worker = EnrichmentWorker(batch_size=options['batch_size'])
+        # Jobs claimed by a worker that stopped without finishing them
+        reclaimed = worker.reclaim_running()
+        if options['retry_failed']:
+            reclaimed += worker.retry_failed()
+
+        self.stdout.write(f"Enriching {worker.pending_count()} pending jobs ({reclaimed} requeued)")
+        started = time.monotonic()
+        try:
+            processed = worker.run(limit=options['limit'], follow=options['follow'])
+        except KeyboardInterrupt:
+            self.stdout.write("Interrupted; unfinished jobs will be requeued on the next run")
+            return
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Enriched {processed} jobs in {elapsed:.1f}s; {worker.pending_count()} still pending"
+        ))
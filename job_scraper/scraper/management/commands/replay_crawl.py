@@ -0,0 +1,169 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+import os
+import tempfile
+import time
+from ...models import JobData, ScrapedHTML
+from ...scrapers.fetch_client import get_fetch_client
+from ...scrapers.replay_server import ReplayServer, REPLAY_JOB_PATH
+from ...scrapers.config_cache import get_domain_registry, get_job_titles
+from ...services.llm_backends import get_llm_backend
+
+class Command(BaseCommand):
+    help = 'Run a full crawl against a local replay of every portal and report throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=['sequential', 'async', 'queue', 'pipeline'], default='async',
+                            help='Crawl engine to benchmark')
+        parser.add_argument('--query', action='append', default=None,
+                            help='Job title to search; repeatable. Defaults to jobtitlestosearch.csv')
+        parser.add_argument('--queries', type=int, default=None,
+                            help='Only use the first N job titles')
+        parser.add_argument('--pages', type=int, default=3,
+                            help='Result pages served per search')
+        parser.add_argument('--jobs-per-page', type=int, default=10,
+                            help='Job links on each result page')
+        parser.add_argument('--latency-ms', type=float, default=50,
+                            help='Base response latency')
+        parser.add_argument('--jitter-ms', type=float, default=0,
+                            help='Extra random latency added to each response')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Fraction of responses answered with 503')
+        parser.add_argument('--throttle-rate', type=float, default=0.0,
+                            help='Fraction of responses answered with 429')
+        parser.add_argument('--fixtures', type=str, default=None,
+                            help='Directory of recorded job pages laid out as <host>/*.html')
+        parser.add_argument('--from-db', type=int, default=0, metavar='N',
+                            help='Replay up to N stored ScrapedHTML pages per domain as job pages')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Seed for latency jitter and error injection')
+        parser.add_argument('--fake-llm', action='store_true',
+                            help='Enrich jobs through the offline Gemini stand-in instead of skipping Gemini')
+        parser.add_argument('--llm-latency-ms', type=float, default=500,
+                            help='Stand-in Gemini response latency')
+        parser.add_argument('--llm-jitter-ms', type=float, default=0,
+                            help='Extra random latency added to each stand-in Gemini response')
+        parser.add_argument('--llm-error-rate', type=float, default=0.0,
+                            help='Fraction of stand-in Gemini calls that fail')
+        parser.add_argument('--llm-throttle-rate', type=float, default=0.0,
+                            help='Fraction of stand-in Gemini calls refused as over quota')
+        parser.add_argument('--database', type=str, default=None,
+                            help='SQLite file the replay crawl writes to and keeps; '
+                                 'defaults to a temporary file deleted afterwards')
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep the temporary replay database and print its path')
+
+    def handle(self, *args, **options):
+        try:
+            domains = list(get_domain_registry())
+        except Exception as e:
+            raise CommandError(f"Error loading domain configuration: {str(e)}")
+
+        job_titles = options['query']
+        if not job_titles:
+            job_titles = get_job_titles()
+        if options['queries']:
+            job_titles = job_titles[:options['queries']]
+
+        recorded_pages = {}
+        if options['from_db']:
+            for domain in domains:
+                records = ScrapedHTML.objects.filter(source_domain=domain.link).select_related('blob')
+                recorded_pages[domain.host] = [record.html for record in records[:options['from_db']]]
+
+        server = ReplayServer(
+            domains,
+            pages=options['pages'],
+            jobs_per_page=options['jobs_per_page'],
+            latency=options['latency_ms'] / 1000,
+            jitter=options['jitter_ms'] / 1000,
+            error_rate=options['error_rate'],
+            throttle_rate=options['throttle_rate'],
+            fixtures_dir=options['fixtures'],
+            recorded_pages=recorded_pages,
+            seed=options['seed']
+        ).start()
+        self.stdout.write(f"Replay server listening on {server.base_url} for {len(server.sites)} domains")
+
+        client = get_fetch_client()
+        client.url_rewriter = server.rewrite
+        try:
+            database = self._use_replay_database(options['database'])
+            # No politeness sleeps, and no real LLM calls: only the scraper's own throughput is
+            # measured, plus the enrichment path when it runs against the stand-in
+            with override_settings(SCRAPER_RATE_LIMIT_ENABLED=False, SCRAPER_USE_GEMINI=options['fake_llm'],
+                                   LLM_BACKEND='fake',
+                                   FAKE_LLM_LATENCY_MS=options['llm_latency_ms'],
+                                   FAKE_LLM_JITTER_MS=options['llm_jitter_ms'],
+                                   FAKE_LLM_ERROR_RATE=options['llm_error_rate'],
+                                   FAKE_LLM_THROTTLE_RATE=options['llm_throttle_rate'],
+                                   FAKE_LLM_SEED=options['seed']):
+                started = time.monotonic()
+                call_command('crawl', engine=options['engine'], query=job_titles, stdout=self.stdout)
+                elapsed = time.monotonic() - started
+                fake_llm = get_llm_backend() if options['fake_llm'] else None
+            jobs_saved = JobData.objects.filter(link__contains=REPLAY_JOB_PATH).count()
+        finally:
+            client.url_rewriter = None
+            server.stop()
+            self._restore_database()
+
+        stats = server.stats
+        pages = stats['search_pages'] + stats['job_pages']
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['engine']} engine: {elapsed:.2f}s, "
+            f"{pages} pages ({pages / elapsed:.1f} pages/sec), "
+            f"{jobs_saved} jobs saved ({jobs_saved / elapsed:.1f} jobs/sec)"
+        ))
+        self.stdout.write(
+            f"  search pages: {stats['search_pages']}, job pages: {stats['job_pages']}, "
+            f"503s: {stats['errors']}, 429s: {stats['throttled']}"
+        )
+        if options['fake_llm']:
+            llm_stats = fake_llm.stats
+            self.stdout.write(
+                f"  stand-in Gemini calls: {llm_stats['calls']}, "
+                f"errors: {llm_stats['errors']}, 429s: {llm_stats['throttled']}"
+            )
+
+        if options['database'] or options['keep']:
+            self.stdout.write(f"  replay database kept at {database}")
+        else:
+            # SQLite's write-ahead log files go with it
+            for path in (database, f'{database}-wal', f'{database}-shm'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _use_replay_database(self, path=None):
+        """Point the default database at a freshly migrated SQLite file and return its path
+
+        The replay crawl stores its pages, jobs and crawl tasks there, so
+        the configured database is never written to.
+        """
+        if connection.vendor != 'sqlite':
+            raise CommandError("replay_crawl needs the SQLite database backend")
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='replay_crawl_', suffix='.sqlite3')
+            os.close(fd)
+
+        self._database_name = settings.DATABASES[connection.alias]['NAME']
+        connection.close()
+        # Worker threads open their connections from the same settings
+        settings.DATABASES[connection.alias]['NAME'] = path
+        connection.settings_dict['NAME'] = path
+        call_command('migrate', verbosity=0, interactive=False)
+        return path
+
+    def _restore_database(self):
+        """Point the default database back at the configured one"""
+        name = getattr(self, '_database_name', None)
+        if name is None:
+            return
+        connection.close()
+        settings.DATABASES[connection.alias]['NAME'] = name
+        connection.settings_dict['NAME'] = name
+        self._database_name = None
@@ -4,7 +4,6 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 import time
 import random
-from bs4 import BeautifulSoup
 from ...models import ScrapedHTML
 from ...scrapers.job_description import JobDescription
 
@@ -24,7 +23,7 @@ class Command(BaseCommand):
         if options['domain']:
             query = query.filter(source_domain__contains=options['domain'])
             
-        records = query.order_by('-scraped_at')[:options['limit']]
+        records = query.select_related('blob').order_by('-scraped_at')[:options['limit']]
         
         # Initialize job description processor
         job_processor = JobDescription()
@@ -36,8 +35,8 @@ class Command(BaseCommand):
             self.stdout.write(f"[{i}/{total}] Processing {record.url}")
             
             try:
-                # Parse the stored HTML
-                soup = BeautifulSoup(record.html_content, 'html.parser')
+                # Parse and clean the stored HTML (decompressed from its blob)
+                soup = job_processor.parse_html(record.html)
                 
                 # Extract job data
                 job_data = job_processor._extract_job_data(
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0002_scrapedhtml'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('search', 'Search page'), ('job', 'Job page')], max_length=10)),
+                ('url', models.URLField(max_length=500)),
+                ('domain_link', models.CharField(max_length=255)),
+                ('query', models.CharField(blank=True, default='', max_length=255)),
+                ('page', models.PositiveIntegerField(default=1)),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('in_flight', 'In flight'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('lease_token', models.CharField(blank=True, default='', max_length=32)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Crawl Task',
+                'verbose_name_plural': 'Crawl Tasks',
+                'indexes': [models.Index(fields=['state', 'kind'], name='scraper_cra_state_6b2afe_idx'), models.Index(fields=['lease_token'], name='scraper_cra_lease_t_7bb8e0_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='crawltask',
+            constraint=models.UniqueConstraint(fields=('kind', 'url'), name='unique_crawl_task'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0003_crawltask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HTMLBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('codec', models.CharField(max_length=10)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('compressed_size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'HTML Blob',
+                'verbose_name_plural': 'HTML Blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='scrapedhtml',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='scrapedhtml',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='scrapedhtml',
+            name='html_content',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='scrapedhtml',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='pages', to='scraper.htmlblob'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Moves HTML stored uncompressed in ScrapedHTML.html_content into HTMLBlob
+
+from django.db import migrations
+
+from scraper.scrapers.html_archive import DEFAULT_CODEC, content_hash, compress_html, decompress_html
+
+
+def archive_html(apps, schema_editor):
+    ScrapedHTML = apps.get_model('scraper', 'ScrapedHTML')
+    HTMLBlob = apps.get_model('scraper', 'HTMLBlob')
+
+    legacy_ids = list(
+        ScrapedHTML.objects.filter(blob__isnull=True).exclude(html_content='').values_list('id', flat=True)
+    )
+    for record_id in legacy_ids:
+        record = ScrapedHTML.objects.get(pk=record_id)
+        digest = content_hash(record.html_content)
+        blob = HTMLBlob.objects.filter(content_hash=digest).first()
+        if blob is None:
+            data = compress_html(record.html_content)
+            blob = HTMLBlob.objects.create(
+                content_hash=digest,
+                codec=DEFAULT_CODEC,
+                data=data,
+                size=len(record.html_content.encode('utf-8')),
+                compressed_size=len(data)
+            )
+        ScrapedHTML.objects.filter(pk=record_id).update(blob=blob, content_hash=digest, html_content='')
+
+
+def restore_html(apps, schema_editor):
+    ScrapedHTML = apps.get_model('scraper', 'ScrapedHTML')
+    for record in ScrapedHTML.objects.filter(blob__isnull=False).select_related('blob').iterator():
+        ScrapedHTML.objects.filter(pk=record.pk).update(
+            html_content=decompress_html(record.blob.data, record.blob.codec),
+            blob=None,
+            content_hash=''
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0004_html_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(archive_html, restore_html),
+    ]
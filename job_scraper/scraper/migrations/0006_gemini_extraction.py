@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0005_archive_existing_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeminiExtraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('prompt_version', models.PositiveIntegerField()),
+                ('fields', models.JSONField(default=dict)),
+                ('raw_response', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Gemini Extraction',
+                'verbose_name_plural': 'Gemini Extractions',
+                'indexes': [models.Index(fields=['last_used_at'], name='scraper_gem_last_us_d8413d_idx'), models.Index(fields=['created_at'], name='scraper_gem_created_580b18_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0006_gemini_extraction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdata',
+            name='description',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='jobdata',
+            name='enrichment_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobdata',
+            name='enrichment_status',
+            field=models.CharField(choices=[('none', 'Not needed'), ('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='none', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='jobdata',
+            index=models.Index(fields=['enrichment_status'], name='scraper_job_enrichm_8d5f6c_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0007_jobdata_enrichment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdata',
+            name='enrichment_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,11 @@
-from django.db import models
+import logging
+from django.db import models, transaction, IntegrityError, OperationalError
+from django.db.models import ProtectedError
+from django.utils import timezone
+
+from .scrapers.html_archive import DEFAULT_CODEC, content_hash, compress_html, decompress_html
+
+logger = logging.getLogger(__name__)
 
 class Skill(models.Model):
     skill_1 = models.CharField(max_length=255, blank=True, null=True)
@@ -41,6 +48,19 @@ class Benefit(models.Model):
         return ', '.join([b for b in benefits if b])
 
 class JobData(models.Model):
+    ENRICHMENT_NONE = 'none'
+    ENRICHMENT_PENDING = 'pending'
+    ENRICHMENT_RUNNING = 'running'
+    ENRICHMENT_DONE = 'done'
+    ENRICHMENT_FAILED = 'failed'
+    ENRICHMENT_CHOICES = [
+        (ENRICHMENT_NONE, 'Not needed'),
+        (ENRICHMENT_PENDING, 'Pending'),
+        (ENRICHMENT_RUNNING, 'Running'),
+        (ENRICHMENT_DONE, 'Done'),
+        (ENRICHMENT_FAILED, 'Failed'),
+    ]
+
     jobTitle = models.CharField(max_length=255)
     jobCategory = models.CharField(max_length=255, blank=True, null=True)
     jobIndustry = models.CharField(max_length=255, blank=True, null=True)
@@ -60,26 +80,147 @@ class JobData(models.Model):
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE, null=True, blank=True)
     benefit = models.ForeignKey(Benefit, on_delete=models.CASCADE, null=True, blank=True)
 
+    # Deferred Gemini enrichment: the text to send is kept until the worker has used it
+    enrichment_status = models.CharField(max_length=10, choices=ENRICHMENT_CHOICES, default=ENRICHMENT_NONE)
+    enrichment_attempts = models.PositiveIntegerField(default=0)
+    enrichment_claimed_at = models.DateTimeField(null=True, blank=True)
+    description = models.TextField(blank=True, default='')
+
     def __str__(self):
         return f"{self.jobTitle} at {self.company}" if self.company else self.jobTitle
 
     class Meta:
         ordering = ['-datePosted']
+        indexes = [
+            models.Index(fields=['enrichment_status']),
+        ]
         verbose_name = 'Job Data'
         verbose_name_plural = 'Job Data'
 
-# ADD this new model after the existing models in scraper/models.py
+class HTMLBlob(models.Model):
+    """Compressed page HTML, stored once per distinct content hash"""
+    content_hash = models.CharField(max_length=64, unique=True)
+    codec = models.CharField(max_length=10)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField()
+    compressed_size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.compressed_size}/{self.size} bytes)"
+
+    @property
+    def html(self):
+        return decompress_html(self.data, self.codec)
+
+    class Meta:
+        verbose_name = "HTML Blob"
+        verbose_name_plural = "HTML Blobs"
+
+class ScrapedHTMLManager(models.Manager):
+    # Tries at storing a page before a "database is locked" error is raised
+    STORE_ATTEMPTS = 3
+
+    def store(self, url, html_content, source_domain):
+        """Store a fetched page, returning (record, changed)
+
+        Pages are deduplicated by content hash. Refetching a page whose
+        HTML has not changed only bumps last_seen_at. A write that outlasts
+        the SQLite busy timeout under heavy contention is tried again.
+        """
+        for attempt in range(1, self.STORE_ATTEMPTS + 1):
+            try:
+                return self._store(url, html_content, source_domain)
+            except OperationalError as e:
+                # Every step is keyed by URL or content hash, so a retry picks up where it failed
+                if 'locked' not in str(e) or attempt == self.STORE_ATTEMPTS:
+                    raise
+                logger.warning(f"Storing {url} timed out on a locked database, retrying: {str(e)}")
+
+    def _store(self, url, html_content, source_domain):
+        """Store a fetched page once; see store()"""
+        digest = content_hash(html_content)
+        now = timezone.now()
+
+        existing = self.filter(url=url).first()
+        if existing and existing.content_hash == digest:
+            self.filter(pk=existing.pk).update(last_seen_at=now)
+            existing.last_seen_at = now
+            return existing, False
+
+        blob = HTMLBlob.objects.filter(content_hash=digest).first()
+        if blob is None:
+            data = compress_html(html_content)
+            try:
+                blob = HTMLBlob.objects.create(
+                    content_hash=digest,
+                    codec=DEFAULT_CODEC,
+                    data=data,
+                    size=len(html_content.encode('utf-8')),
+                    compressed_size=len(data)
+                )
+            except IntegrityError:
+                # Another writer stored the same content first
+                blob = HTMLBlob.objects.get(content_hash=digest)
+
+        # Single write statements only: on SQLite a transaction that reads
+        # before writing fails at once with "database is locked" when another
+        # writer holds the lock, instead of waiting out the busy timeout
+        fields = {
+            'blob': blob,
+            'content_hash': digest,
+            'html_content': '',
+            'scraped_at': now,
+            'last_seen_at': now,
+            'source_domain': source_domain
+        }
+        if not self.filter(url=url).update(**fields):
+            try:
+                with transaction.atomic():
+                    self.create(url=url, **fields)
+            except IntegrityError:
+                # Another writer stored the page first
+                self.filter(url=url).update(**fields)
+        record = self.get(url=url)
+
+        # Drop the previous version unless another page shares it; the
+        # PROTECT foreign key refuses the delete if one does, including a
+        # page that started using it since the check. The page is already
+        # stored, so a delete that times out only leaves an unused blob
+        old_blob_id = existing.blob_id if existing else None
+        if old_blob_id and old_blob_id != blob.pk:
+            try:
+                HTMLBlob.objects.filter(pk=old_blob_id).delete()
+            except (ProtectedError, IntegrityError):
+                pass
+            except OperationalError as e:
+                logger.warning(f"Could not drop old HTML blob {old_blob_id} of {url}: {str(e)}")
+
+        return record, True
 
 class ScrapedHTML(models.Model):
     url = models.URLField(unique=True)
-    html_content = models.TextField()
+    # Legacy uncompressed storage; new pages live in blob
+    html_content = models.TextField(blank=True, default='')
+    blob = models.ForeignKey(HTMLBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='pages')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
     scraped_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
     last_processed = models.DateTimeField(null=True, blank=True)
     processing_success = models.BooleanField(default=False)
     source_domain = models.CharField(max_length=255)
+
+    objects = ScrapedHTMLManager()
     
     def __str__(self):
         return f"HTML for {self.url} ({self.scraped_at.strftime('%Y-%m-%d')})"
+
+    @property
+    def html(self):
+        """The page HTML, decompressed from its blob when archived"""
+        if self.blob_id:
+            return self.blob.html
+        return self.html_content
     
     class Meta:
         indexes = [
@@ -90,3 +231,70 @@ class ScrapedHTML(models.Model):
         verbose_name = "Scraped HTML"
         verbose_name_plural = "Scraped HTMLs"
 
+class CrawlTask(models.Model):
+    """A durable unit of crawl work: one search results page or one job page"""
+    KIND_SEARCH = 'search'
+    KIND_JOB = 'job'
+    KIND_CHOICES = [
+        (KIND_SEARCH, 'Search page'),
+        (KIND_JOB, 'Job page'),
+    ]
+
+    STATE_PENDING = 'pending'
+    STATE_IN_FLIGHT = 'in_flight'
+    STATE_DONE = 'done'
+    STATE_FAILED = 'failed'
+    STATE_CHOICES = [
+        (STATE_PENDING, 'Pending'),
+        (STATE_IN_FLIGHT, 'In flight'),
+        (STATE_DONE, 'Done'),
+        (STATE_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    url = models.URLField(max_length=500)
+    domain_link = models.CharField(max_length=255)
+    query = models.CharField(max_length=255, blank=True, default='')
+    page = models.PositiveIntegerField(default=1)
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default=STATE_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    lease_token = models.CharField(max_length=32, blank=True, default='')
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.url} ({self.state})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'url'], name='unique_crawl_task'),
+        ]
+        indexes = [
+            models.Index(fields=['state', 'kind']),
+            models.Index(fields=['lease_token']),
+        ]
+        verbose_name = 'Crawl Task'
+        verbose_name_plural = 'Crawl Tasks'
+
+class GeminiExtraction(models.Model):
+    """Cached Gemini extraction result for one description text and prompt version"""
+    key = models.CharField(max_length=64, unique=True)
+    prompt_version = models.PositiveIntegerField()
+    fields = models.JSONField(default=dict)
+    raw_response = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    hits = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key[:12]} (v{self.prompt_version}, {self.hits} hits)"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_used_at']),
+            models.Index(fields=['created_at']),
+        ]
+        verbose_name = 'Gemini Extraction'
+        verbose_name_plural = 'Gemini Extractions'
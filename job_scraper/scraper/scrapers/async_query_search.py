@@ -0,0 +1,157 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+
+from .fetch_client import get_fetch_client
+from .query_search import QuerySearch
+from .rate_limiter import get_rate_limiter
+from .concurrency import get_concurrency_controller
+from .frontier import get_frontier
+
+
+class AsyncQuerySearch(QuerySearch):
+    """Asyncio crawl engine searching all domains in parallel"""
+
+    def __init__(self, domain_concurrency=None, max_workers=None):
+        """Initialize the engine with adaptive per-domain concurrency caps
+
+        Each domain's cap starts at SCRAPER_DOMAIN_CONCURRENCY and is then
+        tuned by the shared AIMD controller; passing domain_concurrency
+        resets every domain to that starting value.
+        """
+        super().__init__()
+        self.concurrency = get_concurrency_controller()
+        if domain_concurrency:
+            for domain in self.domains:
+                self.concurrency.configure(domain.link, domain_concurrency)
+        self.max_workers = max_workers or getattr(settings, 'SCRAPER_MAX_WORKERS', 32)
+
+    def search(self, query):
+        """Search for jobs using the given query across all domains"""
+        self.search_many([query])
+
+    def search_many(self, queries, on_query_done=None):
+        """Search all queries across all domains concurrently"""
+        asyncio.run(self._crawl(queries, on_query_done))
+
+    async def _crawl(self, queries, on_query_done):
+        """Run every query against every domain under per-domain limits"""
+        # Blocking fetch and extraction calls run on this pool so the loop stays free
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Warm the seen-set off the loop; it reads every known URL from the database
+        self._frontier = await self._run_db(get_frontier)
+
+        try:
+            for coro in asyncio.as_completed([self._search_query(query) for query in queries]):
+                query = await coro
+                if on_query_done:
+                    on_query_done(query)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    async def _search_query(self, query):
+        """Search one query across all domains in parallel"""
+        print(f"Searching for: {query}")
+
+        results = await asyncio.gather(
+            *(self._search_domain_async(domain, query) for domain in self.domains),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error searching for '{query}': {str(result)}")
+
+        return query
+
+    async def _run_limited(self, domain_link, url, func, *args, **kwargs):
+        """Run a blocking fetch on the worker pool under the domain's concurrency cap
+
+        The rate limiter is awaited on the loop so worker threads never sit
+        sleeping; func must be told not to throttle again.
+        """
+        loop = asyncio.get_running_loop()
+        limit = self.concurrency.limit_for(domain_link)
+        await limit.acquire_async()
+        try:
+            await get_rate_limiter().wait_async(url)
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, throttle=False, **kwargs)
+            )
+        finally:
+            limit.release()
+
+    async def _run_db(self, func, *args):
+        """Run a database-bound call on the worker pool, closing the thread's connection after
+
+        A connection left open on a pool thread is only closed whenever the
+        garbage collector gets to it, possibly after its database is gone.
+        """
+        def call():
+            try:
+                return func(*args)
+            finally:
+                close_old_connections()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def _search_domain_async(self, domain, query):
+        """Walk a domain's result pages, fetching job pages concurrently"""
+        domain_link = domain.link
+        job_link_path = domain.job_link_path
+        search_url = self._build_search_url(domain.search_link, query)
+
+        print(f"Searching {domain_link} for '{query}'")
+
+        job_tasks = []
+        page = 1
+        page_url = search_url
+
+        while True:
+            try:
+                response = await self._run_limited(domain_link, page_url, get_fetch_client().get, page_url)
+            except Exception as e:
+                print(f"Error processing page {page} for {domain_link}: {str(e)}")
+                break
+
+            if response.status_code != 200:
+                if page == 1:
+                    print(f"Error: {page_url} returned status code {response.status_code}")
+                break
+
+            job_urls = self._extract_job_links(response.text, domain_link, job_link_path)
+            if not job_urls:
+                print(f"Found 0 job links on {page_url}")
+                break
+
+            # Known links, including ones another query already scheduled, are never fetched
+            new_job_urls = self._frontier.claim_new(job_urls)
+            print(f"Found {len(job_urls)} job links ({len(new_job_urls)} new) on {page_url}")
+            if not new_job_urls:
+                # Everything deeper in the results has most likely been crawled too
+                break
+
+            for job_url in new_job_urls:
+                job_tasks.append(asyncio.create_task(self._process_job_async(job_url, domain_link)))
+
+            if not domain.paginate:
+                break
+
+            page += 1
+            page_url = self._build_page_url(search_url, page)
+
+        await asyncio.gather(*job_tasks)
+
+    async def _process_job_async(self, job_url, domain_link):
+        """Extract and save a single job page"""
+        try:
+            html_content = await self._run_limited(
+                domain_link, job_url, self.job_description.fetch_job_page, job_url
+            )
+            if html_content is None:
+                return
+            # Parsing, saving and Gemini run after the domain's slot is released,
+            # so their time is not counted against the site's concurrency
+            await self._run_db(self.job_description.process_job_html, job_url, html_content, domain_link)
+        except Exception as e:
+            print(f"Error processing job page {job_url}: {str(e)}")
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from django.conf import settings
+
+from .rate_limiter import domain_key
+
+# Responses that mean the host wants us to back off
+OVERLOAD_STATUSES = (429, 503)
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD concurrency limit for a single domain
+
+    The limit grows by roughly one slot per window of successful requests
+    while short-term latency stays close to the long-term average, and is
+    cut multiplicatively on 429/503 responses or timeouts.
+    """
+
+    def __init__(self, initial_limit, min_limit=1, max_limit=16,
+                 increase=1.0, decrease=0.5, latency_tolerance=1.5):
+        """Initialize the limit for one domain"""
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+
+        # Fast and slow moving averages of response time in seconds
+        self.latency = None
+        self.baseline_latency = None
+        self._last_decrease = 0.0
+
+        self.requests = 0
+        self.throttled = 0
+        self.timeouts = 0
+
+        self._cond = threading.Condition()
+        # (loop, event) pairs of coroutines waiting in acquire_async
+        self._async_waiters = []
+
+    def _has_slot(self):
+        """Whether the current limit allows another request; call with the lock held"""
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+    def try_acquire(self):
+        """Take a slot if the current limit allows it"""
+        with self._cond:
+            if self._has_slot():
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        """Block until a slot is available"""
+        with self._cond:
+            while not self._has_slot():
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """Wait on the event loop until a slot is available"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._has_slot():
+                    self.in_flight += 1
+                    return
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1].wait()
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    def release(self):
+        """Give back a slot"""
+        with self._cond:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._notify()
+
+    def _notify(self):
+        """Wake waiters after a slot frees up or the limit grows; call with the lock held
+
+        Blocked threads are woken through the condition and coroutines
+        through their events, on whichever loop each is waiting; every
+        waiter checks for a slot again when it wakes.
+        """
+        self._cond.notify_all()
+        for loop, event in self._async_waiters:
+            loop.call_soon_threadsafe(event.set)
+        self._async_waiters.clear()
+
+    def reset(self, initial_limit):
+        """Restart the limit at a new value, keeping track of requests in flight"""
+        with self._cond:
+            self.limit = min(max(float(initial_limit), self.min_limit), self.max_limit)
+            self._notify()
+
+    def record_response(self, latency, status_code):
+        """Feed one response into the controller"""
+        with self._cond:
+            self.requests += 1
+            if status_code in OVERLOAD_STATUSES:
+                self.throttled += 1
+                self._back_off()
+                return
+
+            if self.latency is None:
+                self.latency = self.baseline_latency = latency
+            else:
+                self.latency = 0.3 * latency + 0.7 * self.latency
+                self.baseline_latency = 0.02 * latency + 0.98 * self.baseline_latency
+
+            # Additive increase: about one extra slot per `limit` stable responses
+            if self.latency <= self.baseline_latency * self.latency_tolerance:
+                self.limit = min(self.limit + self.increase / self.limit, self.max_limit)
+            self._notify()
+
+    def record_timeout(self):
+        """Feed a timed-out or dropped request into the controller"""
+        with self._cond:
+            self.requests += 1
+            self.timeouts += 1
+            self._back_off()
+
+    def _back_off(self):
+        """Multiplicative decrease, at most once per observed round trip"""
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit * self.decrease, self.min_limit)
+
+    def snapshot(self):
+        """Return the current state for status reporting"""
+        with self._cond:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+                'baseline_latency_ms': round(self.baseline_latency * 1000) if self.baseline_latency is not None else None,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'timeouts': self.timeouts,
+            }
+
+
+class ConcurrencyController:
+    """Registry of adaptive concurrency limits keyed by domain"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _new_limit(self, initial_limit=None):
+        """Create a limit using the configured bounds"""
+        return AdaptiveConcurrencyLimit(
+            initial_limit or getattr(settings, 'SCRAPER_DOMAIN_CONCURRENCY', 4),
+            min_limit=getattr(settings, 'SCRAPER_MIN_DOMAIN_CONCURRENCY', 1),
+            max_limit=getattr(settings, 'SCRAPER_MAX_DOMAIN_CONCURRENCY', 16),
+        )
+
+    def configure(self, url, initial_limit):
+        """Reset the limit of the URL's domain to a starting value
+
+        An existing limit is reset in place, so requests already holding
+        one of its slots still count against it.
+        """
+        key = domain_key(url)
+        with self._lock:
+            limit = self._limits.get(key)
+            if limit is None:
+                self._limits[key] = self._new_limit(initial_limit)
+                return
+        limit.reset(initial_limit)
+
+    def limit_for(self, url):
+        """Return the limit for the URL's domain, creating it on first use"""
+        key = domain_key(url)
+        limit = self._limits.get(key)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.get(key)
+                if limit is None:
+                    limit = self._limits[key] = self._new_limit()
+        return limit
+
+    def snapshot(self):
+        """Return the state of every domain seen so far"""
+        with self._lock:
+            limits = dict(self._limits)
+        return {key: limit.snapshot() for key, limit in sorted(limits.items())}
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_concurrency_controller():
+    """Return the process-wide concurrency controller"""
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = ConcurrencyController()
+    return _controller
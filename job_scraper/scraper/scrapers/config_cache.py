@@ -0,0 +1,105 @@
+import os
+import csv
+import threading
+from django.conf import settings
+
+from .domain_registry import DomainRegistry
+from .rate_limiter import get_rate_limiter
+
+
+class ConfigFileCache:
+    """Parsed configuration files shared by the whole process
+
+    Each file is parsed once and parsed again only after its modification
+    time changes, so edits to the CSV files take effect without a restart.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache"""
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, path, parse):
+        """Return parse(path), reusing the last result while the file is unchanged"""
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != mtime:
+                entry = (mtime, parse(path))
+                self._entries[path] = entry
+        return entry[1]
+
+    def clear(self):
+        """Forget every parsed file"""
+        with self._lock:
+            self._entries.clear()
+
+
+def read_job_titles(path):
+    """Read the job_title column of a job titles CSV file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [row['job_title'].strip() for row in csv.DictReader(f) if (row.get('job_title') or '').strip()]
+
+
+def read_vocabulary(path):
+    """Read a skill vocabulary CSV into (kind, term, display) entries
+
+    Each row gives a kind (skill or benefit), the display term and
+    optional '|'-separated aliases that are reported as that term.
+    """
+    entries = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            kind = (row.get('kind') or '').strip().lower()
+            term = (row.get('term') or '').strip()
+            if not kind or not term:
+                continue
+            entries.append((kind, term, term))
+            for alias in (row.get('aliases') or '').split('|'):
+                if alias.strip():
+                    entries.append((kind, alias.strip(), term))
+    return tuple(entries)
+
+
+_config_cache = ConfigFileCache()
+
+# Returned while the vocabulary file is missing; the same object each time
+NO_VOCABULARY = ()
+
+# The registry whose rate limits the shared rate limiter was last given
+_limited_registry = None
+_limited_registry_lock = threading.Lock()
+
+
+def get_domain_registry():
+    """Return the DomainRegistry for domain.csv, reloaded when the file changes
+
+    Each newly loaded registry's rate limits and bursts are applied to the
+    shared rate limiter, so edited limits and new domains take effect too.
+    """
+    global _limited_registry
+    registry = _config_cache.load(os.path.join(settings.CSV_FILE_DIR, 'domain.csv'), DomainRegistry.from_csv)
+    if registry is not _limited_registry:
+        with _limited_registry_lock:
+            if registry is not _limited_registry:
+                get_rate_limiter().configure_domains(registry)
+                _limited_registry = registry
+    return registry
+
+
+def get_job_titles():
+    """Return the job titles from jobtitlestosearch.csv, reloaded when the file changes"""
+    return list(_config_cache.load(os.path.join(settings.CSV_FILE_DIR, 'jobtitlestosearch.csv'), read_job_titles))
+
+
+def get_curated_vocabulary():
+    """Return the entries of the curated skill vocabulary file, reloaded when it changes"""
+    path = getattr(settings, 'SCRAPER_SKILL_VOCABULARY_FILE', None) or os.path.join(settings.CSV_FILE_DIR, 'skill_vocabulary.csv')
+    try:
+        return _config_cache.load(path, read_vocabulary)
+    except FileNotFoundError:
+        return NO_VOCABULARY
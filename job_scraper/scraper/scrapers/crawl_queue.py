@@ -0,0 +1,117 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from scraper.models import CrawlTask
+
+
+class CrawlQueue:
+    """Database-backed crawl queue with leases and bounded retries"""
+
+    def __init__(self, lease_seconds=None, max_attempts=None):
+        """Initialize the queue with lease and retry settings"""
+        self.lease_seconds = lease_seconds or getattr(settings, 'SCRAPER_QUEUE_LEASE_SECONDS', 600)
+        self.max_attempts = max_attempts or getattr(settings, 'SCRAPER_QUEUE_MAX_ATTEMPTS', 3)
+
+    def enqueue(self, tasks):
+        """Add tasks, ignoring any (kind, url) already queued
+
+        tasks is an iterable of dicts with kind, url, domain_link and
+        optionally query and page. A job page whose earlier task failed is
+        queued again with fresh attempts, since the frontier only offers a
+        job URL again after its fetch failed.
+        """
+        tasks = list(tasks)
+        CrawlTask.objects.bulk_create(
+            [CrawlTask(**task) for task in tasks],
+            ignore_conflicts=True
+        )
+        job_urls = [task['url'] for task in tasks if task['kind'] == CrawlTask.KIND_JOB]
+        if job_urls:
+            CrawlTask.objects.filter(
+                kind=CrawlTask.KIND_JOB, url__in=job_urls, state=CrawlTask.STATE_FAILED
+            ).update(state=CrawlTask.STATE_PENDING, attempts=0, last_error='')
+
+    def has_unfinished(self):
+        """Check whether an earlier run left pending or in-flight tasks"""
+        return CrawlTask.objects.filter(
+            state__in=[CrawlTask.STATE_PENDING, CrawlTask.STATE_IN_FLIGHT]
+        ).exists()
+
+    def clear_finished_searches(self):
+        """Drop completed search-page tasks so a new crawl searches again"""
+        CrawlTask.objects.filter(
+            kind=CrawlTask.KIND_SEARCH,
+            state__in=[CrawlTask.STATE_DONE, CrawlTask.STATE_FAILED]
+        ).delete()
+
+    def reclaim_expired(self, force=False):
+        """Return in-flight tasks whose lease ran out (or all of them) to pending"""
+        tasks = CrawlTask.objects.filter(state=CrawlTask.STATE_IN_FLIGHT)
+        if not force:
+            tasks = tasks.filter(lease_expires_at__lt=timezone.now())
+        return tasks.update(state=CrawlTask.STATE_PENDING, lease_token='', lease_expires_at=None)
+
+    def claim_batch(self, limit=10):
+        """Lease up to limit pending tasks, job pages first
+
+        The update only touches rows that are still pending, so concurrent
+        workers never lease the same task twice.
+        """
+        self.reclaim_expired()
+
+        ids = list(
+            CrawlTask.objects.filter(state=CrawlTask.STATE_PENDING)
+            .order_by('kind', 'id')  # 'job' sorts before 'search'
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+
+        token = uuid.uuid4().hex
+        CrawlTask.objects.filter(id__in=ids, state=CrawlTask.STATE_PENDING).update(
+            state=CrawlTask.STATE_IN_FLIGHT,
+            lease_token=token,
+            lease_expires_at=timezone.now() + timedelta(seconds=self.lease_seconds)
+        )
+        return list(CrawlTask.objects.filter(lease_token=token).order_by('kind', 'id'))
+
+    def renew(self, task):
+        """Extend a task's lease before working on it
+
+        Returns False if the lease was lost (it expired and another worker
+        reclaimed the task), in which case the task must be skipped.
+        """
+        return bool(CrawlTask.objects.filter(
+            id=task.id, lease_token=task.lease_token, state=CrawlTask.STATE_IN_FLIGHT
+        ).update(lease_expires_at=timezone.now() + timedelta(seconds=self.lease_seconds)))
+
+    def complete(self, task):
+        """Mark a leased task as done"""
+        CrawlTask.objects.filter(id=task.id, lease_token=task.lease_token).update(
+            state=CrawlTask.STATE_DONE,
+            lease_token='',
+            lease_expires_at=None
+        )
+
+    def fail(self, task, error):
+        """Record a failed attempt, putting the task back until it runs out of retries"""
+        attempts = task.attempts + 1
+        state = CrawlTask.STATE_FAILED if attempts >= self.max_attempts else CrawlTask.STATE_PENDING
+        CrawlTask.objects.filter(id=task.id, lease_token=task.lease_token).update(
+            state=state,
+            attempts=attempts,
+            last_error=str(error)[:2000],
+            lease_token='',
+            lease_expires_at=None
+        )
+
+    def counts(self):
+        """Return the number of tasks per kind and state"""
+        counts = {}
+        rows = CrawlTask.objects.values('kind', 'state').annotate(total=Count('id'))
+        for row in rows:
+            counts.setdefault(row['kind'], {})[row['state']] = row['total']
+        return counts
@@ -0,0 +1,121 @@
+import csv
+import math
+import soupsieve as sv
+from urllib.parse import urlsplit
+
+# Generic selectors tried on every job page, in priority order
+TITLE_SELECTORS = [
+    'h1.job-title', 'h1.position-title', '.job-header h1',
+    'h1', 'h2.job-title', '.position-title h1',
+    '[data-automation="job-detail-title"]', '.job-title-header',
+    'header h1', '.job-position h1', '.listing-header h1'
+]
+COMPANY_SELECTORS = [
+    '.company-name', '.employer-name', '.company',
+    '[data-automation="advertiser-name"]', '.job-company',
+    '.company-title', '.employer', '.job-company-name',
+    'span.company', '.listing-company'
+]
+LOCATION_SELECTORS = [
+    '.job-location', '.location', '.job-info .location',
+    '[data-automation="job-location"]', '.job-details .location',
+    '.job-meta .location', 'span.location', '.listing-location'
+]
+JOB_TYPE_SELECTORS = [
+    '.job-type', '.employment-type', '.job-info .type',
+    '[data-automation="job-type"]', '.job-meta .type',
+    'span.job-type', '.listing-job-type'
+]
+
+
+def compile_selectors(selectors):
+    """Compile a list of CSS selectors, or a comma-separated string of them
+
+    Each comma-separated part is compiled on its own so that callers can
+    keep collecting matches part by part, in the order they are listed.
+    """
+    if isinstance(selectors, str):
+        selectors = selectors.split(',')
+    return [sv.compile(selector.strip()) for selector in selectors if selector and selector.strip()]
+
+
+def _text(value):
+    """A CSV cell as a stripped string, with missing cells as ''"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _number(value):
+    """A CSV cell as a float, or None for blank or invalid cells"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+_TITLE = compile_selectors(TITLE_SELECTORS)
+_COMPANY = compile_selectors(COMPANY_SELECTORS)
+_LOCATION = compile_selectors(LOCATION_SELECTORS)
+_JOB_TYPE = compile_selectors(JOB_TYPE_SELECTORS)
+
+
+class DomainConfig:
+    """One job portal from domain.csv, with its CSS selectors compiled"""
+
+    def __init__(self, row):
+        """Initialize the config from a domain.csv row"""
+        self.link = _text(row.get('domain_link'))
+        self.host = urlsplit(self.link).netloc.lower()
+        self.search_link = _text(row.get('domian_search_link'))
+        self.job_link_path = _text(row.get('domain_job_link_path_from_search'))
+        self.keywords = _text(row.get('domain_keywords'))
+        self.description_tags = _text(row.get('domain_job_description_tags'))
+        self.paginate = _text(row.get('domain_pagination')).lower() == 'yes'
+        self.rate_limit = _number(row.get('domain_rate_limit'))
+        self.burst = _number(row.get('domain_burst'))
+
+        self.description_selectors = compile_selectors(self.description_tags)
+        self.title_selectors = _TITLE
+        self.company_selectors = _COMPANY
+        self.location_selectors = _LOCATION
+        self.job_type_selectors = _JOB_TYPE
+
+    @classmethod
+    def generic(cls, description_tags=''):
+        """A config for pages from no known domain, using only the generic selectors"""
+        return cls({'domain_job_description_tags': description_tags})
+
+    def __repr__(self):
+        return f"DomainConfig({self.link!r})"
+
+
+class DomainRegistry:
+    """Every configured domain, looked up by domain link or by URL host"""
+
+    def __init__(self, configs):
+        """Initialize the registry from DomainConfig records, in file order"""
+        self._configs = list(configs)
+        self._by_link = {config.link: config for config in self._configs}
+        self._by_host = {config.host: config for config in self._configs}
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load and compile every row of a domain.csv file"""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return cls(DomainConfig(row) for row in csv.DictReader(f))
+
+    def get(self, domain_link):
+        """Return the config for a domain link, or None"""
+        return self._by_link.get(domain_link)
+
+    def for_url(self, url):
+        """Return the config for the domain serving a URL, or None"""
+        return self._by_host.get(urlsplit(url).netloc.lower())
+
+    def __iter__(self):
+        return iter(self._configs)
+
+    def __len__(self):
+        return len(self._configs)
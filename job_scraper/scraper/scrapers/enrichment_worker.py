@@ -0,0 +1,228 @@
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from scraper.models import JobData, Skill, Benefit
+from scraper.services.gemini_api import merge_fields
+from scraper.services.gemini_async import get_async_gemini_client
+from scraper.services.circuit_breaker import CircuitOpenError, get_gemini_breaker
+from .job_description import JobDescription
+from .rate_limiter import domain_key
+
+logger = logging.getLogger(__name__)
+
+# Job fields Gemini can fill in, besides skills and benefits
+ENRICHED_FIELDS = ('jobCategory', 'jobIndustry', 'education', 'experience', 'jobType')
+
+
+class EnrichmentWorker:
+    """Fill in Gemini fields for jobs the crawl saved with enrichment pending
+
+    Pending jobs are claimed in batches and handed to the async Gemini
+    client together, so they share batch prompts and the request quota,
+    then written back one at a time. A job whose call fails goes back to
+    pending until it has been tried max_attempts times. Claims expire
+    after lease_seconds, so jobs held by a worker that died are picked up
+    again without taking jobs from one that is still running.
+    """
+
+    def __init__(self, batch_size=None, max_attempts=None, poll_interval=None, lease_seconds=None):
+        """Initialize the worker with its batch, retry and lease settings"""
+        self.batch_size = batch_size or getattr(settings, 'GEMINI_ENRICHMENT_BATCH_SIZE', 20)
+        self.max_attempts = max_attempts or getattr(settings, 'GEMINI_ENRICHMENT_MAX_ATTEMPTS', 3)
+        self.poll_interval = poll_interval or getattr(settings, 'GEMINI_ENRICHMENT_POLL_SECONDS', 5)
+        self.lease_seconds = lease_seconds or getattr(settings, 'GEMINI_ENRICHMENT_LEASE_SECONDS', 600)
+        # Parser-only instance, used for its field cleaning
+        self.job_description = JobDescription(use_gemini=False)
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def pending_count(self):
+        """Number of jobs waiting for enrichment"""
+        return JobData.objects.filter(enrichment_status=JobData.ENRICHMENT_PENDING).count()
+
+    def reclaim_running(self):
+        """Return jobs whose claim has expired to pending
+
+        Only claims older than lease_seconds are taken back, so jobs a live
+        worker (in this process or another) is still enriching are left alone.
+        """
+        expired = timezone.now() - timedelta(seconds=self.lease_seconds)
+        running = JobData.objects.filter(enrichment_status=JobData.ENRICHMENT_RUNNING)
+        return (
+            running.filter(enrichment_claimed_at__lt=expired) | running.filter(enrichment_claimed_at__isnull=True)
+        ).update(enrichment_status=JobData.ENRICHMENT_PENDING, enrichment_claimed_at=None)
+
+    def retry_failed(self):
+        """Give jobs that used up their attempts another round"""
+        return JobData.objects.filter(enrichment_status=JobData.ENRICHMENT_FAILED).update(
+            enrichment_status=JobData.ENRICHMENT_PENDING, enrichment_attempts=0
+        )
+
+    def claim_batch(self, limit=None):
+        """Mark up to limit pending jobs as running and return them
+
+        Each job is claimed with an update that only matches it while it is
+        still pending, so two workers never enrich the same job. Expired
+        claims are taken back first.
+        """
+        self.reclaim_running()
+        ids = list(
+            JobData.objects.filter(enrichment_status=JobData.ENRICHMENT_PENDING)
+            .order_by('id')
+            .values_list('id', flat=True)[:limit or self.batch_size]
+        )
+        claimed = [
+            job_id for job_id in ids
+            if JobData.objects.filter(id=job_id, enrichment_status=JobData.ENRICHMENT_PENDING).update(
+                enrichment_status=JobData.ENRICHMENT_RUNNING, enrichment_claimed_at=timezone.now()
+            )
+        ]
+        return list(JobData.objects.filter(id__in=claimed).select_related('skill', 'benefit').order_by('id'))
+
+    def run_once(self, limit=None):
+        """Enrich one batch of pending jobs, returning how many were claimed"""
+        jobs = self.claim_batch(limit)
+        if not jobs:
+            return 0
+
+        client = get_async_gemini_client()
+        futures = [client.submit(job.description, domain_key(job.link)) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                fields = future.result()
+            except CircuitOpenError:
+                # Not the job's fault; it is tried again once the circuit closes
+                self._release(job)
+                continue
+            except Exception as e:
+                logger.error(f"Error enriching job {job.link}: {str(e)}")
+                self._record_failure(job)
+                continue
+            try:
+                self._apply(job, fields)
+            except Exception as e:
+                logger.error(f"Error saving enrichment for {job.link}: {str(e)}")
+                self._record_failure(job)
+        return len(jobs)
+
+    def run(self, limit=None, follow=False):
+        """Drain pending jobs, returning how many were processed
+
+        With follow=True the worker keeps polling for new pending jobs
+        until stop() is called, then finishes what is left.
+        """
+        if not get_async_gemini_client().client.initialized:
+            logger.warning("Gemini API is not configured; leaving jobs pending enrichment")
+            return 0
+
+        breaker = get_gemini_breaker()
+        processed = 0
+        try:
+            while limit is None or processed < limit:
+                if breaker.rejects():
+                    if not follow or self._stop.is_set():
+                        logger.warning("Gemini circuit is open; leaving the remaining jobs pending")
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+                count = self.run_once(None if limit is None else min(self.batch_size, limit - processed))
+                processed += count
+                if count:
+                    continue
+                if not follow or self._stop.is_set():
+                    break
+                self._stop.wait(self.poll_interval)
+        finally:
+            close_old_connections()
+        return processed
+
+    def is_running(self):
+        """Whether the background thread is still alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Run the worker on a background thread until stop() is called
+
+        If the thread is still draining after an earlier stop(wait=False),
+        it is told to keep following instead of a second one starting.
+        """
+        with self._thread_lock:
+            self._stop.clear()
+            if self.is_running():
+                return
+            self._thread = threading.Thread(target=self.run, kwargs={'follow': True}, daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=True):
+        """Ask the background thread to finish the pending jobs and exit"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _apply(self, job, fields):
+        """Merge Gemini fields into a job and mark it enriched
+
+        Nothing is written if the claim expired and the job was taken back.
+        """
+        job_data = {field: getattr(job, field) for field in ENRICHED_FIELDS}
+        job_data['skills'] = self._values(job.skill, 'skill')
+        job_data['benefits'] = self._values(job.benefit, 'benefit')
+        job_data = self.job_description._clean_job_data(merge_fields(job_data, fields))
+
+        with transaction.atomic():
+            # The claim check and the write are one statement, so a worker that
+            # took the job back in between cannot be overwritten
+            updated = self._claimed(job).update(
+                enrichment_status=JobData.ENRICHMENT_DONE,
+                enrichment_claimed_at=None,
+                enrichment_attempts=F('enrichment_attempts') + 1,
+                # The text is only kept until Gemini has seen it
+                description='',
+                **{field: job_data.get(field) or '' for field in ENRICHED_FIELDS}
+            )
+            if not updated:
+                logger.warning(f"Claim on {job.link} expired before its enrichment was saved")
+                return
+            skill = self._store_values(job.skill, Skill, 'skill', job_data.get('skills'))
+            benefit = self._store_values(job.benefit, Benefit, 'benefit', job_data.get('benefits'))
+            if skill is not job.skill or benefit is not job.benefit:
+                JobData.objects.filter(pk=job.pk).update(skill=skill, benefit=benefit)
+
+    def _claimed(self, job):
+        """The job's row, only while this worker's claim on it still holds"""
+        return JobData.objects.filter(pk=job.pk, enrichment_status=JobData.ENRICHMENT_RUNNING,
+                                      enrichment_claimed_at=job.enrichment_claimed_at)
+
+    def _release(self, job):
+        """Return a claimed job to pending without counting an attempt"""
+        self._claimed(job).update(enrichment_status=JobData.ENRICHMENT_PENDING, enrichment_claimed_at=None)
+
+    def _record_failure(self, job):
+        """Count a failed attempt, giving up after max_attempts"""
+        attempts = job.enrichment_attempts + 1
+        status = JobData.ENRICHMENT_FAILED if attempts >= self.max_attempts else JobData.ENRICHMENT_PENDING
+        self._claimed(job).update(enrichment_status=status, enrichment_attempts=attempts, enrichment_claimed_at=None)
+
+    def _values(self, record, prefix):
+        """The non-empty skill_N/benefit_N values of a Skill or Benefit"""
+        if record is None:
+            return []
+        values = [getattr(record, f'{prefix}_{i}') for i in range(1, 15)]
+        return [value for value in values if value]
+
+    def _store_values(self, record, model, prefix, values):
+        """Write up to 14 values into a Skill/Benefit record, creating it if needed"""
+        if not values:
+            return record
+        if record is None:
+            record = model()
+        for i in range(1, 15):
+            setattr(record, f'{prefix}_{i}', values[i - 1] if i <= len(values) else None)
+        record.save()
+        return record
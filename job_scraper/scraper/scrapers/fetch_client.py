@@ -0,0 +1,121 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+from .rate_limiter import get_rate_limiter
+from .concurrency import get_concurrency_controller
+
+# Brotli responses can only be decoded by urllib3 when one of these is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class FetchClient:
+    """Shared HTTP client keeping one keep-alive connection pool per domain"""
+
+    def __init__(self, pool_size=None, max_retries=None, timeout=None):
+        """Initialize the client with pool and retry settings"""
+        self.pool_size = pool_size or getattr(settings, 'SCRAPER_POOL_SIZE', 10)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'SCRAPER_MAX_RETRIES', 3)
+        self.timeout = timeout or getattr(settings, 'SCRAPER_REQUEST_TIMEOUT', 30)
+        self.rate_limiter = get_rate_limiter()
+        self.concurrency = get_concurrency_controller()
+        # Optional callable mapping a URL to the one actually requested (e.g. a local replay server)
+        self.url_rewriter = None
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        """Create a session with the retry policy and a sized connection pool"""
+        session = requests.Session()
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def session_for(self, url):
+        """Return the pooled session for the domain of the given URL"""
+        host = urlparse(url).netloc.lower()
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._build_session()
+                    self._sessions[host] = session
+        return session
+
+    def get(self, url, throttle=True, **kwargs):
+        """Fetch a URL through the domain's pooled session
+
+        Waits for the domain's rate limiter first unless the caller has
+        already done so (throttle=False).
+        """
+        if throttle:
+            self.rate_limiter.wait(url)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        # Feed latency, overload responses and timeouts to the domain's AIMD limit
+        limit = self.concurrency.limit_for(url)
+        request_url = self.url_rewriter(url) if self.url_rewriter else url
+        started = time.monotonic()
+        try:
+            response = self.session_for(request_url).get(request_url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                requests.exceptions.RetryError):
+            limit.record_timeout()
+            raise
+        limit.record_response(time.monotonic() - started, response.status_code)
+        return response
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_fetch_client():
+    """Return the process-wide fetch client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FetchClient()
+    return _client
@@ -0,0 +1,62 @@
+import re
+
+# What follows a field label: an optional colon, then the value text
+VALUE_PATTERN = re.compile(r'\s*:?\s*([\w\s,-./]+)')
+
+
+class FieldPatternExtractor:
+    """Find "label: value" fields for many labels in one scan of the page text
+
+    field_keywords maps each field to its labels in priority order. A
+    field takes the value after the first occurrence of its highest
+    priority label that has one, the same result as searching for each
+    label in turn, but the text is scanned once for all labels. Text must
+    be lowercased: matching is case-sensitive so the regex engine can skip
+    ahead on the labels' first characters.
+    """
+
+    def __init__(self, field_keywords):
+        """Compile one alternation over every label of every field"""
+        self.field_keywords = {field: [keyword.lower() for keyword in keywords]
+                               for field, keywords in field_keywords.items()}
+        keywords = sorted({keyword for keywords in self.field_keywords.values() for keyword in keywords},
+                          key=len, reverse=True)
+        self.label_pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+        # The alternation only reports the longest label starting at a position,
+        # so shorter labels it begins with are recorded alongside it
+        self.prefixes = {keyword: [other for other in keywords if other != keyword and keyword.startswith(other)]
+                         for keyword in keywords}
+
+    def find_labels(self, text):
+        """Map each label to the positions where it occurs, in order"""
+        positions = {}
+        match = self.label_pattern.search(text)
+        while match:
+            keyword = match.group()
+            positions.setdefault(keyword, []).append(match.start())
+            for prefix in self.prefixes[keyword]:
+                positions.setdefault(prefix, []).append(match.start())
+            # Resume just after the start so labels overlapping this one are found too
+            match = self.label_pattern.search(text, match.start() + 1)
+        return positions
+
+    def extract(self, text):
+        """Return a field -> value map, with None for fields not found"""
+        positions = self.find_labels(text)
+        values = {}
+        for field, keywords in self.field_keywords.items():
+            values[field] = None
+            for keyword in keywords:
+                value = self._value_after(text, keyword, positions.get(keyword, ()))
+                if value is not None:
+                    values[field] = value
+                    break
+        return values
+
+    def _value_after(self, text, keyword, positions):
+        """The value following the first occurrence of a label that has one"""
+        for start in positions:
+            match = VALUE_PATTERN.match(text, start + len(keyword))
+            if match:
+                return match.group(1).strip()
+        return None
@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid'}
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def canonicalize_url(url):
+    """Normalize a job URL so trivially different spellings compare equal"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+
+    # Fragments never reach the server, so they are dropped
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class UrlFrontier:
+    """In-memory seen-set of canonical job URLs, warmed from the database
+
+    URLs are kept as 16-byte digests so a set of hundreds of thousands of
+    links stays small.
+    """
+
+    def __init__(self):
+        """Initialize an empty frontier"""
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.warmed = False
+
+    def _key(self, url):
+        """Return the set key for a URL"""
+        return hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=16).digest()
+
+    def warm(self):
+        """Load every job link and stored page URL already in the database"""
+        from scraper.models import JobData, ScrapedHTML
+
+        keys = set()
+        for url in JobData.objects.values_list('link', flat=True).iterator():
+            keys.add(self._key(url))
+        for url in ScrapedHTML.objects.values_list('url', flat=True).iterator():
+            keys.add(self._key(url))
+
+        with self._lock:
+            self._seen |= keys
+            self.warmed = True
+        logger.info(f"URL frontier warmed with {len(keys)} known URLs")
+
+    def is_seen(self, url):
+        """Check whether a URL has already been crawled or scheduled"""
+        return self._key(url) in self._seen
+
+    def claim(self, url):
+        """Mark a URL as scheduled; returns False if it was already seen"""
+        key = self._key(url)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+    def claim_new(self, urls):
+        """Return the URLs not seen before, in order, and mark them as scheduled"""
+        if not getattr(settings, 'SCRAPER_SKIP_SEEN_URLS', True):
+            return list(dict.fromkeys(urls))
+        return [url for url in urls if self.claim(url)]
+
+    def discard(self, url):
+        """Forget a URL whose fetch failed so a later crawl can retry it"""
+        with self._lock:
+            self._seen.discard(self._key(url))
+
+    def __len__(self):
+        return len(self._seen)
+
+
+_frontier = None
+_frontier_lock = threading.Lock()
+
+
+def get_frontier():
+    """Return the process-wide frontier, warming it from the database on first use"""
+    global _frontier
+    if _frontier is None:
+        with _frontier_lock:
+            if _frontier is None:
+                frontier = UrlFrontier()
+                frontier.warm()
+                _frontier = frontier
+    return _frontier
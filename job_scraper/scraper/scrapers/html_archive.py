@@ -0,0 +1,37 @@
+import gzip
+import hashlib
+
+# zstd compresses HTML better and faster than gzip, but is optional
+try:
+    import zstandard
+    DEFAULT_CODEC = 'zstd'
+except ImportError:
+    zstandard = None
+    DEFAULT_CODEC = 'gzip'
+
+
+def content_hash(html_content):
+    """Return the SHA-256 hex digest identifying a page's HTML"""
+    return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+
+def compress_html(html_content, codec=DEFAULT_CODEC):
+    """Compress HTML with the given codec"""
+    data = html_content.encode('utf-8')
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    raise ValueError(f"Unknown HTML codec: {codec}")
+
+
+def decompress_html(data, codec):
+    """Decompress stored HTML back to text"""
+    data = bytes(data)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("The zstandard package is needed to read zstd-compressed HTML")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'gzip':
+        return gzip.decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown HTML codec: {codec}")
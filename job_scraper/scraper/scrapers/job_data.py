@@ -52,7 +52,9 @@ class JobData:
                 'salary': job_data.get('salary', ''),
                 'link': link,
                 'skill': skill_obj,
-                'benefit': benefit_obj
+                'benefit': benefit_obj,
+                'enrichment_status': job_data.get('enrichment_status') or JobDataModel.ENRICHMENT_NONE,
+                'description': job_data.get('description', '')
             }
             
             # Create job record
@@ -1,146 +1,277 @@
-import os
 import re
-import time
-import requests
-import pandas as pd
 from bs4 import BeautifulSoup
 from django.conf import settings
-import google.generativeai as genai
 import logging
 
 # Import handling for different execution contexts
 try:
     # When running as part of the Django app
-    from scraper.scrapers.utils import get_with_retry
+    from scraper.scrapers.fetch_client import get_fetch_client
+    from scraper.scrapers.frontier import get_frontier
 except ImportError:
     try:
         # When running directly
-        from utils import get_with_retry
+        from fetch_client import get_fetch_client
+        from frontier import get_frontier
     except ImportError:
         # Fallback
-        from .query_search import get_with_retry
+        from .fetch_client import get_fetch_client
+        from .frontier import get_frontier
 
 from .job_data import JobData
+from scraper.models import JobData as JobDataModel
+from .page_context import PageContext
+from .field_patterns import FieldPatternExtractor
+from .domain_registry import DomainConfig
+from .config_cache import get_domain_registry
+from .structured_data import JSON_LD_TYPE, extract_job_posting, has_required_fields
+from .rate_limiter import domain_key
+from .skill_vocabulary import get_skill_vocabulary
+from scraper.services.gemini_api import GeminiClient, merge_fields
+from scraper.services.circuit_breaker import CircuitOpenError
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# GEMINI_ENRICHMENT_MODE values; 'deferred' leaves Gemini to the EnrichmentWorker
+ENRICHMENT_MODES = ('sync', 'deferred')
+
+# "Label: value" fields found by pattern matching, with their labels in priority order
+PATTERN_FIELDS = FieldPatternExtractor({
+    'company': ['company', 'organization'],
+    'jobLocation': ['location', 'address', 'place'],
+    'jobType': ['job type', 'employment type', 'contract'],
+    'salary': ['salary', 'compensation', 'pay'],
+    'experience': ['experience', 'years of exp'],
+    'education': ['education', 'qualification', 'degree'],
+    'deadline': ['deadline', 'closing date', 'apply by'],
+    'jobCategory': ['category', 'job category'],
+})
+
 class JobDescription:
     """Class for processing job description pages"""
     
-    def __init__(self):
-        """Initialize the job description processor"""
-        # Load domain configuration from CSV
-        self.domains_file = os.path.join(settings.CSV_FILE_DIR, 'domain.csv')
+    def __init__(self, use_gemini=True):
+        """Initialize the job description processor
+        
+        Parser-only instances (e.g. in pipeline worker processes) pass
+        use_gemini=False and leave LLM enrichment to the caller.
+        """
+        # Check the shared domain configuration loads
         try:
-            self.domains_df = pd.read_csv(self.domains_file)
+            get_domain_registry()
         except Exception as e:
             raise Exception(f"Error loading domain configuration: {str(e)}")
         
+        # BeautifulSoup tree builder used for job pages
+        self.html_parser = getattr(settings, 'SCRAPER_HTML_PARSER', 'lxml')
+        
+        # Vocabulary skill matches needed before Gemini is skipped
+        self.vocabulary_min_skills = getattr(settings, 'SCRAPER_VOCABULARY_MIN_SKILLS', 5)
+        
         # Initialize Gemini API
-        self.setup_gemini_api()
+        self.gemini_client = None
+        if use_gemini and getattr(settings, 'SCRAPER_USE_GEMINI', True):
+            self.setup_gemini_api()
+        else:
+            self.gemini_model = None
+        
+        # 'deferred' saves jobs straight away for the enrichment worker to fill in later
+        self.enrichment_mode = getattr(settings, 'GEMINI_ENRICHMENT_MODE', 'sync')
+        if self.enrichment_mode not in ENRICHMENT_MODES:
+            logger.warning(f"Unknown GEMINI_ENRICHMENT_MODE {self.enrichment_mode!r}; enriching jobs inline")
+            self.enrichment_mode = 'sync'
         
         # Initialize job data storage
         self.job_data = JobData()
     
+    @property
+    def domains(self):
+        """The current domain configuration, reloaded when domain.csv changes"""
+        return get_domain_registry()
+    
     def setup_gemini_api(self):
         """Setup the Gemini API client"""
-        try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.gemini_model = genai.GenerativeModel('gemini-pro')
-        except Exception as e:
-            logger.warning(f"Gemini API not configured properly. Error: {str(e)}")
-            self.gemini_model = None
+        self.gemini_client = GeminiClient()
+        self.gemini_model = self.gemini_client.model
+    
+    @property
+    def defers_enrichment(self):
+        """Whether Gemini enrichment happens after parsing instead of inline"""
+        return bool(self.gemini_model) and self.enrichment_mode == 'deferred'
     
-    def process_job_page(self, job_url, domain_link):
-        """Process a job description page"""
+    def process_job_page(self, job_url, domain_link, throttle=True):
+        """Process a job description page
+
+        Pass throttle=False when the caller has already waited on the
+        domain's rate limiter. Returns False when the page could not be
+        fetched or processed, so queue workers know to retry it.
+        """
         logger.info(f"Processing job page: {job_url}")
         
+        html_content = self.fetch_job_page(job_url, throttle=throttle)
+        if html_content is None:
+            return False
+        return self.process_job_html(job_url, html_content, domain_link)
+    
+    def process_job_html(self, job_url, html_content, domain_link):
+        """Store, parse and save a job page that has already been downloaded
+        
+        Returns False when the page could not be processed.
+        """
         try:
-            # Get the domain config for this URL
-            domain_config = self.domains_df[self.domains_df['domain_link'] == domain_link].iloc[0]
-            description_tags = domain_config['domain_job_description_tags']
-            
-            # Fetch the job page
-            response = requests.get(job_url, timeout=30)
-            if response.status_code != 200:
-                logger.error(f"Error: {job_url} returned status code {response.status_code}")
-                return
-                
             # Store the HTML content in the database regardless of success
-            html_content = response.text
-            
-            # Import the model directly (not using relative import)
-            from scraper.models import ScrapedHTML
-            from django.utils import timezone
+            scraped_html = self.store_html(job_url, html_content, domain_link)
             
-            scraped_html, created = ScrapedHTML.objects.update_or_create(
-                url=job_url,
-                defaults={
-                    'html_content': html_content,
-                    'scraped_at': timezone.now(),
-                    'source_domain': domain_link
-                }
-            )
+            if self.defers_enrichment:
+                # The crawl moves straight on without waiting for Gemini
+                job_data = self.parse_job_html(html_content, job_url, domain_link, enhance=False)
+                self.submit_enrichment(job_data, job_url, scraped_html)
+                return True
             
-            # Parse the HTML
-            soup = BeautifulSoup(self._clean_html(html_content), 'html.parser')
+            # Extract and clean job data from the page
+            job_data = self.parse_job_html(html_content, job_url, domain_link)
             
-            # Extract job data from the page
-            job_data = self._extract_job_data(soup, description_tags, job_url, domain_config)
+            self.save_job_data(job_data, job_url, scraped_html)
             
-            # Clean the extracted data
-            if job_data:
-                job_data = self._clean_job_data(job_data)
-                
-                # If job data was successfully extracted, save it
-                if 'jobTitle' in job_data and job_data['jobTitle']:
-                    success = self.job_data.save_job(job_data)
-                    if success:
-                        # Update the HTML record
-                        scraped_html.processing_success = True
-                        scraped_html.last_processed = timezone.now()
-                        scraped_html.save()
-                        logger.info(f"Job data saved for {job_data.get('jobTitle', 'Unknown job')}")
-                    else:
-                        logger.warning(f"Failed to save job data for {job_url}")
-                else:
-                    logger.warning(f"Job title missing for {job_url}")
-            else:
-                logger.warning(f"Failed to extract job data from {job_url}")
+            return True
             
         except Exception as e:
             logger.error(f"Error processing job page {job_url}: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())
+            return False
+    
+    def fetch_job_page(self, job_url, throttle=True):
+        """Download a job page, returning its HTML or None if the fetch failed"""
+        # Fetch the job page through the shared pooled client
+        try:
+            response = get_fetch_client().get(job_url, throttle=throttle)
+        except Exception as e:
+            logger.error(f"Error fetching job page {job_url}: {str(e)}")
+            # Let a later crawl retry the URL
+            get_frontier().discard(job_url)
+            return None
+        if response.status_code != 200:
+            logger.error(f"Error: {job_url} returned status code {response.status_code}")
+            get_frontier().discard(job_url)
+            return None
+        return response.text
+    
+    def store_html(self, job_url, html_content, domain_link):
+        """Store the raw page, compressed and deduplicated, so it can be reprocessed later"""
+        # Import the model directly (not using relative import)
+        from scraper.models import ScrapedHTML
+        
+        scraped_html, changed = ScrapedHTML.objects.store(job_url, html_content, domain_link)
+        return scraped_html
+    
+    def parse_job_html(self, html_content, job_url, domain_link, enhance=True):
+        """Parse a job page and return its cleaned job data
+        
+        This does no database or network work apart from the optional
+        Gemini enhancement, so it can run in a parser worker process.
+        """
+        # Get the domain config for this URL
+        domain_config = self.domains.get(domain_link) or self.domains.for_url(job_url)
+        if domain_config is None:
+            raise ValueError(f"No domain configuration for {domain_link}")
+        description_tags = domain_config.description_tags
+        
+        # Parse the HTML once, cleaning the tree in place
+        soup = self.parse_html(html_content)
+        
+        # Extract job data from the page
+        job_data = self._extract_job_data(soup, description_tags, job_url, domain_config, enhance=enhance)
+        
+        # Clean the extracted data
+        if job_data:
+            job_data = self._clean_job_data(job_data)
+        
+        return job_data
+    
+    def save_job_data(self, job_data, job_url, scraped_html):
+        """Save extracted job data and mark the stored HTML as processed"""
+        from django.utils import timezone
+        
+        if not job_data:
+            logger.warning(f"Failed to extract job data from {job_url}")
+            return False
+        
+        # If job data was successfully extracted, save it
+        if not ('jobTitle' in job_data and job_data['jobTitle']):
+            logger.warning(f"Job title missing for {job_url}")
+            return False
+        
+        success = self.job_data.save_job(job_data)
+        if success:
+            # Update the HTML record
+            scraped_html.processing_success = True
+            scraped_html.last_processed = timezone.now()
+            scraped_html.save()
+            logger.info(f"Job data saved for {job_data.get('jobTitle', 'Unknown job')}")
+        else:
+            logger.warning(f"Failed to save job data for {job_url}")
+        return success
     
-    def _extract_job_data(self, soup, description_tags, job_url, domain_config):
-        """Extract job data from the soup object using improved selectors"""
+    def submit_enrichment(self, job_data, job_url, scraped_html):
+        """Save job data parsed with enhance=False for later Gemini enrichment
+        
+        The job is saved now with its description and marked pending for
+        the EnrichmentWorker. Jobs with nothing to enrich are saved as they are.
+        """
+        description = job_data.pop('description', '') if job_data else ''
+        if not self._should_enrich(description):
+            return self.save_job_data(job_data, job_url, scraped_html)
+        
+        # Only the reduced text the worker will send is kept
+        job_data['description'] = self.gemini_client.prepare(description)
+        job_data['enrichment_status'] = JobDataModel.ENRICHMENT_PENDING
+        return self.save_job_data(job_data, job_url, scraped_html)
+    
+    def _extract_job_data(self, soup, description_tags, job_url, domain_config, enhance=True):
+        """Extract job data from the soup object using improved selectors
+        
+        With enhance=False the Gemini step is skipped and the text it would
+        have been given is returned under 'description' for a later stage.
+        Without a domain_config only the generic selectors and the given
+        description_tags are used.
+        
+        A schema.org JobPosting on the page is read first. When it gives the
+        title, company and location, the table and selector heuristics are
+        skipped, and when it also lists skills Gemini is not needed.
+        """
+        if domain_config is None:
+            domain_config = DomainConfig.generic(description_tags)
+        
         job_data = {
             'link': job_url,
             'skills': [],
             'benefits': []
         }
         
-        # First try to extract structured data from tables if available
-        structured_data = self._extract_structured_data_from_table(soup)
-        if structured_data:
-            job_data.update(structured_data)
+        # Page text is derived once here and shared by every helper below
+        page = PageContext(soup, job_url)
+        
+        # JSON-LD or microdata JobPosting fields are the most reliable source
+        posting = extract_job_posting(soup, self.html_parser)
+        posting_description = posting.pop('description', '')
+        has_posting = has_required_fields(posting)
+        
+        # Otherwise try to extract structured data from tables if available
+        if not has_posting:
+            structured_data = self._extract_structured_data_from_table(soup)
+            if structured_data:
+                job_data.update(structured_data)
+        job_data.update(posting)
         
         # If we couldn't get a title from structured data, try the standard way
         if 'jobTitle' not in job_data or not job_data['jobTitle']:
             # Try common job title selectors
-            title_selectors = [
-                'h1.job-title', 'h1.position-title', '.job-header h1', 
-                'h1', 'h2.job-title', '.position-title h1',
-                '[data-automation="job-detail-title"]', '.job-title-header',
-                'header h1', '.job-position h1', '.listing-header h1'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
+            for selector in domain_config.title_selectors:
+                title_elem = selector.select_one(soup)
                 if title_elem:
                     job_data['jobTitle'] = title_elem.text.strip()
                     break
@@ -161,74 +292,54 @@ class JobDescription:
         
         # Find the job description content - use only specific tags to avoid irrelevant content
         description_content = ""
-        if description_tags:
-            for tag in description_tags.split(','):
-                if tag.strip():  # Ensure tag is not empty
-                    elements = soup.select(tag.strip())
-                    for element in elements:
-                        # Skip elements that are likely to be navigation, footer, or other irrelevant content
-                        if self._is_relevant_content(element):
-                            description_content += element.text.strip() + "\n"
+        if not (has_posting and posting_description):
+            for selector in domain_config.description_selectors:
+                for element in selector.select(soup):
+                    # Skip elements that are likely to be navigation, footer, or other irrelevant content
+                    if self._is_relevant_content(element):
+                        description_content += element.text.strip() + "\n"
+        page.description_text = description_content or posting_description
         
         # Extract company if not already found
         if 'company' not in job_data or not job_data['company']:
-            company_selectors = [
-                '.company-name', '.employer-name', '.company', 
-                '[data-automation="advertiser-name"]', '.job-company',
-                '.company-title', '.employer', '.job-company-name',
-                'span.company', '.listing-company'
-            ]
-            
-            for selector in company_selectors:
-                company_elem = soup.select_one(selector)
+            for selector in domain_config.company_selectors:
+                company_elem = selector.select_one(soup)
                 if company_elem:
                     job_data['company'] = company_elem.text.strip()
                     break
             
             # If still not found, try pattern matching
             if 'company' not in job_data or not job_data['company']:
-                job_data['company'] = self._extract_pattern(soup, ['company', 'organization'])
+                job_data['company'] = self._extract_pattern(page, 'company')
         
         # Extract location if not already found
         if 'jobLocation' not in job_data or not job_data['jobLocation']:
-            location_selectors = [
-                '.job-location', '.location', '.job-info .location',
-                '[data-automation="job-location"]', '.job-details .location',
-                '.job-meta .location', 'span.location', '.listing-location'
-            ]
-            
-            for selector in location_selectors:
-                location_elem = soup.select_one(selector)
+            for selector in domain_config.location_selectors:
+                location_elem = selector.select_one(soup)
                 if location_elem:
                     job_data['jobLocation'] = location_elem.text.strip()
                     break
             
             # If still not found, try pattern matching
             if 'jobLocation' not in job_data or not job_data['jobLocation']:
-                job_data['jobLocation'] = self._extract_pattern(soup, ['location', 'address', 'place'])
+                job_data['jobLocation'] = self._extract_pattern(page, 'jobLocation')
         
         # Extract job type if not already found
         if 'jobType' not in job_data or not job_data['jobType']:
-            type_selectors = [
-                '.job-type', '.employment-type', '.job-info .type',
-                '[data-automation="job-type"]', '.job-meta .type',
-                'span.job-type', '.listing-job-type'
-            ]
-            
-            for selector in type_selectors:
-                type_elem = soup.select_one(selector)
+            for selector in domain_config.job_type_selectors:
+                type_elem = selector.select_one(soup)
                 if type_elem:
                     job_data['jobType'] = type_elem.text.strip()
                     break
             
             # If still not found, try pattern matching
             if 'jobType' not in job_data or not job_data['jobType']:
-                job_data['jobType'] = self._extract_pattern(soup, ['job type', 'employment type', 'contract'])
+                job_data['jobType'] = self._extract_pattern(page, 'jobType')
                 
                 # If still not found, try to extract from text content
                 if not job_data['jobType']:
                     job_types = ['full-time', 'part-time', 'contract', 'temporary', 'internship', 'freelance', 'remote']
-                    text = soup.get_text().lower()
+                    text = page.lower_text
                     found_types = []
                     
                     for jt in job_types:
@@ -241,48 +352,85 @@ class JobDescription:
         
         # Extract other details using pattern matching if not already in structured data
         if 'salary' not in job_data or not job_data['salary']:
-            job_data['salary'] = self._extract_pattern(soup, ['salary', 'compensation', 'pay'])
+            job_data['salary'] = self._extract_pattern(page, 'salary')
         
         if 'experience' not in job_data or not job_data['experience']:
-            job_data['experience'] = self._extract_pattern(soup, ['experience', 'years of exp'])
+            job_data['experience'] = self._extract_pattern(page, 'experience')
         
         if 'education' not in job_data or not job_data['education']:
-            job_data['education'] = self._extract_pattern(soup, ['education', 'qualification', 'degree'])
+            job_data['education'] = self._extract_pattern(page, 'education')
         
         if 'deadline' not in job_data or not job_data['deadline']:
-            job_data['deadline'] = self._extract_pattern(soup, ['deadline', 'closing date', 'apply by'])
+            job_data['deadline'] = self._extract_pattern(page, 'deadline')
         
         # Extract job category if not already found
         if 'jobCategory' not in job_data or not job_data['jobCategory']:
-            job_data['jobCategory'] = self._extract_pattern(soup, ['category', 'job category'])
+            job_data['jobCategory'] = self._extract_pattern(page, 'jobCategory')
         
+        # Match known skill and benefit terms in the description
+        vocabulary_confident = False
+        if not (job_data['skills'] and job_data['benefits']):
+            skills, benefits = get_skill_vocabulary().extract(page.content_text)
+            job_data['skills'] = job_data['skills'] or skills
+            job_data['benefits'] = job_data['benefits'] or benefits
+            vocabulary_confident = len(skills) >= self.vocabulary_min_skills
+        
+        # A complete JobPosting with skills, or enough known skills, leaves little for Gemini to add
+        needs_enrichment = not ((has_posting and job_data['skills']) or vocabulary_confident)
+        
+        if enhance:
+            if self.gemini_model and needs_enrichment:
+                # If description_content is empty, use the whole page text
+                job_data = self.enhance_job_data(job_data, page.content_text)
+        else:
+            # An empty description tells the later stage to skip enrichment
+            job_data['description'] = page.content_text if needs_enrichment else ''
+        
+        return job_data
+    
+    def enhance_job_data(self, job_data, content_to_process):
+        """Run the Gemini enrichment step on extracted job data"""
         # Use Gemini API to extract structured data if available and we have significant content
-        if self.gemini_model and (description_content or soup.get_text()) and len(description_content or soup.get_text()) > 100:
+        if self.gemini_model and self._should_enrich(content_to_process):
             try:
-                # If description_content is empty, use the whole page text
-                content_to_process = description_content if description_content else soup.get_text()
                 job_data = self._enhance_with_gemini(job_data, content_to_process)
             except Exception as e:
                 logger.error(f"Gemini API error: {str(e)}")
         
         return job_data
     
-    def _clean_html(self, html_content):
-        """Clean HTML before parsing"""
-        # Remove script and style elements
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+    def _should_enrich(self, content_to_process):
+        """Whether there is enough text for Gemini to work with"""
+        return bool(content_to_process) and len(content_to_process) > 100
+    
+    def parse_html(self, html_content):
+        """Parse a job page and strip navigation, ads and scripts from the tree"""
+        return self._clean_soup(BeautifulSoup(html_content, self.html_parser))
+    
+    def _clean_soup(self, soup):
+        """Remove unwanted elements from a parsed page in place"""
         # Remove unwanted tags that typically contain navigation, ads, etc.
         for tag in soup.find_all(['script', 'style', 'nav', 'footer', 'header']):
+            # JSON-LD blocks carry the page's structured job data
+            if tag.name == 'script' and tag.get('type') == JSON_LD_TYPE:
+                continue
             tag.decompose()
         
-        # Remove elements with common nav/footer class names
+        # Remove elements with common nav/footer class names, in one walk of the tree
         nav_classes = ['nav', 'menu', 'navigation', 'footer', 'header', 'sidebar']
-        for cls in nav_classes:
-            for tag in soup.find_all(class_=lambda x: x and cls in x.lower()):
+        for tag in soup.find_all(class_=True):
+            # Already gone with a removed ancestor
+            if tag.decomposed:
+                continue
+            classes = ' '.join(tag.get('class', [])).lower()
+            if any(cls in classes for cls in nav_classes):
                 tag.decompose()
         
-        return str(soup)
+        return soup
+    
+    def _clean_html(self, html_content):
+        """Clean HTML before parsing, returning the cleaned markup"""
+        return str(self.parse_html(html_content))
     
     def _clean_job_data(self, job_data):
         """Clean and normalize job data"""
@@ -435,17 +583,12 @@ class JobDescription:
             
         return True  # Default to including content if no red flags
     
-    def _extract_pattern(self, soup, keywords):
-        """Extract data from soup based on pattern matching"""
-        text = soup.get_text().lower()
-        
-        for keyword in keywords:
-            pattern = rf'{keyword}\s*:?\s*([\w\s,-./]+)'
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        
-        return None
+    def _extract_pattern(self, page, field):
+        """Extract a field from the page text based on pattern matching"""
+        # Every field is found in a single scan the first time one is asked for
+        if page.pattern_values is None:
+            page.pattern_values = PATTERN_FIELDS.extract(page.lower_text)
+        return page.pattern_values[field]
     
     def _clean_text(self, text):
         """Basic text cleaning function"""
@@ -472,70 +615,11 @@ class JobDescription:
     
     def _enhance_with_gemini(self, job_data, description_content):
         """Use Gemini API to enhance job data extraction"""
-        prompt = f"""
-        Extract the following information from this job description:
-        1. Skills required (list up to 14)
-        2. Benefits offered (list up to 14)
-        3. Job category
-        4. Industry
-        5. Education requirements
-        6. Experience requirements
-        7. Job Type (full-time, part-time, contract, etc.)
-        
-        Return the results in a structured format like this:
-        Skills: skill1, skill2, ...
-        Benefits: benefit1, benefit2, ...
-        Category: category
-        Industry: industry
-        Education: education requirement
-        Experience: experience requirement
-        Job Type: job type
-        
-        Here's the job description:{description_content}
-        """
-        
         try:
-            response = self.gemini_model.generate_content(prompt)
-            result = response.text
-            
-            # Parse the Gemini output
-            if 'Skills:' in result:
-                skills_match = re.search(r'Skills:\s*(.*?)(?:\n|$)', result)
-                if skills_match:
-                    skills = [s.strip() for s in skills_match.group(1).split(',')]
-                    job_data['skills'] = skills[:14]  # Limit to 14 skills
-            
-            if 'Benefits:' in result:
-                benefits_match = re.search(r'Benefits:\s*(.*?)(?:\n|$)', result)
-                if benefits_match:
-                    benefits = [b.strip() for b in benefits_match.group(1).split(',')]
-                    job_data['benefits'] = benefits[:14]  # Limit to 14 benefits
-            
-            if 'Category:' in result and not job_data.get('jobCategory'):
-                category_match = re.search(r'Category:\s*(.*?)(?:\n|$)', result)
-                if category_match:
-                    job_data['jobCategory'] = category_match.group(1).strip()
-            
-            if 'Industry:' in result:
-                industry_match = re.search(r'Industry:\s*(.*?)(?:\n|$)', result)
-                if industry_match:
-                    job_data['jobIndustry'] = industry_match.group(1).strip()
-            
-            if 'Education:' in result and not job_data.get('education'):
-                education_match = re.search(r'Education:\s*(.*?)(?:\n|$)', result)
-                if education_match:
-                    job_data['education'] = education_match.group(1).strip()
-            
-            if 'Experience:' in result and not job_data.get('experience'):
-                experience_match = re.search(r'Experience:\s*(.*?)(?:\n|$)', result)
-                if experience_match:
-                    job_data['experience'] = experience_match.group(1).strip()
-            
-            if 'Job Type:' in result and not job_data.get('jobType'):
-                job_type_match = re.search(r'Job Type:\s*(.*?)(?:\n|$)', result)
-                if job_type_match:
-                    job_data['jobType'] = job_type_match.group(1).strip()
-        
+            fields = self.gemini_client.extract_job_data(description_content, domain_key(job_data.get('link', '')))
+            job_data = merge_fields(job_data, fields)
+        except CircuitOpenError as e:
+            logger.debug(str(e))
         except Exception as e:
             logger.error(f"Error using Gemini API: {str(e)}")
         
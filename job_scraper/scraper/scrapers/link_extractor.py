@@ -0,0 +1,127 @@
+import re
+import soupsieve as sv
+from functools import lru_cache
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+
+# One compound selector: optional tag name, then .class, #id and [attr] / [attr=value] parts
+COMPOUND = re.compile(r"^([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+|\[[\w-]+(?:=(?:\"[^\"]*\"|'[^']*'|[^\]'\"]*))?\])*)$")
+COMPOUND_TOKEN = re.compile(r"\.([\w-]+)|#([\w-]+)|\[([\w-]+)(=(?:\"([^\"]*)\"|'([^']*)'|([^\]'\"]*)))?\]")
+
+
+def is_job_href(href):
+    """Whether a link looks like it points at a job page"""
+    if not href:
+        return False
+    href = href.lower()
+    return 'job' in href or 'career' in href
+
+
+class CompoundMatcher:
+    """Match raw (name, attrs) start tags against one simple compound selector"""
+
+    def __init__(self, tag, classes, attrs):
+        """Initialize the matcher with the parts parsed from the selector"""
+        self.tag = tag
+        self.classes = classes
+        self.attrs = attrs
+
+    @classmethod
+    def parse(cls, selector):
+        """Build a matcher, or return None for selectors it cannot evaluate"""
+        match = COMPOUND.match(selector)
+        if not match or not (match.group(1) or match.group(2)):
+            return None
+        tag = match.group(1).lower() if match.group(1) and match.group(1) != '*' else None
+        classes, attrs = [], {}
+        for class_name, id_, attr, equals, double, single, bare in COMPOUND_TOKEN.findall(match.group(2)):
+            if class_name:
+                classes.append(class_name)
+            elif id_:
+                attrs['id'] = id_
+            else:
+                # A bare [attr] only requires the attribute to be present
+                attrs[attr.lower()] = (double or single or bare) if equals else None
+        return cls(tag, classes, attrs)
+
+    def matches(self, name, attrs):
+        """Whether a start tag with these raw attributes matches"""
+        if self.tag and name != self.tag:
+            return False
+        if self.classes:
+            tag_classes = attrs.get('class') or ''
+            if isinstance(tag_classes, str):
+                tag_classes = tag_classes.split()
+            if not all(cls in tag_classes for cls in self.classes):
+                return False
+        for attr, value in self.attrs.items():
+            tag_value = attrs.get(attr)
+            if tag_value is None:
+                return False
+            if isinstance(tag_value, list):
+                tag_value = ' '.join(tag_value)
+            if value is not None and tag_value != value:
+                return False
+        return True
+
+
+class JobLinkExtractor:
+    """Pull job links out of a search results page without building the whole tree
+
+    The page is parsed with a SoupStrainer that keeps only the subtrees
+    rooted at elements matching the first compound of each selector
+    alternative, plus anchors whose href looks like a job link for the
+    fallback. The selector then runs on that much smaller tree. Selectors
+    the strainer cannot reproduce (sibling combinators, pseudo-classes in
+    the first compound) fall back to parsing the whole page.
+    """
+
+    def __init__(self, job_link_path, parser='lxml'):
+        """Initialize the extractor for a domain's job link selector"""
+        self.job_link_path = job_link_path or ''
+        self.parser = parser
+        self.selector = sv.compile(self.job_link_path) if self.job_link_path.strip() else None
+        self.strainer = self._build_strainer(self.job_link_path)
+
+    def _build_strainer(self, job_link_path):
+        """Return a SoupStrainer for the selector, or None to parse the whole page"""
+        if not job_link_path.strip() or '+' in job_link_path or '~' in job_link_path:
+            return None
+
+        roots = []
+        for alternative in job_link_path.split(','):
+            parts = alternative.replace('>', ' > ').split()
+            root = CompoundMatcher.parse(parts[0]) if parts else None
+            if root is None:
+                return None
+            roots.append(root)
+
+        def keep(name, attrs):
+            if name == 'a' and is_job_href(attrs.get('href')):
+                return True
+            return any(root.matches(name, attrs) for root in roots)
+
+        return SoupStrainer(keep)
+
+    def extract(self, html, base_url):
+        """Return absolute job URLs from a results page, in document order"""
+        if self.strainer is not None:
+            soup = BeautifulSoup(html, self.parser, parse_only=self.strainer)
+        else:
+            soup = BeautifulSoup(html, self.parser)
+
+        # First try with CSS selector
+        job_links = self.selector.select(soup) if self.selector else []
+
+        # If no links found, fall back to any <a> tags with href containing "job" or "career"
+        if not job_links:
+            job_links = [a for a in soup.find_all('a') if is_job_href(a.get('href'))]
+
+        # Make sure the URLs are absolute
+        return [urljoin(base_url, link.get('href')) for link in job_links if link.get('href')]
+
+
+@lru_cache(maxsize=128)
+def get_link_extractor(job_link_path, parser='lxml'):
+    """Return a shared extractor for a job link selector"""
+    return JobLinkExtractor(job_link_path, parser)
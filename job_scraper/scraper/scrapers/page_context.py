@@ -0,0 +1,35 @@
+from functools import cached_property
+
+
+class PageContext:
+    """A parsed job page with its derived text computed at most once
+
+    Extraction helpers read the page text many times; walking the tree
+    for each get_text() call is the expensive part, so the views are
+    cached here and the context is passed around instead of the soup.
+    The soup must not be modified once text has been read.
+    """
+
+    def __init__(self, soup, job_url=None):
+        """Initialize the context for a cleaned, parsed page"""
+        self.soup = soup
+        self.job_url = job_url
+        # Text of the domain's description elements, filled in during extraction
+        self.description_text = ''
+        # Field -> value map from the label pattern scan, filled in on first use
+        self.pattern_values = None
+
+    @cached_property
+    def text(self):
+        """Full page text"""
+        return self.soup.get_text()
+
+    @cached_property
+    def lower_text(self):
+        """Full page text, lowercased for keyword matching"""
+        return self.text.lower()
+
+    @property
+    def content_text(self):
+        """The description text, or the whole page when none was found"""
+        return self.description_text or self.text
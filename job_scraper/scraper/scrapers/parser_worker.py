@@ -0,0 +1,22 @@
+"""Entry points for parser worker processes
+
+Kept free of model imports at module level: spawned workers unpickle these
+functions before Django is set up.
+"""
+import django
+
+# Parser-only JobDescription living in each worker process
+_parser = None
+
+
+def init_parser_worker():
+    """Set up Django and a parser-only JobDescription in a worker process"""
+    global _parser
+    django.setup()
+    from .job_description import JobDescription
+    _parser = JobDescription(use_gemini=False)
+
+
+def parse_job_html(html_content, job_url, domain_link):
+    """Run the CPU-bound clean/extract/clean stages on raw HTML"""
+    return _parser.parse_job_html(html_content, job_url, domain_link, enhance=False)
@@ -0,0 +1,141 @@
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import close_old_connections
+
+from .concurrency import get_concurrency_controller
+from .enrichment_worker import EnrichmentWorker
+from .query_search import QuerySearch
+from .parser_worker import init_parser_worker, parse_job_html
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineQuerySearch(QuerySearch):
+    """Crawl engine separating network I/O, HTML parsing and persistence
+
+    Fetcher threads only download pages, a process pool of parser workers
+    extracts job data from the raw HTML on every core, and a single writer
+    thread stores pages and saves jobs. Jobs needing Gemini are saved as
+    pending enrichment, so the writer never waits on an LLM call; in 'sync'
+    mode an EnrichmentWorker fills them in alongside the crawl and has
+    finished by the time search_many returns.
+    """
+
+    def __init__(self, fetch_workers=None, parse_workers=None):
+        """Initialize the engine with its worker counts"""
+        super().__init__()
+        self.fetch_workers = fetch_workers or getattr(settings, 'SCRAPER_FETCH_WORKERS', 16)
+        self.parse_workers = parse_workers or getattr(settings, 'SCRAPER_PARSE_WORKERS', None) or os.cpu_count() or 1
+
+    def search(self, query):
+        """Search for jobs using the given query across all domains"""
+        self.search_many([query])
+
+    def search_many(self, queries, on_query_done=None):
+        """Search every query across all domains through the pipeline"""
+        # Bounded so fetchers pause instead of piling up pages when the writer falls behind
+        self._results = queue.Queue(maxsize=self.parse_workers * 4)
+        writer = threading.Thread(target=self._writer, daemon=True)
+        writer.start()
+        enrichment = self._start_enrichment()
+
+        domains = list(self.domains)
+        try:
+            # Spawned workers do not inherit locks held by this process's threads
+            with ProcessPoolExecutor(max_workers=self.parse_workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=init_parser_worker) as parsers, \
+                    ThreadPoolExecutor(max_workers=self.fetch_workers) as fetchers, \
+                    ThreadPoolExecutor(max_workers=len(domains) or 1) as searchers:
+                self._parsers = parsers
+                self._fetchers = fetchers
+
+                fetch_futures = []
+                for query in queries:
+                    print(f"Searching for: {query}")
+                    for future in [searchers.submit(self._search_domain_pipeline, domain, query) for domain in domains]:
+                        try:
+                            fetch_futures.extend(future.result())
+                        except Exception as e:
+                            print(f"Error searching for '{query}': {str(e)}")
+                    if on_query_done:
+                        on_query_done(query)
+
+                wait(fetch_futures)
+        finally:
+            self._results.put(None)
+            writer.join()
+            if enrichment:
+                # Finishes the jobs still pending before returning
+                enrichment.stop(wait=True)
+
+    def _start_enrichment(self):
+        """Start a worker enriching this crawl's jobs when Gemini would otherwise run inline"""
+        job_description = self.job_description
+        if not job_description.gemini_model or job_description.enrichment_mode != 'sync':
+            return None
+        worker = EnrichmentWorker()
+        worker.start()
+        return worker
+
+    def _search_domain_pipeline(self, domain, query):
+        """Walk a domain's result pages and hand new job links to the fetchers"""
+        domain_link = domain.link
+        search_url = self._build_search_url(domain.search_link, query)
+
+        print(f"Searching {domain_link} for '{query}'")
+
+        fetch_futures = []
+        for page_url, job_urls, new_job_urls in self._iter_search_pages(
+                domain_link, search_url, domain.job_link_path, domain.paginate):
+            print(f"Found {len(job_urls)} job links ({len(new_job_urls)} new) on {page_url}")
+            fetch_futures.extend(
+                self._fetchers.submit(self._fetch_job, job_url, domain_link) for job_url in new_job_urls
+            )
+        return fetch_futures
+
+    def _fetch_job(self, job_url, domain_link):
+        """Download a job page and queue it for parsing and persistence"""
+        limit = get_concurrency_controller().limit_for(domain_link)
+        limit.acquire()
+        try:
+            html_content = self.job_description.fetch_job_page(job_url)
+        finally:
+            limit.release()
+
+        if html_content is None:
+            return
+        parse_future = self._parsers.submit(parse_job_html, html_content, job_url, domain_link)
+        self._results.put((job_url, domain_link, html_content, parse_future))
+
+    def _writer(self):
+        """Persist parsed pages one at a time, in arrival order"""
+        job_description = self.job_description
+        try:
+            while True:
+                item = self._results.get()
+                if item is None:
+                    return
+
+                job_url, domain_link, html_content, parse_future = item
+                try:
+                    scraped_html = job_description.store_html(job_url, html_content, domain_link)
+                    job_data = parse_future.result()
+
+                    if job_data and job_description.gemini_model:
+                        # Saved as pending; Gemini is called by the enrichment worker
+                        job_description.submit_enrichment(job_data, job_url, scraped_html)
+                        continue
+
+                    if job_data:
+                        job_data.pop('description', '')
+                    job_description.save_job_data(job_data, job_url, scraped_html)
+                except Exception as e:
+                    logger.error(f"Error processing job page {job_url}: {str(e)}")
+        finally:
+            close_old_connections()
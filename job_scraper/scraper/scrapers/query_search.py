@@ -1,114 +1,114 @@
-import os
-import time
-import random
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor
 
 from .utils import get_with_retry
 from .job_description import JobDescription
+from .frontier import get_frontier
+from .config_cache import get_domain_registry
+from .link_extractor import get_link_extractor
 
 class QuerySearch:
     """Class for searching job portals with specific queries"""
     
     def __init__(self):
         """Initialize the query search class"""
-        # Load domain configuration from CSV
-        self.domains_file = os.path.join(settings.CSV_FILE_DIR, 'domain.csv')
-        try:
-            self.domains_df = pd.read_csv(self.domains_file)
-        except Exception as e:
-            raise Exception(f"Error loading domain configuration: {str(e)}")
-        
         # Initialize job description processor
         self.job_description = JobDescription()
     
+    @property
+    def domains(self):
+        """The current domain configuration, reloaded when domain.csv changes"""
+        return get_domain_registry()
+    
     def search(self, query):
         """Search for jobs using the given query across all domains"""
         print(f"Searching for: {query}")
         
-        for _, domain in self.domains_df.iterrows():
+        for domain in self.domains:
             try:
                 self._search_domain(domain, query)
             except Exception as e:
-                print(f"Error searching {domain['domain_link']}: {str(e)}")
+                print(f"Error searching {domain.link}: {str(e)}")
     
     def _search_domain(self, domain, query):
         """Search a specific domain for the given query"""
-        domain_link = domain['domain_link']
-        search_link = domain['domian_search_link']
-        job_link_path = domain['domain_job_link_path_from_search']
-        pagination = domain['domain_pagination']
-        
-        # Replace search term placeholder and encode spaces properly
-        search_url = search_link.replace('{searchTerm}', query.replace(' ', '+'))
+        domain_link = domain.link
+        search_url = self._build_search_url(domain.search_link, query)
         
         print(f"Searching {domain_link} for '{query}'")
         
-        # Process the first page
-        page = 1
-        self._process_search_page(domain_link, search_url, job_link_path)
+        for page_url, job_urls, new_job_urls in self._iter_search_pages(
+                domain_link, search_url, domain.job_link_path, domain.paginate):
+            print(f"Found {len(job_urls)} job links ({len(new_job_urls)} new) on {page_url}")
+            self._process_job_links(domain_link, new_job_urls)
+    
+    def _iter_search_pages(self, domain_link, search_url, job_link_path, paginate):
+        """Yield (page_url, job_urls, new_job_urls) for each results page
         
-        # Process additional pages if pagination is supported
-        if pagination == 'yes':
-            while True:
-                page += 1
-                next_page_url = search_url + f"&page={page}"
-                
+        Every page is fetched exactly once. Page N+1 is prefetched in the
+        background while the caller processes page N's job links, and the
+        walk stops at the first page without links or without unseen links.
+        """
+        frontier = get_frontier()
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            page = 1
+            page_url = search_url
+            future = prefetcher.submit(self._fetch_search_page, page_url, domain_link, job_link_path)
+            
+            while future is not None:
                 try:
-                    response = get_with_retry(next_page_url)
-                    if response.status_code != 200:
-                        break
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    job_links = soup.select(job_link_path)
-                    
-                    if not job_links:
-                        break
-                    
-                    self._process_search_page(domain_link, next_page_url, job_link_path)
-                    
+                    job_urls = future.result()
                 except Exception as e:
                     print(f"Error processing page {page} for {domain_link}: {str(e)}")
-                    break
+                    return
+                future = None
+                
+                if not job_urls:
+                    return
+                
+                # Skip links already crawled before spending any network or LLM work on them
+                new_job_urls = frontier.claim_new(job_urls)
+                if not new_job_urls:
+                    # Everything deeper in the results has most likely been crawled too
+                    print(f"No new job links on {page_url}, stopping pagination")
+                    return
+                
+                if paginate:
+                    next_page_url = self._build_page_url(search_url, page + 1)
+                    future = prefetcher.submit(self._fetch_search_page, next_page_url, domain_link, job_link_path)
+                
+                yield page_url, job_urls, new_job_urls
+                
+                if future is not None:
+                    page += 1
+                    page_url = next_page_url
     
-    def _process_search_page(self, domain_link, search_url, job_link_path):
-        """Process a search results page and extract job links"""
-        try:
-            response = get_with_retry(search_url)
-            if response.status_code != 200:
-                print(f"Error: {search_url} returned status code {response.status_code}")
-                return
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # First try with CSS selector
-            job_links = soup.select(job_link_path)
-            
-            # If no links found, try alternative approaches
-            if not job_links:
-                # Try to find any <a> tags with href containing "job" or "career"
-                job_links = [a for a in soup.find_all('a') if a.get('href') and 
-                            ('job' in a.get('href').lower() or 'career' in a.get('href').lower())]
-            
-            print(f"Found {len(job_links)} job links on {search_url}")
-            
-            for link in job_links:
-                href = link.get('href')
-                if href:
-                    # Make sure the URL is absolute
-                    job_url = urljoin(domain_link, href)
-                    
-                    # Process the job page
-                    try:
-                        self.job_description.process_job_page(job_url, domain_link)
-                    except Exception as e:
-                        print(f"Error processing job page {job_url}: {str(e)}")
-                    
-                    # Random sleep to prevent rate limiting
-                    time.sleep(random.uniform(1.5, 3.5))
-        
-        except Exception as e:
-            print(f"Error processing search page {search_url}: {str(e)}")
\ No newline at end of file
+    def _fetch_search_page(self, page_url, domain_link, job_link_path):
+        """Fetch a results page and return its job URLs, or None if it failed"""
+        response = get_with_retry(page_url)
+        if response.status_code != 200:
+            print(f"Error: {page_url} returned status code {response.status_code}")
+            return None
+        return self._extract_job_links(response.text, domain_link, job_link_path)
+    
+    def _build_search_url(self, search_link, query):
+        """Replace the search term placeholder and encode spaces properly"""
+        return search_link.replace('{searchTerm}', query.replace(' ', '+'))
+    
+    def _build_page_url(self, search_url, page):
+        """Build the URL of a given results page"""
+        return search_url + f"&page={page}"
+    
+    def _extract_job_links(self, html, domain_link, job_link_path):
+        """Extract absolute job URLs from a search results page"""
+        # Only the subtrees the selector can match are parsed
+        extractor = get_link_extractor(job_link_path, self.job_description.html_parser)
+        return extractor.extract(html, domain_link)
+    
+    def _process_job_links(self, domain_link, job_urls):
+        """Process the job pages linked from a search results page"""
+        for job_url in job_urls:
+            try:
+                self.job_description.process_job_page(job_url, domain_link)
+            except Exception as e:
+                print(f"Error processing job page {job_url}: {str(e)}")
@@ -0,0 +1,129 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+
+from scraper.models import CrawlTask
+from .crawl_queue import CrawlQueue
+from .frontier import get_frontier
+from .query_search import QuerySearch
+
+
+class QueueQuerySearch(QuerySearch):
+    """Crawl engine driven by the durable CrawlTask queue
+
+    Search pages and job pages are queued in the database and leased by
+    worker threads in batches, so an interrupted crawl resumes from the
+    pending tasks instead of starting over.
+    """
+
+    def __init__(self, workers=None, batch_size=None):
+        """Initialize the engine and its queue"""
+        super().__init__()
+        self.queue = CrawlQueue()
+        self.workers = workers or getattr(settings, 'SCRAPER_QUEUE_WORKERS', 4)
+        self.batch_size = batch_size or getattr(settings, 'SCRAPER_QUEUE_BATCH_SIZE', 10)
+
+    def search(self, query):
+        """Search for jobs using the given query across all domains"""
+        self.search_many([query])
+
+    def search_many(self, queries):
+        """Queue the queries and drain the queue
+
+        If an earlier run was interrupted its unfinished tasks are kept and
+        finished pages are not searched again.
+        """
+        if not self.queue.has_unfinished():
+            self.queue.clear_finished_searches()
+        self.seed(queries)
+        self.run()
+
+    def seed(self, queries):
+        """Queue the first results page of every query on every domain"""
+        self.queue.enqueue(
+            {
+                'kind': CrawlTask.KIND_SEARCH,
+                'url': self._build_search_url(domain.search_link, query),
+                'domain_link': domain.link,
+                'query': query,
+                'page': 1,
+            }
+            for query in queries
+            for domain in self.domains
+        )
+
+    def resume(self):
+        """Drain whatever an interrupted run left in the queue"""
+        # Tasks leased by a process that is no longer running can be taken back right away
+        self.queue.reclaim_expired(force=True)
+        self.run()
+
+    def run(self):
+        """Drain the queue with worker threads claiming batches"""
+        # Warm the seen-set once before workers start claiming search pages
+        get_frontier()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for future in [executor.submit(self._worker) for _ in range(self.workers)]:
+                future.result()
+
+    def _worker(self):
+        """Claim and run batches until no work is left anywhere"""
+        try:
+            while True:
+                tasks = self.queue.claim_batch(self.batch_size)
+                if not tasks:
+                    # Another worker may still be queueing job pages from a search page
+                    if not self.queue.has_unfinished():
+                        return
+                    time.sleep(0.5)
+                    continue
+
+                for task in tasks:
+                    # A slow batch can outlast the lease taken when it was claimed
+                    if self.queue.renew(task):
+                        self._run_task(task)
+        finally:
+            close_old_connections()
+
+    def _run_task(self, task):
+        """Run one leased task and record its outcome"""
+        try:
+            if task.kind == CrawlTask.KIND_SEARCH:
+                self._run_search_task(task)
+            elif not self.job_description.process_job_page(task.url, task.domain_link):
+                raise Exception("Job page could not be fetched or processed")
+        except Exception as e:
+            print(f"Error running {task.kind} task {task.url}: {str(e)}")
+            self.queue.fail(task, e)
+            return
+        self.queue.complete(task)
+
+    def _run_search_task(self, task):
+        """Fetch a results page and queue its new job pages and the next page"""
+        domain = self.domains.get(task.domain_link)
+        if domain is None:
+            raise Exception(f"Domain {task.domain_link} is no longer configured")
+
+        job_urls = self._fetch_search_page(task.url, task.domain_link, domain.job_link_path)
+        if job_urls is None:
+            raise Exception("Search page could not be fetched")
+
+        new_job_urls = get_frontier().claim_new(job_urls)
+        print(f"Found {len(job_urls)} job links ({len(new_job_urls)} new) on {task.url}")
+
+        tasks = [
+            {'kind': CrawlTask.KIND_JOB, 'url': job_url, 'domain_link': task.domain_link, 'query': task.query}
+            for job_url in new_job_urls
+        ]
+        # Stop paginating at the first page without unseen links
+        if new_job_urls and domain.paginate:
+            search_url = self._build_search_url(domain.search_link, task.query)
+            tasks.append({
+                'kind': CrawlTask.KIND_SEARCH,
+                'url': self._build_page_url(search_url, task.page + 1),
+                'domain_link': task.domain_link,
+                'query': task.query,
+                'page': task.page + 1,
+            })
+        self.queue.enqueue(tasks)
@@ -0,0 +1,114 @@
+import asyncio
+import math
+import threading
+import time
+from urllib.parse import urlparse
+from django.conf import settings
+
+
+def domain_key(url):
+    """Return the host a URL's requests are rate limited under"""
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """Token bucket handing out reservations at a fixed rate with a burst allowance"""
+
+    def __init__(self, rate, burst):
+        """Initialize a full bucket"""
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens may go negative: each waiting caller holds its own place in the queue
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class DomainRateLimiter:
+    """Rate limiter keeping one token bucket per domain"""
+
+    def __init__(self, default_rate=None, default_burst=None):
+        """Initialize the limiter with the fallback rate for unconfigured domains"""
+        self.default_rate = default_rate or getattr(settings, 'SCRAPER_DEFAULT_RATE_LIMIT', 0.5)
+        self.default_burst = default_burst or getattr(settings, 'SCRAPER_DEFAULT_BURST', 2)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url, rate=None, burst=None):
+        """Set the requests/sec and burst for the domain of the given URL"""
+        rate = self._valid_number(rate) or self.default_rate
+        burst = self._valid_number(burst) or self.default_burst
+        key = domain_key(url)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            # An unchanged domain keeps its bucket, and the requests it has already made
+            if bucket is None or bucket.rate != rate or bucket.burst != burst:
+                self._buckets[key] = TokenBucket(rate, burst)
+
+    def configure_domains(self, domains):
+        """Configure every DomainConfig loaded from domain.csv"""
+        for domain in domains:
+            self.configure(domain.link, domain.rate_limit, domain.burst)
+
+    def _valid_number(self, value):
+        """Return a positive float, or None for blank/NaN CSV cells"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        if math.isnan(value) or value <= 0:
+            return None
+        return value
+
+    def _bucket(self, url):
+        """Return the bucket for a URL's domain, creating a default one if needed"""
+        key = domain_key(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(self.default_rate, self.default_burst))
+        return bucket
+
+    def reserve(self, url):
+        """Reserve a request slot for the URL's domain and return the delay before it"""
+        if not getattr(settings, 'SCRAPER_RATE_LIMIT_ENABLED', True):
+            return 0.0
+        return self._bucket(url).reserve()
+
+    def wait(self, url):
+        """Block until a request to the URL's domain is allowed"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """Wait without blocking the event loop until a request is allowed"""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter shared by every fetch path"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = DomainRateLimiter()
+    return _limiter
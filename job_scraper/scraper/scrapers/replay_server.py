@@ -0,0 +1,231 @@
+import os
+import re
+import random
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Every replayed job link lives under this path so its rows are easy to find and delete
+REPLAY_JOB_PATH = '/__replay__/job/'
+
+SELECTOR_PART = re.compile(r"^([a-zA-Z0-9]*)((?:[.#][\w-]+|\[[^\]]+\])*)$")
+SELECTOR_TOKEN = re.compile(r"\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:=['\"]?([^'\"\]]*)['\"]?)?\]")
+
+TITLES = ['Software Engineer', 'Accountant', 'Sales Officer', 'Data Analyst', 'Web Developer',
+          'HR Manager', 'Graphic Designer', 'Civil Engineer', 'Customer Support Agent', 'Nurse']
+COMPANIES = ['Himalayan Tech', 'Everest Bank', 'Kathmandu Traders', 'Manila Digital', 'Cebu Logistics']
+LOCATIONS = ['Kathmandu, Nepal', 'Lalitpur, Nepal', 'Pokhara, Nepal', 'Manila, Philippines', 'Jakarta, Indonesia']
+
+
+def selector_to_html(selector, inner_html, href=None):
+    """Build nested markup that the given descendant CSS selector matches
+
+    Supports the compound forms used in domain.csv: tag, .class, #id and
+    [attr='value'] parts joined by spaces. href, if given, is set on the
+    innermost element.
+    """
+    parts = selector.split(',')[0].split()
+    html = inner_html
+    for index, part in enumerate(reversed(parts)):
+        match = SELECTOR_PART.match(part)
+        if not match:
+            raise ValueError(f"Unsupported selector part for replay: {part}")
+        tag = match.group(1) or 'div'
+        classes, attrs = [], {}
+        for cls, id_, attr, value in SELECTOR_TOKEN.findall(match.group(2)):
+            if cls:
+                classes.append(cls)
+            elif id_:
+                attrs['id'] = id_
+            elif attr:
+                attrs[attr] = value or attr
+        if classes:
+            attrs['class'] = ' '.join(classes)
+        if href and index == 0:
+            attrs['href'] = href
+        attr_html = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        html = f"<{tag}{attr_html}>{html}</{tag}>"
+    return html
+
+
+class ReplaySite:
+    """Recorded or synthesized pages for one domain from domain.csv"""
+
+    def __init__(self, domain, pages, jobs_per_page, run_id, recorded_pages=None):
+        """Initialize the site from a domain's DomainConfig"""
+        self.host = domain.host
+        self.job_link_path = domain.job_link_path
+        self.description_tags = domain.description_tags or 'div.job-description'
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.run_id = run_id
+        self.recorded_pages = recorded_pages or []
+
+    def search_page(self, page):
+        """Render a results page; pages past the last one have no results"""
+        if page > self.pages:
+            return "<html><body><p>No jobs found</p></body></html>"
+
+        first = (page - 1) * self.jobs_per_page
+        cards = ''.join(
+            selector_to_html(self.job_link_path, f"Job {n}", href=f"{REPLAY_JOB_PATH}{self.run_id}-{n}")
+            for n in range(first, first + self.jobs_per_page)
+        )
+        return f"<html><head><title>Search results</title></head><body>{cards}</body></html>"
+
+    def job_page(self, job_id):
+        """Render a job page, preferring recorded HTML for this domain"""
+        number = int(job_id.rsplit('-', 1)[-1]) if job_id.rsplit('-', 1)[-1].isdigit() else 0
+        if self.recorded_pages:
+            return self.recorded_pages[number % len(self.recorded_pages)]
+
+        rng = random.Random(f"{self.host}-{number}")
+        title = rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        location = rng.choice(LOCATIONS)
+        description = (
+            f"<p>We are hiring a {title} to join {company}.</p>"
+            f"<p>Requirements: {rng.randint(1, 6)} years of experience, strong communication skills.</p>"
+            f"<p>Education: Bachelor's degree</p>"
+            f"<p>Salary: NPR {rng.randint(20, 150)},000 per month</p>"
+            f"<p>Deadline: 2026-12-{rng.randint(10, 28)}</p>"
+            "<p>Benefits: health insurance, paid leave, training.</p>"
+        )
+        description_html = selector_to_html(self.description_tags.split(',')[0].strip(), description)
+        return (
+            f"<html><head><title>{title} | {company}</title></head><body>"
+            f"<h1 class=\"job-title\">{title}</h1>"
+            f"<div class=\"company-name\">{company}</div>"
+            f"<div class=\"job-location\">{location}</div>"
+            f"<div class=\"job-type\">Full-time</div>"
+            f"{description_html}</body></html>"
+        )
+
+
+class ReplayServer:
+    """Local HTTP stand-in for every job portal in domain.csv
+
+    Requests are routed as http://127.0.0.1:<port>/<host>/<path>; use
+    rewrite() as the fetch client's url_rewriter to send a crawl here.
+    """
+
+    def __init__(self, domains, pages=3, jobs_per_page=10, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, fixtures_dir=None, recorded_pages=None, seed=None):
+        """Initialize the server with pagination, latency and error injection settings"""
+        self.run_id = f"{int(time.time())}{random.randint(100, 999)}"
+        recorded_pages = recorded_pages or {}
+        self.sites = {}
+        for domain in domains:
+            site = ReplaySite(domain, pages, jobs_per_page, self.run_id)
+            site.recorded_pages = recorded_pages.get(site.host) or self._load_fixtures(fixtures_dir, site.host)
+            self.sites[site.host] = site
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'search_pages': 0, 'job_pages': 0, 'errors': 0, 'throttled': 0, 'not_found': 0}
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    def _load_fixtures(self, fixtures_dir, host):
+        """Load recorded job pages from <fixtures_dir>/<host>/*.html"""
+        if not fixtures_dir:
+            return []
+        host_dir = os.path.join(fixtures_dir, host)
+        if not os.path.isdir(host_dir):
+            return []
+        pages = []
+        for name in sorted(os.listdir(host_dir)):
+            if name.endswith('.html'):
+                with open(os.path.join(host_dir, name), encoding='utf-8') as f:
+                    pages.append(f.read())
+        return pages
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rewrite(self, url):
+        """Map a real portal URL onto this server"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        query = f"?{parts.query}" if parts.query else ''
+        return f"{self.base_url}/{parts.netloc.lower()}{path}{query}"
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self):
+        with self._lock:
+            return self._random.random()
+
+    def respond(self, raw_path):
+        """Return (status, body) for a request path"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._roll() * self.jitter)
+
+        roll = self._roll()
+        if roll < self.throttle_rate:
+            self._count('throttled')
+            return 429, "Too Many Requests"
+        if roll < self.throttle_rate + self.error_rate:
+            self._count('errors')
+            return 503, "Service Unavailable"
+
+        host, _, path = raw_path.lstrip('/').partition('/')
+        site = self.sites.get(host.lower())
+        if site is None:
+            self._count('not_found')
+            return 404, "Unknown host"
+
+        path = '/' + path
+        if path.startswith(REPLAY_JOB_PATH):
+            self._count('job_pages')
+            return 200, site.job_page(path[len(REPLAY_JOB_PATH):].split('?')[0])
+
+        # Any other path is a search; pagination may arrive as "&page=N" in the path or query
+        page = re.search(r'[?&]page=(\d+)', path)
+        self._count('search_pages')
+        return 200, site.search_page(int(page.group(1)) if page else 1)
+
+    def _handler_class(self):
+        """Build a request handler bound to this server"""
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so the fetch client's keep-alive pools behave as they do against real portals
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body = server.respond(self.path)
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ReplayHandler
@@ -0,0 +1,134 @@
+import re
+import time
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+
+from scraper.models import Skill, Benefit
+from .config_cache import get_curated_vocabulary
+
+logger = logging.getLogger(__name__)
+
+SKILL = 'skill'
+BENEFIT = 'benefit'
+
+# Stored values longer than this, or with more words, are sentences rather than terms
+MAX_TERM_LENGTH = 40
+MAX_TERM_WORDS = 4
+
+
+def trie_pattern(terms):
+    """Compile terms into one regex shaped like a trie of their characters
+
+    Terms sharing a prefix share its branch, so matching walks the trie
+    once per text position instead of trying every term. Longer terms
+    are preferred where one term extends another.
+    """
+    root = {}
+    for term in terms:
+        node = root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(root)
+
+
+def _node_pattern(node):
+    """The regex for everything that can follow a trie node"""
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A term ends here, but a longer one may continue
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+def _stored_terms(model, prefix, min_count):
+    """Skill/Benefit values stored at least min_count times, as {lowercase: display}"""
+    fields = [f'{prefix}_{i}' for i in range(1, 15)]
+    counts = Counter()
+    display = {}
+    for row in model.objects.values_list(*fields).iterator():
+        for value in row:
+            value = re.sub(r'\s+', ' ', value or '').strip(' .,;:-')
+            if (len(value) < 3 or len(value) > MAX_TERM_LENGTH or len(value.split()) > MAX_TERM_WORDS
+                    or not re.search(r'[a-zA-Z]', value)):
+                continue
+            key = value.lower()
+            counts[key] += 1
+            display.setdefault(key, value)
+    return {key: display[key] for key, count in counts.items() if count >= min_count}
+
+
+class SkillVocabulary:
+    """Known skill and benefit terms, matched against page text in one pass
+
+    Each term maps to a display name, so aliases ("reactjs") report their
+    canonical term ("React"). Terms only match as whole words.
+    """
+
+    def __init__(self, entries):
+        """Initialize from (kind, term, display) entries; earlier entries win"""
+        self.terms = {}
+        for kind, term, display in entries:
+            term = term.strip().lower()
+            if term and term not in self.terms:
+                self.terms[term] = (kind, display.strip())
+        self.pattern = None
+        if self.terms:
+            self.pattern = re.compile(r'(?<!\w)' + trie_pattern(self.terms) + r'(?!\w)')
+
+    @classmethod
+    def build(cls, curated, min_count=2):
+        """Combine curated entries with terms already stored in the Skill/Benefit tables"""
+        entries = list(curated)
+        for kind, model in ((SKILL, Skill), (BENEFIT, Benefit)):
+            try:
+                stored = _stored_terms(model, kind, min_count)
+            except Exception as e:
+                logger.warning(f"Could not read stored {kind} terms: {str(e)}")
+                continue
+            entries.extend((kind, term, display) for term, display in stored.items())
+        return cls(entries)
+
+    def extract(self, text, limit=14):
+        """Return (skills, benefits) mentioned in text, in order of first mention"""
+        found = {SKILL: {}, BENEFIT: {}}
+        if self.pattern is None or not text:
+            return [], []
+        for match in self.pattern.finditer(text.lower()):
+            kind, display = self.terms[match.group()]
+            found[kind].setdefault(display.lower(), display)
+        return list(found[SKILL].values())[:limit], list(found[BENEFIT].values())[:limit]
+
+    def __len__(self):
+        return len(self.terms)
+
+
+_vocabulary = None
+_vocabulary_source = None
+_vocabulary_built_at = 0.0
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary():
+    """Return the shared vocabulary
+
+    It is rebuilt when the curated file changes, and every
+    SCRAPER_VOCABULARY_REFRESH_SECONDS to pick up newly stored terms.
+    """
+    global _vocabulary, _vocabulary_source, _vocabulary_built_at
+    curated = get_curated_vocabulary()
+    refresh = getattr(settings, 'SCRAPER_VOCABULARY_REFRESH_SECONDS', 600)
+    if _vocabulary is not None and _vocabulary_source is curated and time.monotonic() - _vocabulary_built_at < refresh:
+        return _vocabulary
+
+    with _vocabulary_lock:
+        if _vocabulary is None or _vocabulary_source is not curated or time.monotonic() - _vocabulary_built_at >= refresh:
+            _vocabulary = SkillVocabulary.build(curated, getattr(settings, 'SCRAPER_VOCABULARY_DB_MIN_COUNT', 2))
+            _vocabulary_source = curated
+            _vocabulary_built_at = time.monotonic()
+        return _vocabulary
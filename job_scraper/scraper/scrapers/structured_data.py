@@ -0,0 +1,251 @@
+import re
+import json
+import math
+import logging
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+JSON_LD_TYPE = 'application/ld+json'
+
+# Fields a JobPosting must provide before the heuristic extractors can be skipped
+REQUIRED_FIELDS = ('jobTitle', 'company', 'jobLocation')
+
+
+def _as_list(value):
+    """Wrap a single JSON-LD value in a list"""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _is_job_posting(node):
+    """Whether a JSON-LD node is typed as a schema.org JobPosting"""
+    return any(str(t).rsplit('/', 1)[-1] == 'JobPosting' for t in _as_list(node.get('@type')))
+
+
+def _find_job_postings(node):
+    """Yield every JobPosting node in a JSON-LD document, including inside @graph"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _find_job_postings(item)
+    elif isinstance(node, dict):
+        if _is_job_posting(node):
+            yield node
+        for key in ('@graph', 'mainEntity', 'itemListElement', 'item'):
+            if key in node:
+                yield from _find_job_postings(node[key])
+
+
+def _name(value):
+    """The display name of a Thing, or the value itself if it is plain text"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('legalName')
+    return _text(value)
+
+
+def _text(value):
+    """A JSON-LD value as clean single-line text"""
+    if value is None or isinstance(value, (dict, list)):
+        return ''
+    return re.sub(r'\s+', ' ', str(value)).strip()
+
+
+def _html_text(value, parser):
+    """Text of an HTML fragment such as a JobPosting description"""
+    value = _text(value) if not isinstance(value, str) else value
+    if '<' not in value:
+        return value.strip()
+    return re.sub(r'\s+', ' ', BeautifulSoup(value, parser).get_text(' ')).strip()
+
+
+def _location(value):
+    """Format jobLocation Places as "locality, region, country" joined by '; '"""
+    places = []
+    for place in _as_list(value):
+        if not isinstance(place, dict):
+            text = _text(place)
+        else:
+            address = place.get('address', place)
+            if isinstance(address, dict):
+                parts = [_name(address.get(key)) for key in
+                         ('addressLocality', 'addressRegion', 'addressCountry')]
+                text = ', '.join(dict.fromkeys(part for part in parts if part))
+                text = text or _text(address.get('streetAddress')) or _name(place)
+            else:
+                text = _text(address)
+        if text and text not in places:
+            places.append(text)
+    return '; '.join(places)
+
+
+def _employment_type(value):
+    """Turn FULL_TIME style values into "Full-Time" style text"""
+    types = [_text(item).replace('_', '-').title() for item in _as_list(value)]
+    return ', '.join(t for t in types if t)
+
+
+def _number(value):
+    """Format a salary figure with thousands separators"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return _text(value)
+    if not math.isfinite(number):
+        return _text(value)
+    return f"{number:,.0f}" if number == int(number) else f"{number:,.2f}"
+
+
+def _salary(value):
+    """Format a MonetaryAmount as "NPR 40,000 - 60,000 per month\""""
+    if not isinstance(value, dict):
+        return _text(value)
+    currency = _text(value.get('currency'))
+    amount = value.get('value')
+    unit = ''
+    if isinstance(amount, dict):
+        unit = _text(amount.get('unitText')).lower()
+        low, high = amount.get('minValue'), amount.get('maxValue')
+        if low is not None and high is not None and low != high:
+            amount = f"{_number(low)} - {_number(high)}"
+        else:
+            amount = _number(amount.get('value', low if low is not None else high))
+    else:
+        amount = _number(amount)
+    if not amount:
+        return ''
+    return ' '.join(part for part in (currency, amount, f"per {unit}" if unit else '') if part)
+
+
+def _date(value):
+    """The date part of an ISO 8601 datetime"""
+    return _text(value).split('T')[0]
+
+
+def _items(value, limit=14):
+    """A list of skills or benefits from a list or a comma-separated string"""
+    items = []
+    for item in _as_list(value):
+        item = _name(item) if isinstance(item, dict) else _text(item)
+        items.extend(part.strip() for part in re.split(r'[,\n;]', item) if part.strip())
+    return list(dict.fromkeys(items))[:limit]
+
+
+def _requirement(value):
+    """Text for educationRequirements/experienceRequirements values"""
+    if isinstance(value, dict):
+        if value.get('monthsOfExperience'):
+            months = _number(value['monthsOfExperience'])
+            return f"{months} months"
+        return _text(value.get('credentialCategory')) or _text(value.get('description')) or _name(value)
+    return ', '.join(_text(item) if not isinstance(item, dict) else _requirement(item) for item in _as_list(value))
+
+
+def posting_to_job_data(posting, parser='lxml'):
+    """Map a JobPosting (JSON-LD dict or microdata dict) onto job_data fields"""
+    job_data = {
+        'jobTitle': _text(posting.get('title')),
+        'company': _name(posting.get('hiringOrganization')),
+        'jobLocation': _location(posting.get('jobLocation')),
+        'jobType': _employment_type(posting.get('employmentType')),
+        'salary': _salary(posting.get('baseSalary')),
+        'deadline': _date(posting.get('validThrough')),
+        'jobIndustry': _name(posting.get('industry')),
+        'jobCategory': _name(posting.get('occupationalCategory')),
+        'education': _requirement(posting.get('educationRequirements')),
+        'experience': _requirement(posting.get('experienceRequirements')),
+        'vacancy': _text(posting.get('totalJobOpenings')),
+        'skills': _items(posting.get('skills')),
+        'benefits': _items(posting.get('jobBenefits')),
+        'description': _html_text(posting.get('description') or '', parser),
+    }
+    if not job_data['jobLocation'] and _text(posting.get('jobLocationType')).upper() == 'TELECOMMUTE':
+        job_data['jobLocation'] = 'Remote'
+    return {key: value for key, value in job_data.items() if value}
+
+
+def _is_structured_element(tag):
+    """Whether a tag is a JSON-LD block or a microdata JobPosting scope"""
+    if tag.name == 'script':
+        return tag.get('type') == JSON_LD_TYPE
+    return 'itemscope' in tag.attrs and 'jobposting' in tag.get('itemtype', '').lower()
+
+
+def _json_ld_postings(scripts):
+    """Yield JobPosting nodes from the page's JSON-LD blocks"""
+    for script in scripts:
+        raw = script.string or script.get_text()
+        if not raw or 'JobPosting' not in raw:
+            continue
+        try:
+            document = json.loads(raw, strict=False)
+        except ValueError as e:
+            logger.debug(f"Skipping malformed JSON-LD block: {str(e)}")
+            continue
+        yield from _find_job_postings(document)
+
+
+def _microdata_value(element):
+    """The value of a microdata itemprop element"""
+    if element.get('itemscope') is not None:
+        return _microdata_item(element)
+    for attr in ('content', 'datetime'):
+        if element.get(attr):
+            return element[attr]
+    if element.name in ('a', 'link') and element.get('href'):
+        return element['href']
+    if element.name == 'meta':
+        return element.get('content', '')
+    return element.get_text(' ', strip=True)
+
+
+def _microdata_item(scope):
+    """Collect an itemscope's properties into a JSON-LD style dict"""
+    item = {'@type': scope.get('itemtype', '')}
+    for element in scope.find_all(itemprop=True):
+        # Properties of nested items belong to those items
+        owner = element.find_parent(itemscope=True)
+        if owner is not scope:
+            continue
+        value = _microdata_value(element)
+        for prop in element['itemprop'].split():
+            if prop in item:
+                item[prop] = _as_list(item[prop]) + [value]
+            else:
+                item[prop] = value
+    return item
+
+
+def _microdata_postings(scopes):
+    """Yield JobPosting items marked up with schema.org microdata"""
+    for scope in scopes:
+        yield _microdata_item(scope)
+
+
+def extract_job_posting(soup, parser='lxml'):
+    """Return job_data fields from the first JobPosting on the page
+
+    JSON-LD is tried before microdata. Returns an empty dict when the page
+    has no JobPosting structured data.
+    """
+    # One walk of the tree finds both kinds of markup
+    elements = soup.find_all(_is_structured_element)
+    if not elements:
+        return {}
+
+    for posting in _json_ld_postings(element for element in elements if element.name == 'script'):
+        job_data = posting_to_job_data(posting, parser)
+        if job_data.get('jobTitle'):
+            return job_data
+    for posting in _microdata_postings(element for element in elements if element.name != 'script'):
+        job_data = posting_to_job_data(posting, parser)
+        if job_data.get('jobTitle'):
+            return job_data
+    return {}
+
+
+def has_required_fields(job_data):
+    """Whether job_data has every field the heuristic extractors would look for first"""
+    return all(job_data.get(field) for field in REQUIRED_FIELDS)
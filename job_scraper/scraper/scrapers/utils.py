@@ -1,33 +1,11 @@
-import time
-import random
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import re
 
-def get_with_retry(url, max_retries=3):
-    """Make HTTP requests with retry logic and browser-like headers"""
-    session = requests.Session()
-    retry = Retry(
-        total=max_retries,
-        backoff_factor=0.5,
-        status_forcelist=[500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-    
-    # Add random delay before request
-    time.sleep(random.uniform(1, 3))
-    
-    return session.get(url, headers=headers, timeout=30)
+from .fetch_client import get_fetch_client
+
+def get_with_retry(url):
+    """Make HTTP requests through the shared pooled client with retry logic"""
+    # The client waits on the per-domain rate limiter before each request
+    return get_fetch_client().get(url)
 # ADD these new functions to scraper/scrapers/utils.py
 
 def extract_with_multiple_selectors(soup, selectors, attr=None):
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend the circuit breaker has cut off"""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for an unreliable backend
+
+    The circuit opens after failure_threshold consecutive failures. While
+    open every call is refused until reset_timeout seconds have passed,
+    then up to half_open_calls probe calls are let through: a success
+    closes the circuit, a failure opens it again for another cool-down.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0, half_open_calls=1):
+        """Initialize a closed circuit"""
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = max(1, half_open_calls)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = ''
+        self._probes = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _advance(self, now):
+        """Move an open circuit to half-open once its cool-down is over; caller holds the lock"""
+        if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probes = 0
+
+    def rejects(self):
+        """Whether a call made now would be refused, without taking a probe slot"""
+        with self._lock:
+            self._advance(time.monotonic())
+            return self.state == self.OPEN or (
+                self.state == self.HALF_OPEN and self._probes >= self.half_open_calls
+            )
+
+    def raise_if_open(self):
+        """Raise CircuitOpenError when a call made now would be refused"""
+        if self.rejects():
+            with self._lock:
+                self.rejected += 1
+            raise self._open_error()
+
+    def _open_error(self):
+        """The error refused calls raise"""
+        return CircuitOpenError(f"{self.name} circuit is {self.state}; last error: {self.last_error}")
+
+    def before_call(self):
+        """Let a call through or raise CircuitOpenError"""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+            raise self._open_error()
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def record_failure(self, error=None):
+        """Count a failed call, opening the circuit at the threshold or after a failed probe"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if error is not None:
+                self.last_error = str(error)[:200]
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened for {self.reset_timeout}s after "
+                                   f"{self.consecutive_failures} failures: {self.last_error}")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker"""
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self):
+        """Return the current state for status reporting"""
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (now - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in_seconds': retry_in,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+            }
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_gemini_breaker():
+    """Return the process-wide circuit breaker guarding Gemini calls"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                'Gemini',
+                failure_threshold=getattr(settings, 'GEMINI_BREAKER_FAILURE_THRESHOLD', 5),
+                reset_timeout=getattr(settings, 'GEMINI_BREAKER_RESET_SECONDS', 60),
+                half_open_calls=getattr(settings, 'GEMINI_BREAKER_HALF_OPEN_CALLS', 1)
+            )
+        return _breaker
@@ -1,26 +1,20 @@
-import google.generativeai as genai
+import re
+import time
+import logging
 from django.conf import settings
 
-class GeminiClient:
-    """Client for interacting with the Gemini AI API"""
-    
-    def __init__(self):
-        """Initialize the Gemini client"""
-        # Configure the Gemini API with the key from settings
-        try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-pro')
-            self.initialized = True
-        except Exception as e:
-            print(f"Failed to initialize Gemini API: {str(e)}")
-            self.initialized = False
-    
-    def extract_job_data(self, job_description):
-        """Extract structured job data from a job description"""
-        if not self.initialized:
-            return {}
-        
-        prompt = f"""
+from .gemini_cache import ExtractionCache, get_extraction_cache
+from .circuit_breaker import CircuitOpenError, get_gemini_breaker
+from .prompt_reducer import estimate_tokens, reduce_description
+from .llm_usage import get_llm_usage
+from .llm_backends import get_llm_backend
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompt or the response parsing changes, so cached results are not reused
+PROMPT_VERSION = 1
+
+EXTRACTION_PROMPT = """
         Extract the following information from this job description:
         1. Skills required (list up to 14)
         2. Benefits offered (list up to 14)
@@ -29,7 +23,7 @@ class GeminiClient:
         5. Education requirements
         6. Experience requirements
         7. Job Type (full-time, part-time, contract, etc.)
-        
+
         Return the results in a structured format like this:
         Skills: skill1, skill2, ...
         Benefits: benefit1, benefit2, ...
@@ -38,14 +32,233 @@ class GeminiClient:
         Education: education requirement
         Experience: experience requirement
         Job Type: job type
-        
-        Here's the job description:
-        {job_description}
+
+        Here's the job description:{description}
         """
-        
+
+BATCH_PROMPT = """
+        Extract the following information from each of the {count} job descriptions below:
+        1. Skills required (list up to 14)
+        2. Benefits offered (list up to 14)
+        3. Job category
+        4. Industry
+        5. Education requirements
+        6. Experience requirements
+        7. Job Type (full-time, part-time, contract, etc.)
+
+        Answer every job description separately, in order. Start each answer with a line
+        "### RESULT n" where n is the number of the job description, followed by:
+        Skills: skill1, skill2, ...
+        Benefits: benefit1, benefit2, ...
+        Category: category
+        Industry: industry
+        Education: education requirement
+        Experience: experience requirement
+        Job Type: job type
+
+        {descriptions}
+        """
+
+# Header opening each job description in a batch prompt, and each answer in the response
+BATCH_ITEM_HEADER = "=== JOB DESCRIPTION {number} ==="
+BATCH_RESULT_HEADER = re.compile(r'^\W*RESULT\s+(\d+)\W*$', re.MULTILINE | re.IGNORECASE)
+
+# Response labels and the job_data fields they fill; list fields are comma-separated
+LIST_FIELDS = {'Skills': 'skills', 'Benefits': 'benefits'}
+TEXT_FIELDS = {
+    'Category': 'jobCategory',
+    'Industry': 'jobIndustry',
+    'Education': 'education',
+    'Experience': 'experience',
+    'Job Type': 'jobType',
+}
+
+# Fields Gemini always overrides; the rest only fill in what extraction missed
+OVERRIDE_FIELDS = ('skills', 'benefits', 'jobIndustry')
+
+# Usage figures shared out between the jobs of a batch prompt
+USAGE_COUNTS = ('prompt_chars', 'prompt_tokens', 'response_chars', 'response_tokens')
+
+
+def build_prompt(description):
+    """Return the extraction prompt for a job description"""
+    return EXTRACTION_PROMPT.format(description=description)
+
+
+def build_batch_prompt(descriptions):
+    """Return one prompt asking for the fields of several job descriptions"""
+    sections = '\n\n'.join(
+        f"{BATCH_ITEM_HEADER.format(number=number)}\n{description}"
+        for number, description in enumerate(descriptions, 1)
+    )
+    return BATCH_PROMPT.format(count=len(descriptions), descriptions=sections)
+
+
+def split_batch_response(text, count):
+    """Split a batch response into the answer text for each of count items
+
+    Items the response has no answer for are None, so the caller can
+    retry them on their own.
+    """
+    answers = [None] * count
+    headers = list(BATCH_RESULT_HEADER.finditer(text))
+    for header, following in zip(headers, headers[1:] + [None]):
+        number = int(header.group(1))
+        if 1 <= number <= count and answers[number - 1] is None:
+            end = following.start() if following else len(text)
+            answers[number - 1] = text[header.end():end].strip()
+    return answers
+
+
+def parse_response(text):
+    """Parse Gemini's "Label: value" output into job_data fields"""
+    fields = {}
+    for label, field in LIST_FIELDS.items():
+        match = re.search(rf'{label}:\s*(.*?)(?:\n|$)', text)
+        if match:
+            fields[field] = [item.strip() for item in match.group(1).split(',')][:14]
+    for label, field in TEXT_FIELDS.items():
+        match = re.search(rf'{label}:\s*(.*?)(?:\n|$)', text)
+        if match:
+            fields[field] = match.group(1).strip()
+    return fields
+
+
+def merge_fields(job_data, fields):
+    """Apply parsed Gemini fields to job_data"""
+    for field, value in fields.items():
+        if field in OVERRIDE_FIELDS or not job_data.get(field):
+            # Copy lists so cached results are never modified through job_data
+            job_data[field] = list(value) if isinstance(value, list) else value
+    return job_data
+
+
+class GeminiClient:
+    """Client for interacting with the Gemini AI API
+
+    Prompts go to the backend chosen by the LLM_BACKEND setting (see
+    llm_backends), or to the backend passed in.
+    """
+
+    def __init__(self, backend=None):
+        """Initialize the Gemini client"""
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            self.model = backend or get_llm_backend()
+            self.initialized = True
         except Exception as e:
-            print(f"Error calling Gemini API: {str(e)}")
-            return ""
\ No newline at end of file
+            logger.warning(f"Gemini API not configured properly. Error: {str(e)}")
+            self.model = None
+            self.initialized = False
+        if getattr(self.model, 'name', 'gemini') == 'gemini':
+            self.cache = get_extraction_cache()
+        else:
+            # Stand-in answers are neither stored nor served from the cache, so every
+            # load test run makes its simulated calls
+            self.cache = ExtractionCache(enabled=False)
+        self.breaker = get_gemini_breaker()
+        self.usage = get_llm_usage()
+        self.max_prompt_tokens = getattr(settings, 'GEMINI_MAX_PROMPT_TOKENS', 2000)
+
+    def prepare(self, job_description):
+        """Reduce a description to the text worth sending, within the token budget"""
+        return reduce_description(job_description, self.max_prompt_tokens)
+
+    def extract_job_data(self, job_description, domain=None):
+        """Extract structured job data fields from a job description
+
+        Results are cached by the description's content, so the same
+        posting seen again (reprocessing, cross-listings) costs no API call.
+        Raises on API errors, and CircuitOpenError without calling the API
+        while the circuit breaker is open; failed calls are not cached.
+        Usage is recorded under domain.
+        """
+        job_description = self.prepare(job_description)
+        key = self.cache.key(job_description, PROMPT_VERSION)
+        fields = self.cache.get(key)
+        if fields is not None:
+            return fields
+
+        if not self.initialized:
+            return {}
+        self.breaker.raise_if_open()
+
+        text = self._send(build_prompt(job_description), [(domain, 1.0)])
+        fields = parse_response(text)
+        self.cache.put(key, PROMPT_VERSION, fields, text)
+        return fields
+
+    def extract_batch(self, job_descriptions, domains=None, wait_for_request=None):
+        """Extract fields for several job descriptions with a single prompt
+
+        Returns one fields dict per description, in order. Cached
+        descriptions are not sent, and any the response leaves out are
+        asked for again one at a time. domains lists the domain each
+        description's usage is recorded under. wait_for_request, if given,
+        is called before each of those extra requests so they count
+        against the caller's quota like the batch prompt did.
+        """
+        job_descriptions = [self.prepare(description) for description in job_descriptions]
+        domains = domains or [None] * len(job_descriptions)
+        keys = [self.cache.key(description, PROMPT_VERSION) for description in job_descriptions]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, fields in enumerate(results) if fields is None]
+        if not missing or not self.initialized:
+            return [fields or {} for fields in results]
+
+        self.breaker.raise_if_open()
+        sent_batch = len(missing) > 1
+        if sent_batch:
+            sizes = [len(job_descriptions[i]) or 1 for i in missing]
+            shares = [(domains[i], size / sum(sizes)) for i, size in zip(missing, sizes)]
+            text = self._send(build_batch_prompt([job_descriptions[i] for i in missing]), shares)
+            for i, answer in zip(missing, split_batch_response(text, len(missing))):
+                if answer is not None:
+                    results[i] = parse_response(answer)
+                    self.cache.put(keys[i], PROMPT_VERSION, results[i], answer)
+
+        for i in missing:
+            if results[i] is None:
+                # A lone description uses the request the caller reserved for the batch
+                if sent_batch and wait_for_request:
+                    wait_for_request()
+                results[i] = self.extract_job_data(job_descriptions[i], domains[i])
+        return results
+
+    def generate(self, prompt):
+        """Send a prompt to Gemini through the circuit breaker
+
+        Returns the response text and the call's usage figures, with token
+        counts from the response metadata when the API reports them.
+        """
+        started = time.monotonic()
+        response = self.breaker.call(self.model.generate_content, prompt)
+        text = response.text
+        metadata = getattr(response, 'usage_metadata', None)
+        return text, {
+            'prompt_chars': len(prompt),
+            'prompt_tokens': getattr(metadata, 'prompt_token_count', 0) or estimate_tokens(prompt),
+            'response_chars': len(text),
+            'response_tokens': getattr(metadata, 'candidates_token_count', 0) or estimate_tokens(text),
+            'latency': time.monotonic() - started,
+        }
+
+    def _send(self, prompt, shares):
+        """Generate a response, recording its usage split over (domain, fraction) shares"""
+        started = time.monotonic()
+        try:
+            text, usage = self.generate(prompt)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            usage = {'prompt_chars': len(prompt), 'prompt_tokens': estimate_tokens(prompt),
+                     'latency': time.monotonic() - started}
+            self._record_usage(usage, shares, error=True)
+            raise
+        self._record_usage(usage, shares)
+        return text
+
+    def _record_usage(self, usage, shares, error=False):
+        """Record each domain's share of a call; every job waited the full latency"""
+        for domain, fraction in shares:
+            counts = {name: round(usage.get(name, 0) * fraction) for name in USAGE_COUNTS}
+            self.usage.record(domain, latency=usage['latency'], error=error, **counts)
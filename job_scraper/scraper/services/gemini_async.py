@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from django.conf import settings
+
+from scraper.scrapers.rate_limiter import TokenBucket
+from .gemini_api import GeminiClient, PROMPT_VERSION
+from .circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGeminiClient:
+    """Gemini extraction run on a background event loop under a quota
+
+    submit() returns a concurrent.futures.Future straight away, so callers
+    never wait on an LLM round-trip. Queued descriptions are packed up to
+    batch_size per prompt (waiting at most batch_wait seconds to fill a
+    batch), at most `concurrency` prompts are in flight, and prompts start
+    no faster than requests_per_minute. Throughput is then set by the
+    quota rather than by latency.
+    """
+
+    def __init__(self, client=None, concurrency=4, requests_per_minute=60, batch_size=5, batch_wait=0.5):
+        """Initialize the client and start its event loop thread"""
+        self.client = client or GeminiClient()
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.requests = TokenBucket(requests_per_minute / 60.0, self.concurrency)
+        # Futures for descriptions already queued or in flight, by cache key
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='gemini-async', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self):
+        """Create the loop-bound queue and start the batcher"""
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._tasks = set()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    def submit(self, description, domain=None):
+        """Queue a description and return a Future of its fields dict
+
+        The call's usage is recorded under domain.
+        """
+        description = self.client.prepare(description)
+        cache = self.client.cache
+        key = cache.key(description, PROMPT_VERSION)
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                # The same text is already on its way to Gemini
+                return future
+
+        future = Future()
+        fields = cache.get(key)
+        if fields is not None or not self.client.initialized:
+            future.set_result(fields or {})
+            return future
+        try:
+            # Fail now rather than after waiting for a batch slot and the quota
+            self.client.breaker.raise_if_open()
+        except CircuitOpenError as e:
+            future.set_exception(e)
+            return future
+
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (description, domain, future))
+        return future
+
+    def close(self):
+        """Stop the batcher and the event loop thread; work still queued is dropped"""
+        asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _cancel_tasks(self):
+        """Cancel the batcher and every batch in flight"""
+        tasks = [self._batcher, *self._tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    async def _batch_loop(self):
+        """Group queued descriptions into batches and start them as slots free up"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # While every slot is busy the next batch keeps filling up
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        """Send one batch once the per-minute budget allows it"""
+        try:
+            delay = self.requests.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            descriptions = [description for description, _, _ in batch]
+            domains = [domain for _, domain, _ in batch]
+            results = await asyncio.to_thread(self.client.extract_batch, descriptions, domains,
+                                              self._wait_for_request)
+            for (_, _, future), fields in zip(batch, results):
+                future.set_result(fields)
+        except Exception as e:
+            if not isinstance(e, CircuitOpenError):
+                logger.error(f"Error using Gemini API: {str(e)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _wait_for_request(self):
+        """Block the calling thread until the per-minute budget allows another prompt"""
+        delay = self.requests.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_async_gemini_client():
+    """Return the process-wide async Gemini client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AsyncGeminiClient(
+                concurrency=getattr(settings, 'GEMINI_CONCURRENCY', 4),
+                requests_per_minute=getattr(settings, 'GEMINI_REQUESTS_PER_MINUTE', 60),
+                batch_size=getattr(settings, 'GEMINI_BATCH_SIZE', 5),
+                batch_wait=getattr(settings, 'GEMINI_BATCH_WAIT_SECONDS', 0.5)
+            )
+        return _client
@@ -0,0 +1,157 @@
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+from scraper.models import GeminiExtraction
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially reformatted copies of a posting share a key"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class ExtractionCache:
+    """Gemini extraction results keyed by description content and prompt version
+
+    An in-process LRU sits in front of the GeminiExtraction table. Entries
+    older than max_age, in either of them, are treated as misses, and the table is trimmed
+    to max_entries (least recently used first) every prune_interval writes.
+    A cache created with enabled=False misses every lookup and stores nothing.
+    """
+
+    def __init__(self, lru_size=1024, max_entries=50000, max_age=timedelta(days=90), prune_interval=100,
+                 enabled=True):
+        """Initialize the cache with its size and age limits"""
+        self.enabled = enabled
+        self.lru_size = lru_size
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.prune_interval = prune_interval
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        # SQLite fails concurrent read-then-write transactions instead of waiting, so writes take turns
+        self._write_lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text, prompt_version):
+        """Return the cache key for a description under a prompt version"""
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8'))
+        digest.update(f"\0{prompt_version}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached fields for a key, or None"""
+        if not self.enabled:
+            with self._lock:
+                self.misses += 1
+            return None
+        now = timezone.now()
+        with self._lock:
+            if key in self._lru:
+                created_at, fields = self._lru[key]
+                if created_at >= now - self.max_age:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return fields
+                # Expired; the lookup below drops the row as well
+                del self._lru[key]
+
+        try:
+            entry = GeminiExtraction.objects.filter(key=key).first()
+            if entry is not None and entry.created_at < now - self.max_age:
+                entry.delete()
+                entry = None
+            if entry is not None:
+                GeminiExtraction.objects.filter(pk=entry.pk).update(last_used_at=now, hits=entry.hits + 1)
+        except Exception as e:
+            logger.warning(f"Gemini cache lookup failed: {str(e)}")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, entry.created_at, entry.fields)
+        return entry.fields
+
+    def put(self, key, prompt_version, fields, raw_response=''):
+        """Store the fields parsed from a Gemini response"""
+        if not self.enabled:
+            return
+        now = timezone.now()
+        with self._lock:
+            self._remember(key, now, fields)
+            self._writes += 1
+            prune = self._writes % self.prune_interval == 0
+
+        try:
+            with self._write_lock:
+                self._write(key, prompt_version, fields, raw_response, now, prune)
+        except Exception as e:
+            logger.warning(f"Gemini cache write failed: {str(e)}")
+
+    def _write(self, key, prompt_version, fields, raw_response, created_at, prune):
+        """Upsert a row, pruning the table every prune_interval writes"""
+        GeminiExtraction.objects.update_or_create(
+            key=key,
+            defaults={
+                'prompt_version': prompt_version,
+                'fields': fields,
+                'raw_response': raw_response,
+                'created_at': created_at,
+                'last_used_at': created_at,
+                'hits': 0
+            }
+        )
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete expired rows, then the least recently used beyond max_entries"""
+        expired, _ = GeminiExtraction.objects.filter(created_at__lt=timezone.now() - self.max_age).delete()
+        excess = GeminiExtraction.objects.count() - self.max_entries
+        evicted = 0
+        if excess > 0:
+            stale = GeminiExtraction.objects.order_by('last_used_at').values_list('pk', flat=True)[:excess]
+            evicted, _ = GeminiExtraction.objects.filter(pk__in=list(stale)).delete()
+        if expired or evicted:
+            logger.info(f"Pruned Gemini cache: {expired} expired, {evicted} evicted")
+
+    def clear(self):
+        """Forget the in-process entries; the database table is left alone"""
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key, created_at, fields):
+        """Add an entry to the LRU, dropping the oldest when full; caller holds the lock"""
+        self._lru[key] = (created_at, fields)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Return the process-wide Gemini extraction cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache(
+                lru_size=getattr(settings, 'GEMINI_CACHE_LRU_SIZE', 1024),
+                max_entries=getattr(settings, 'GEMINI_CACHE_MAX_ENTRIES', 50000),
+                max_age=timedelta(days=getattr(settings, 'GEMINI_CACHE_MAX_AGE_DAYS', 90))
+            )
+        return _cache
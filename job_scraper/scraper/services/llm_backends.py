@@ -0,0 +1,207 @@
+import re
+import time
+import random
+import hashlib
+import threading
+from collections import deque
+from types import SimpleNamespace
+import google.generativeai as genai
+from django.conf import settings
+
+from .prompt_reducer import estimate_tokens
+
+# Batch prompts mark each description with this header (see gemini_api.BATCH_PROMPT)
+BATCH_ITEM_HEADER = re.compile(r'^[ \t]*=== JOB DESCRIPTION (\d+) ===[ \t]*$', re.MULTILINE)
+
+# Answer pools for the fake backend; terms found in a description are preferred
+FAKE_SKILLS = ['Communication', 'Teamwork', 'Python', 'JavaScript', 'SQL', 'Excel', 'Accounting',
+               'Customer Service', 'Sales', 'Project Management', 'Leadership', 'AutoCAD', 'React',
+               'Django', 'Problem Solving', 'Marketing', 'Data Analysis', 'Nursing', 'Photoshop', 'Negotiation']
+FAKE_BENEFITS = ['Health Insurance', 'Paid Leave', 'Festival Bonus', 'Provident Fund', 'Flexible Hours',
+                 'Remote Work', 'Training', 'Lunch Allowance', 'Performance Bonus', 'Transportation']
+FAKE_CATEGORIES = ['IT & Telecommunication', 'Accounting & Finance', 'Sales & Marketing', 'Engineering',
+                   'Healthcare', 'Human Resources', 'Customer Service', 'Design & Creative']
+FAKE_INDUSTRIES = ['Information Technology', 'Banking', 'Retail', 'Construction', 'Healthcare',
+                   'Logistics', 'Education', 'Manufacturing']
+FAKE_EDUCATION = ["Bachelor's Degree", "Master's Degree", 'Diploma', 'High School', 'Not specified']
+FAKE_EXPERIENCE = ['1 year', '2 years', '3-5 years', '5+ years', 'Fresher']
+FAKE_JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+
+
+class LLMError(Exception):
+    """A failed call reported by an LLM backend"""
+
+
+class LLMRateLimitError(LLMError):
+    """The backend refused a call because the request quota is used up"""
+
+
+class LLMBackend:
+    """The model GeminiClient sends prompts to
+
+    generate_content(prompt) returns an object with a .text attribute and,
+    optionally, usage_metadata carrying prompt_token_count and
+    candidates_token_count, the same shape google.generativeai responds
+    with. Failed calls raise.
+    """
+
+    name = ''
+
+    def generate_content(self, prompt):
+        """Send one prompt and return the response"""
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """The real Gemini API through google.generativeai"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name='gemini-pro'):
+        """Configure the API key and create the model"""
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt):
+        """Send one prompt to Gemini"""
+        return self.model.generate_content(prompt)
+
+
+class FakeLLMBackend(LLMBackend):
+    """Offline stand-in for Gemini, for load and integration testing
+
+    Each description gets a deterministic answer in the Skills:/Benefits:/
+    Category: format, derived from a hash of its text, so repeated runs
+    produce the same jobs. Batch prompts are answered per description
+    under "### RESULT n" headers. Every call sleeps latency (plus up to
+    jitter) seconds; error_rate of calls raise LLMError and throttle_rate
+    raise LLMRateLimitError, as do calls beyond requests_per_minute.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency=0.5, jitter=0.0, error_rate=0.0, throttle_rate=0.0, requests_per_minute=None,
+                 seed=None):
+        """Initialize the backend with its latency and failure settings"""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests_per_minute = requests_per_minute
+        self._random = random.Random(seed)
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'errors': 0, 'throttled': 0}
+
+    def generate_content(self, prompt):
+        """Answer a single or batch extraction prompt after the configured delay"""
+        with self._lock:
+            self.stats['calls'] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            roll = self._random.random()
+            over_quota = self._over_quota()
+        time.sleep(delay)
+
+        if over_quota or roll < self.throttle_rate:
+            self._count('throttled')
+            raise LLMRateLimitError("429 Resource has been exhausted (e.g. check quota).")
+        if roll < self.throttle_rate + self.error_rate:
+            self._count('errors')
+            raise LLMError("500 An internal error has occurred.")
+
+        text = self.answer(prompt)
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(
+            prompt_token_count=estimate_tokens(prompt),
+            candidates_token_count=estimate_tokens(text),
+        ))
+
+    def answer(self, prompt):
+        """The response text for a prompt"""
+        parts = BATCH_ITEM_HEADER.split(prompt)
+        if len(parts) < 3:
+            return self._fields_text(prompt.rsplit("Here's the job description:", 1)[-1])
+        # parts alternates preamble, number, description, number, description...
+        return '\n'.join(
+            f"### RESULT {number}\n{self._fields_text(description)}"
+            for number, description in zip(parts[1::2], parts[2::2])
+        )
+
+    def _fields_text(self, description):
+        """Deterministic extraction fields for one description"""
+        description = description.strip()
+        digest = int(hashlib.sha256(description.encode('utf-8')).hexdigest(), 16)
+        lowered = description.lower()
+
+        def pick(pool, count, offset):
+            found = [term for term in pool if term.lower() in lowered]
+            start = (digest >> offset) % len(pool)
+            rest = pool[start:] + pool[:start]
+            return (found + [term for term in rest if term not in found])[:count]
+
+        return '\n'.join([
+            f"Skills: {', '.join(pick(FAKE_SKILLS, 3 + digest % 6, 8))}",
+            f"Benefits: {', '.join(pick(FAKE_BENEFITS, 2 + (digest >> 4) % 4, 16))}",
+            f"Category: {FAKE_CATEGORIES[(digest >> 24) % len(FAKE_CATEGORIES)]}",
+            f"Industry: {FAKE_INDUSTRIES[(digest >> 32) % len(FAKE_INDUSTRIES)]}",
+            f"Education: {FAKE_EDUCATION[(digest >> 40) % len(FAKE_EDUCATION)]}",
+            f"Experience: {FAKE_EXPERIENCE[(digest >> 48) % len(FAKE_EXPERIENCE)]}",
+            f"Job Type: {FAKE_JOB_TYPES[(digest >> 56) % len(FAKE_JOB_TYPES)]}",
+        ])
+
+    def _over_quota(self):
+        """Whether this call exceeds requests_per_minute; call with the lock held"""
+        if not self.requests_per_minute:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 60:
+            self._recent.popleft()
+        if len(self._recent) >= self.requests_per_minute:
+            return True
+        self._recent.append(now)
+        return False
+
+    def _count(self, stat):
+        """Increment one of the call counters"""
+        with self._lock:
+            self.stats[stat] += 1
+
+
+def _backend_settings():
+    """The settings that decide which backend is built, and how"""
+    return (
+        getattr(settings, 'LLM_BACKEND', 'gemini'),
+        getattr(settings, 'FAKE_LLM_LATENCY_MS', 500),
+        getattr(settings, 'FAKE_LLM_JITTER_MS', 0),
+        getattr(settings, 'FAKE_LLM_ERROR_RATE', 0.0),
+        getattr(settings, 'FAKE_LLM_THROTTLE_RATE', 0.0),
+        getattr(settings, 'FAKE_LLM_REQUESTS_PER_MINUTE', None),
+        getattr(settings, 'FAKE_LLM_SEED', None),
+    )
+
+
+_backend = None
+_backend_config = None
+_backend_lock = threading.Lock()
+
+
+def get_llm_backend():
+    """Return the process-wide LLM backend chosen by the LLM_BACKEND setting
+
+    'gemini' uses the real API; 'fake' uses FakeLLMBackend configured by
+    the FAKE_LLM_* settings. The backend is rebuilt when those settings
+    change. Raises if the backend cannot be created.
+    """
+    global _backend, _backend_config
+    config = _backend_settings()
+    with _backend_lock:
+        if _backend is None or _backend_config != config:
+            name, latency_ms, jitter_ms, error_rate, throttle_rate, requests_per_minute, seed = config
+            if name == 'fake':
+                _backend = FakeLLMBackend(latency_ms / 1000, jitter_ms / 1000, error_rate, throttle_rate,
+                                          requests_per_minute, seed)
+            elif name == 'gemini':
+                _backend = GeminiBackend(settings.GEMINI_API_KEY)
+            else:
+                raise ValueError(f"Unknown LLM_BACKEND: {name}")
+            _backend_config = config
+        return _backend
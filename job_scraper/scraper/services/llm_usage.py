@@ -0,0 +1,98 @@
+import threading
+
+
+class UsageCounter:
+    """Running totals for LLM calls made on behalf of one domain"""
+
+    def __init__(self):
+        """Initialize empty totals"""
+        self.calls = 0
+        self.errors = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.response_chars = 0
+        self.response_tokens = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    def add(self, prompt_chars, prompt_tokens, response_chars, response_tokens, latency, error):
+        """Add one call's figures"""
+        self.calls += 1
+        self.errors += 1 if error else 0
+        self.prompt_chars += prompt_chars
+        self.prompt_tokens += prompt_tokens
+        self.response_chars += response_chars
+        self.response_tokens += response_tokens
+        self.latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def snapshot(self):
+        """Return the totals and averages for status reporting"""
+        calls = max(self.calls, 1)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'prompt_tokens': self.prompt_tokens,
+            'response_tokens': self.response_tokens,
+            'avg_prompt_tokens': round(self.prompt_tokens / calls),
+            'avg_response_tokens': round(self.response_tokens / calls),
+            'prompt_chars': self.prompt_chars,
+            'response_chars': self.response_chars,
+            'avg_latency_ms': round(self.latency / calls * 1000),
+            'max_latency_ms': round(self.max_latency * 1000),
+        }
+
+
+class LLMUsageStats:
+    """Prompt size, response size and latency of LLM calls, per domain
+
+    A batch prompt covering jobs from several domains is recorded once
+    per job, with the prompt and response split between them and the
+    whole call's latency, since each job waited that long.
+    """
+
+    def __init__(self):
+        """Initialize with no calls recorded"""
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    def record(self, domain, prompt_chars=0, prompt_tokens=0, response_chars=0, response_tokens=0,
+               latency=0.0, error=False):
+        """Record one call (or one job's share of a batch call) for a domain"""
+        domain = domain or ''
+        with self._lock:
+            counter = self._domains.get(domain)
+            if counter is None:
+                counter = self._domains[domain] = UsageCounter()
+            counter.add(prompt_chars, prompt_tokens, response_chars, response_tokens, latency, error)
+
+    def snapshot(self):
+        """Return per-domain figures plus a '(total)' row"""
+        with self._lock:
+            counters = dict(self._domains)
+            total = UsageCounter()
+            for counter in counters.values():
+                total.calls += counter.calls
+                total.errors += counter.errors
+                total.prompt_chars += counter.prompt_chars
+                total.prompt_tokens += counter.prompt_tokens
+                total.response_chars += counter.response_chars
+                total.response_tokens += counter.response_tokens
+                total.latency += counter.latency
+                total.max_latency = max(total.max_latency, counter.max_latency)
+            report = {domain or '(unknown)': counter.snapshot() for domain, counter in sorted(counters.items())}
+        report['(total)'] = total.snapshot()
+        return report
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._domains.clear()
+
+
+_stats = LLMUsageStats()
+
+
+def get_llm_usage():
+    """Return the process-wide LLM usage stats"""
+    return _stats
@@ -0,0 +1,112 @@
+import re
+
+# Rough characters per token for English text; close enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Lines that are page furniture rather than part of the posting. Every alternative
+# matches a whole short line, or a line opening like a footer or cookie banner, so
+# requirements that merely mention cookies, privacy or copyright are kept
+BOILERPLATE = re.compile(
+    r'^(?:(?:privacy policy|privacy|cookie policy|cookies?|terms (?:of use|of service|and conditions|& conditions)'
+    r'|sitemap|contact us|about us)\s*[|·]?\s*)+$'
+    r'|^(?:©|\(c\)).{0,80}$|^copyright\s*(?:©|\(c\))?\s*\d{4}.{0,80}$|^.{0,80}all rights reserved\.?$'
+    r'|^(?:this (?:site|website)|we) uses? cookies\b|^(?:accept|allow|reject|manage)(?: all)? cookies$'
+    r'|^(?:share|share this job|apply now|apply|save job|report (?:this )?job|sign in|log ?in|register'
+    r'|sign up|back to (?:search|results|jobs)|similar jobs|related jobs|follow us|subscribe'
+    r'|home|menu|search|next|previous|print)$'
+    r'|^(?:facebook|twitter|linkedin|instagram|youtube|whatsapp)$',
+    re.IGNORECASE
+)
+
+# Section headings whose content Gemini is asked for, kept ahead of everything else
+PRIORITY_HEADING = re.compile(
+    r'requirement|qualification|skill|experience|education|competenc|you (?:will )?(?:need|have|bring)'
+    r'|benefit|perk|we offer|what you get|compensation|salary|allowance|insurance',
+    re.IGNORECASE
+)
+
+# Other section headings, which end a priority section
+SECTION_HEADING = re.compile(
+    r'about (?:us|the (?:company|role|job))|responsibilit|job description|overview|duties'
+    r'|how to apply|who we are|what you(?:\'ll| will) do|the role',
+    re.IGNORECASE
+)
+
+# Longest line still treated as a possible section heading
+MAX_HEADING_LENGTH = 60
+
+# Shortest useful piece of a line cut to fit the budget
+MIN_TRUNCATED_LENGTH = 40
+
+
+def estimate_tokens(text):
+    """Approximate the token count of a text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _lines(text):
+    """Split text into whitespace-normalized, non-empty lines
+
+    Page text from get_text() can arrive as a few very long lines, so
+    sentences are split apart too; that gives dedup and the budget
+    something finer than whole paragraphs to work with.
+    """
+    for line in text.splitlines():
+        for part in re.split(r'(?<=[.!?;])\s+(?=[A-Z•\-\d])|\s*•\s*', line):
+            part = re.sub(r'\s+', ' ', part).strip()
+            if part:
+                yield part
+
+
+def _is_heading(line):
+    """Whether a line looks like a section heading"""
+    if len(line) > MAX_HEADING_LENGTH:
+        return False
+    if line.endswith(':'):
+        return True
+    return not re.search(r'[.!?,;]$', line) and bool(PRIORITY_HEADING.search(line) or SECTION_HEADING.search(line))
+
+
+def reduce_description(text, max_tokens=None):
+    """Shrink job description text before it goes into a prompt
+
+    Repeated lines and site boilerplate are dropped. When the rest is
+    still over max_tokens, lines under requirement/skill/benefit style
+    headings are kept first, then the remaining lines in page order until
+    the budget is used. Kept lines stay in their original order.
+    """
+    kept = []
+    seen = set()
+    priority = []
+    in_priority = False
+    for line in _lines(text or ''):
+        key = line.casefold()
+        if key in seen or len(line) < 3 or not re.search(r'\w', line) or BOILERPLATE.search(line):
+            continue
+        seen.add(key)
+        if _is_heading(line):
+            in_priority = bool(PRIORITY_HEADING.search(line))
+        kept.append(line)
+        priority.append(in_priority)
+
+    reduced = '\n'.join(kept)
+    if not max_tokens or estimate_tokens(reduced) <= max_tokens:
+        return reduced
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    chosen = {}
+    for wanted in (True, False):
+        for i, line in enumerate(kept):
+            if priority[i] != wanted:
+                continue
+            if len(line) + 1 > budget:
+                # Cut the line to the space left, unless too little would remain
+                if budget - 1 >= MIN_TRUNCATED_LENGTH:
+                    chosen[i] = line[:budget - 1].rsplit(' ', 1)[0]
+                    budget = 0
+                if wanted:
+                    continue
+                break
+            chosen[i] = line
+            budget -= len(line) + 1
+    return '\n'.join(chosen[i] for i in sorted(chosen))
@@ -1,3 +1,1006 @@
-from django.test import TestCase
+import os
+import re
+import asyncio
+import random
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import CrawlTask, ScrapedHTML, HTMLBlob, JobData, GeminiExtraction
+from .scrapers.crawl_queue import CrawlQueue
+from .management.commands.benchmark_extraction import percentile
+from .services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from .services.prompt_reducer import reduce_description, estimate_tokens
+from .services.gemini_api import GeminiClient
+from .services.gemini_cache import ExtractionCache
+from .services import gemini_async
+from .services.gemini_async import AsyncGeminiClient
+from .services.llm_backends import get_llm_backend
+from .services.llm_backends import FakeLLMBackend
+from .scrapers.field_patterns import FieldPatternExtractor
+from .scrapers.job_description import PATTERN_FIELDS, JobDescription
+from .scrapers.link_extractor import JobLinkExtractor
+from .scrapers.page_context import PageContext
+from .scrapers.config_cache import ConfigFileCache, get_domain_registry, get_job_titles
+from .scrapers.domain_registry import DomainConfig, DomainRegistry
+from .scrapers.rate_limiter import DomainRateLimiter, TokenBucket, get_rate_limiter
+from .scrapers.async_query_search import AsyncQuerySearch
+from .scrapers.concurrency import AdaptiveConcurrencyLimit, ConcurrencyController
+from .scrapers.enrichment_worker import EnrichmentWorker
+from .scrapers.fetch_client import FetchClient, get_fetch_client
+from .scrapers.frontier import UrlFrontier, canonicalize_url
+from .scrapers.pipeline_query_search import PipelineQuerySearch
+from .scrapers.query_search import QuerySearch
+from .scrapers.replay_server import ReplayServer, REPLAY_JOB_PATH
+from .scrapers.skill_vocabulary import SkillVocabulary, trie_pattern, SKILL, BENEFIT
+from .scrapers.structured_data import extract_job_posting, _number
+
+
+def job_task(url):
+    """A job-page task dict for CrawlQueue.enqueue"""
+    return {'kind': CrawlTask.KIND_JOB, 'url': url, 'domain_link': 'https://example.com'}
+
+
+class CrawlQueueTests(TestCase):
+
+    def setUp(self):
+        self.queue = CrawlQueue(lease_seconds=60, max_attempts=1)
+
+    def test_failed_job_is_queued_again(self):
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        [task] = self.queue.claim_batch()
+        self.queue.fail(task, 'timeout')
+        self.assertEqual(CrawlTask.objects.get().state, CrawlTask.STATE_FAILED)
+
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        task = CrawlTask.objects.get()
+        self.assertEqual(task.state, CrawlTask.STATE_PENDING)
+        self.assertEqual(task.attempts, 0)
+
+    def test_done_job_is_not_queued_again(self):
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        [task] = self.queue.claim_batch()
+        self.queue.complete(task)
+
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        self.assertEqual(CrawlTask.objects.get().state, CrawlTask.STATE_DONE)
+
+    def test_renew_extends_lease(self):
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        [task] = self.queue.claim_batch()
+        CrawlTask.objects.filter(id=task.id).update(lease_expires_at=timezone.now() + timedelta(seconds=1))
+
+        self.assertTrue(self.queue.renew(task))
+        self.assertGreater(CrawlTask.objects.get().lease_expires_at, timezone.now() + timedelta(seconds=30))
+
+    def test_renew_fails_once_task_is_reclaimed(self):
+        self.queue.enqueue([job_task('https://example.com/job/1')])
+        [task] = self.queue.claim_batch()
+        CrawlTask.objects.filter(id=task.id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        [reclaimed] = self.queue.claim_batch()
+
+        self.assertFalse(self.queue.renew(task))
+        self.assertTrue(self.queue.renew(reclaimed))
+
+
+class ScrapedHTMLStoreTests(TestCase):
+
+    def test_unchanged_page_is_not_stored_again(self):
+        ScrapedHTML.objects.store('https://example.com/job/1', '<p>one</p>', 'https://example.com')
+        record, changed = ScrapedHTML.objects.store('https://example.com/job/1', '<p>one</p>', 'https://example.com')
+        self.assertFalse(changed)
+        self.assertEqual(record.html, '<p>one</p>')
+        self.assertEqual(HTMLBlob.objects.count(), 1)
+
+    def test_changed_page_drops_its_old_blob(self):
+        ScrapedHTML.objects.store('https://example.com/job/1', '<p>one</p>', 'https://example.com')
+        record, changed = ScrapedHTML.objects.store('https://example.com/job/1', '<p>two</p>', 'https://example.com')
+        self.assertTrue(changed)
+        self.assertEqual(record.html, '<p>two</p>')
+        self.assertEqual(HTMLBlob.objects.count(), 1)
+
+    def test_shared_blob_is_kept(self):
+        ScrapedHTML.objects.store('https://example.com/job/1', '<p>one</p>', 'https://example.com')
+        ScrapedHTML.objects.store('https://example.com/job/2', '<p>one</p>', 'https://example.com')
+        ScrapedHTML.objects.store('https://example.com/job/1', '<p>two</p>', 'https://example.com')
+        self.assertEqual(HTMLBlob.objects.count(), 2)
+        self.assertEqual(ScrapedHTML.objects.get(url='https://example.com/job/2').html, '<p>one</p>')
+
+
+class ScrapedHTMLConcurrentStoreTests(TransactionTestCase):
+
+    def test_concurrent_writers_do_not_fail(self):
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def write(writer):
+            try:
+                barrier.wait()
+                for n in range(25):
+                    ScrapedHTML.objects.store(f'https://example.com/job/{n % 5}', f'<p>{writer}-{n}</p>',
+                                              'https://example.com')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write, args=(writer,)) for writer in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(ScrapedHTML.objects.count(), 5)
+        # Each page's current blob survives the concurrent replacements
+        for page in ScrapedHTML.objects.all():
+            self.assertEqual(page.html, HTMLBlob.objects.get(pk=page.blob_id).html)
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Answers every GET with its path, noting the path and the client's port"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1]))
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FetchClientTests(TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = FetchClient(max_retries=0, timeout=5)
+        self.addCleanup(self.client.close)
+
+    def test_one_session_per_host(self):
+        session = self.client.session_for('https://Example.com/jobs/1')
+        self.assertIs(self.client.session_for('https://example.com/jobs/2'), session)
+        self.assertIsNot(self.client.session_for('https://other.example/jobs/1'), session)
+
+    def test_requests_to_a_host_reuse_the_connection(self):
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        for n in range(3):
+            self.assertEqual(self.client.get(f'{base}/job/{n}', throttle=False).text, f'/job/{n}')
+        self.assertEqual(len({port for _, port in self.server.requests}), 1)
+
+    def test_url_rewriter_redirects_requests(self):
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        self.client.url_rewriter = lambda url: base + '/replay/' + url.split('://', 1)[1]
+        response = self.client.get('https://jobs.example/job/1?page=2', throttle=False)
+        self.assertEqual(response.text, '/replay/jobs.example/job/1?page=2')
+        # The session is pooled for the host actually contacted
+        self.assertEqual(list(self.client._sessions), [f'127.0.0.1:{self.server.server_port}'])
+
+
+class PercentileTests(TestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 11))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 70), 7)
+        self.assertEqual(percentile(values, 90), 9)
+        self.assertEqual(percentile(values, 95), 10)
+        self.assertEqual(percentile(values, 100), 10)
+        self.assertEqual(percentile(values, 0), 1)
+
+    def test_small_lists(self):
+        self.assertEqual(percentile([1, 2], 50), 1)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+def search_each_label(text, keywords):
+    """The per-label search FieldPatternExtractor replaced"""
+    for keyword in keywords:
+        match = re.search(rf'{keyword}\s*:?\s*([\w\s,-./]+)', text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+class UrlFrontierTests(TestCase):
+
+    def test_canonicalize_url(self):
+        self.assertEqual(
+            canonicalize_url(' HTTPS://Jobs.Example.com:443/job/1/?utm_source=x&b=2&a=1&fbclid=y#apply '),
+            'https://jobs.example.com/job/1?a=1&b=2'
+        )
+        self.assertEqual(canonicalize_url('http://example.com:8080'), 'http://example.com:8080/')
+        self.assertEqual(canonicalize_url('https://example.com/job?id='), 'https://example.com/job?id=')
+
+    def test_claim_new_skips_other_spellings_of_seen_urls(self):
+        frontier = UrlFrontier()
+        urls = ['https://example.com/job/1', 'https://EXAMPLE.com/job/1/?utm_medium=email',
+                'https://example.com/job/2', 'https://example.com/job/1#top']
+        self.assertEqual(frontier.claim_new(urls), ['https://example.com/job/1', 'https://example.com/job/2'])
+        self.assertEqual(frontier.claim_new(urls), [])
+
+        frontier.discard('https://example.com/job/2')
+        self.assertEqual(frontier.claim_new(urls), ['https://example.com/job/2'])
+
+    def test_warm_loads_known_jobs_and_pages(self):
+        JobData.objects.create(jobTitle='Job', link='https://example.com/job/1')
+        ScrapedHTML.objects.store('https://example.com/job/2', '<p>two</p>', 'https://example.com')
+        frontier = UrlFrontier()
+        frontier.warm()
+        self.assertEqual(frontier.claim_new(['https://example.com/job/1/', 'https://example.com/job/2',
+                                             'https://example.com/job/3']),
+                         ['https://example.com/job/3'])
+
+    @override_settings(SCRAPER_SKIP_SEEN_URLS=False)
+    def test_seen_urls_are_kept_when_skipping_is_off(self):
+        frontier = UrlFrontier()
+        frontier.claim_new(['https://example.com/job/1'])
+        self.assertEqual(frontier.claim_new(['https://example.com/job/1', 'https://example.com/job/1']),
+                         ['https://example.com/job/1'])
+
+
+class SearchPageIteratorTests(TestCase):
+
+    SEARCH_URL = 'https://example.com/search?q=Accountant'
+
+    def setUp(self):
+        patcher = mock.patch('scraper.scrapers.query_search.get_frontier', return_value=UrlFrontier())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.search = QuerySearch()
+        self.fetched = []
+
+    def serve(self, pages):
+        """Answer search page fetches from a list of each page's job links"""
+        def fetch(page_url, domain_link, job_link_path):
+            self.fetched.append(page_url)
+            page = int(page_url.rsplit('&page=', 1)[1]) if '&page=' in page_url else 1
+            links = pages[page - 1] if page <= len(pages) else []
+            if isinstance(links, Exception):
+                raise links
+            return [f'https://example.com/job/{n}' for n in links]
+        self.search._fetch_search_page = fetch
+
+    def walk(self, paginate=True):
+        return [(page_url, len(new_job_urls)) for page_url, _, new_job_urls in self.search._iter_search_pages(
+            'https://example.com', self.SEARCH_URL, 'a.job', paginate)]
+
+    def test_stops_at_the_first_page_without_new_links(self):
+        self.serve([[1, 2], [2, 3], [1, 3], [4]])
+        self.assertEqual(self.walk(), [(self.SEARCH_URL, 2), (f'{self.SEARCH_URL}&page=2', 1)])
+        # Page 3 was prefetched and found to hold only seen links; page 4 is never requested
+        self.assertEqual(self.fetched, [self.SEARCH_URL, f'{self.SEARCH_URL}&page=2', f'{self.SEARCH_URL}&page=3'])
+
+    def test_stops_at_an_empty_or_failed_page(self):
+        self.serve([[1], []])
+        self.assertEqual(len(self.walk()), 1)
+        self.fetched = []
+        self.serve([[5], Exception('timed out'), [6]])
+        self.assertEqual(len(self.walk()), 1)
+        self.assertEqual(len(self.fetched), 2)
+
+    def test_unpaginated_domain_fetches_one_page(self):
+        self.serve([[1], [2]])
+        self.assertEqual(self.walk(paginate=False), [(self.SEARCH_URL, 1)])
+        self.assertEqual(self.fetched, [self.SEARCH_URL])
+
+
+JOB_PAGE = """<html><head><title>Accountant - Everest Bank</title>
+<script>var tracking = 1;</script><style>p { color: red }</style>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "JobPosting", "title": "Accountant",
+"hiringOrganization": {"name": "Everest Bank"}, "jobLocation": {"address": {"addressLocality": "Kathmandu"}}}</script>
+</head><body><header>Site header</header><nav>Home Jobs</nav><div class="main-menu">Menu links</div>
+<h1>Accountant</h1><div class="job-description"><p>We need an accountant skilled in Excel and Tally.
+<p>Benefits: health insurance</div><footer>Footer text</footer></body></html>"""
+
+
+class JobPageParsingTests(TestCase):
+
+    def setUp(self):
+        self.job_description = JobDescription(use_gemini=False)
+
+    def test_page_chrome_is_stripped_from_the_tree(self):
+        soup = self.job_description.parse_html(JOB_PAGE)
+        text = soup.get_text()
+        for chrome in ('Site header', 'Home Jobs', 'Menu links', 'Footer text', 'tracking', 'color'):
+            self.assertNotIn(chrome, text)
+        self.assertIn('skilled in Excel', text)
+        # Structured job data survives the script sweep
+        self.assertEqual([tag.get('type') for tag in soup.find_all('script')], ['application/ld+json'])
+
+    def test_unclosed_paragraphs_become_siblings(self):
+        soup = self.job_description.parse_html(JOB_PAGE)
+        paragraphs = soup.select('div.job-description p')
+        self.assertEqual(len(paragraphs), 2)
+        self.assertNotIn('Benefits', paragraphs[0].get_text())
+
+    def test_fields_are_extracted_from_the_cleaned_tree(self):
+        soup = self.job_description.parse_html(JOB_PAGE)
+        job_data = self.job_description._extract_job_data(soup, 'div.job-description', 'https://example.com/job/1',
+                                                          None, enhance=False)
+        self.assertEqual((job_data['jobTitle'], job_data['company'], job_data['jobLocation']),
+                         ('Accountant', 'Everest Bank', 'Kathmandu'))
+        self.assertEqual(job_data['skills'], ['Excel', 'Tally'])
+        self.assertEqual(job_data['benefits'], ['Health Insurance'])
+
+
+class PageContextTests(TestCase):
+
+    def count_text_walks(self, soup):
+        """Count get_text() calls on the page root"""
+        calls = []
+        get_text = soup.get_text
+        soup.get_text = lambda *args, **kwargs: calls.append(1) or get_text(*args, **kwargs)
+        return calls
+
+    def test_page_text_is_derived_once(self):
+        soup = BeautifulSoup('<h1>Senior Accountant</h1><p>Excel</p>', 'lxml')
+        calls = self.count_text_walks(soup)
+        page = PageContext(soup)
+        self.assertEqual(page.text, 'Senior AccountantExcel')
+        self.assertEqual(page.lower_text, 'senior accountantexcel')
+        self.assertEqual(page.content_text, page.text)
+        self.assertEqual(len(calls), 1)
+
+    def test_content_text_prefers_the_description(self):
+        page = PageContext(BeautifulSoup('<p>Whole page</p>', 'lxml'))
+        page.description_text = 'Just the description'
+        self.assertEqual(page.content_text, 'Just the description')
+
+    def test_extraction_walks_the_page_text_once(self):
+        job_description = JobDescription(use_gemini=False)
+        # Without a JobPosting every heuristic runs over the page text
+        soup = job_description.parse_html(JOB_PAGE.replace('"JobPosting"', '"Organization"'))
+        calls = self.count_text_walks(soup)
+        job_data = job_description._extract_job_data(soup, 'div.job-description', 'https://example.com/job/1',
+                                                      None, enhance=False)
+        self.assertEqual(job_data['jobTitle'], 'Accountant')
+        self.assertEqual(len(calls), 1)
+
+
+class FieldPatternExtractorTests(TestCase):
+
+    def test_matches_per_label_search(self):
+        rng = random.Random(14)
+        labels = [keyword for keywords in PATTERN_FIELDS.field_keywords.values() for keyword in keywords]
+        pieces = labels + ['job', 'type', 'pay', 'exp', 'ment', ':', ': ', ' ', '\n', '.', ',', '-', '/', ';',
+                           '|', '(', 'kathmandu', 'npr 50,000', '3 years', 'full time', 'b.sc.', '2024-01-31']
+        for _ in range(3000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            expected = {field: search_each_label(text, keywords)
+                        for field, keywords in PATTERN_FIELDS.field_keywords.items()}
+            self.assertEqual(PATTERN_FIELDS.extract(text), expected, text)
+
+    def test_overlapping_and_prefix_labels(self):
+        extractor = FieldPatternExtractor({'a': ['job type'], 'b': ['type of work'], 'c': ['job']})
+        values = extractor.extract('job type of work: remote')
+        self.assertEqual(values, {'a': 'of work', 'b': 'remote', 'c': 'type of work'})
+
+
+def full_parse_links(html, job_link_path, base_url):
+    """The whole-page extraction JobLinkExtractor replaced"""
+    soup = BeautifulSoup(html, 'lxml')
+    job_links = soup.select(job_link_path)
+    if not job_links:
+        job_links = [a for a in soup.find_all('a') if a.get('href') and
+                     ('job' in a.get('href').lower() or 'career' in a.get('href').lower())]
+    return [urljoin(base_url, link.get('href')) for link in job_links if link.get('href')]
+
+
+def random_results_page(rng, depth=0):
+    """Random nested markup built from the tags and classes domain.csv selectors use"""
+    tags = ['div', 'div', 'a', 'h1', 'h2', 'h3', 'h4', 'li', 'ul', 'p', 'span']
+    classes = ['card-body', 'h3', 'job-card', 'job-list-item', 'job-item', 'jobs-listing', 'job-title',
+               'job-link', 'job-list', 'mb-1', 'item']
+    hrefs = ['/job/1', '/jobs/2?page=3', '/careers/4', '/about', 'https://example.org/Job-5', '#']
+    html = ''
+    for _ in range(rng.randint(1, 4)):
+        tag = rng.choice(tags)
+        attrs = ''
+        if rng.random() < 0.8:
+            attrs += f' class="{" ".join(rng.sample(classes, rng.randint(1, 3)))}"'
+        if rng.random() < 0.15:
+            attrs += " data-automation='job-card'"
+        if tag == 'a' and rng.random() < 0.9:
+            attrs += f' href="{rng.choice(hrefs)}"'
+        inner = random_results_page(rng, depth + 1) if depth < 5 and rng.random() < 0.8 else 'text'
+        html += f'<{tag}{attrs}>{inner}</{tag}>'
+    return html
+
+
+class JobLinkExtractorTests(TestCase):
+
+    def test_matches_full_parse(self):
+        rng = random.Random(18)
+        selectors = sorted({domain.job_link_path for domain in get_domain_registry()})
+        selectors += ['div.job-card > h3 a', 'ul li a, div.job-item a', 'div + div a', 'a.job-link:first-child']
+        pages = [f'<html><body>{random_results_page(rng)}</body></html>' for _ in range(200)]
+        for selector in selectors:
+            extractor = JobLinkExtractor(selector, 'lxml')
+            for html in pages:
+                self.assertEqual(extractor.extract(html, 'https://example.com'),
+                                 full_parse_links(html, selector, 'https://example.com'), (selector, html))
+
+
+DOMAIN_CSV_HEADER = ('domain_link,domian_search_link,domain_job_link_path_from_search,domain_keywords,'
+                     'domain_job_description_tags,domain_pagination,domain_rate_limit,domain_burst\n')
+
+
+class DomainRegistryTests(TestCase):
+
+    def write_csv(self, path, text, mtime):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.utime(path, ns=(mtime, mtime))
+
+    def test_rows_are_compiled_once(self):
+        with tempfile.TemporaryDirectory() as csv_dir:
+            path = os.path.join(csv_dir, 'domain.csv')
+            self.write_csv(path, DOMAIN_CSV_HEADER
+                           + 'https://Jobs.Example.com,https://jobs.example.com/s?q={searchTerm},a.job,,'
+                             '"div.summary, section#details ",yes,,\n', 1_000_000_000)
+            registry = DomainRegistry.from_csv(path)
+
+        [config] = registry
+        self.assertIs(registry.get('https://Jobs.Example.com'), config)
+        self.assertIs(registry.for_url('https://JOBS.example.com/job/1'), config)
+        self.assertIsNone(registry.for_url('https://other.example/job/1'))
+        self.assertTrue(config.paginate)
+        self.assertEqual((config.rate_limit, config.burst), (None, None))
+
+        soup = BeautifulSoup('<section id="details">B</section><div class="summary">A</div>', 'lxml')
+        # Each listed selector is compiled on its own and matched in the listed order
+        matches = [[tag.get_text() for tag in selector.select(soup)] for selector in config.description_selectors]
+        self.assertEqual(matches, [['A'], ['B']])
+        # The generic selectors are compiled once and shared by every domain
+        self.assertIs(config.title_selectors, DomainConfig.generic().title_selectors)
+
+    def test_config_files_are_parsed_again_only_when_changed(self):
+        cache = ConfigFileCache()
+        parse = mock.Mock(side_effect=lambda path: object())
+        with tempfile.TemporaryDirectory() as csv_dir:
+            path = os.path.join(csv_dir, 'domain.csv')
+            self.write_csv(path, DOMAIN_CSV_HEADER, 1_000_000_000)
+            first = cache.load(path, parse)
+            self.assertIs(cache.load(path, parse), first)
+            self.write_csv(path, DOMAIN_CSV_HEADER, 2_000_000_000)
+            self.assertIsNot(cache.load(path, parse), first)
+        self.assertEqual(parse.call_count, 2)
+
+    def test_job_titles_follow_file_edits(self):
+        with tempfile.TemporaryDirectory() as csv_dir, override_settings(CSV_FILE_DIR=csv_dir):
+            path = os.path.join(csv_dir, 'jobtitlestosearch.csv')
+            self.write_csv(path, 'job_title\nAccountant\n\n Nurse \n', 1_000_000_000)
+            self.assertEqual(get_job_titles(), ['Accountant', 'Nurse'])
+            self.write_csv(path, 'job_title\nData Analyst\n', 2_000_000_000)
+            self.assertEqual(get_job_titles(), ['Data Analyst'])
+
+
+class DomainRegistryReloadTests(TestCase):
+
+    def write_domains(self, path, rows, mtime):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(DOMAIN_CSV_HEADER)
+            for link, rate, burst in rows:
+                f.write(f'{link},{link}/search?q={{searchTerm}},div.job a,.q,div.job-description,yes,{rate},{burst}\n')
+        os.utime(path, ns=(mtime, mtime))
+
+    def test_reloaded_limits_reach_rate_limiter(self):
+        with tempfile.TemporaryDirectory() as csv_dir, override_settings(CSV_FILE_DIR=csv_dir):
+            path = os.path.join(csv_dir, 'domain.csv')
+            self.write_domains(path, [('https://one.example', 0.5, 2)], 1_000_000_000)
+            get_domain_registry()
+            bucket = get_rate_limiter()._bucket('https://one.example/job/1')
+            self.assertEqual((bucket.rate, bucket.burst), (0.5, 2))
+
+            self.write_domains(path, [('https://one.example', 3, 6), ('https://two.example', 1, 1)], 2_000_000_000)
+            get_domain_registry()
+            bucket = get_rate_limiter()._bucket('https://one.example/job/1')
+            self.assertEqual((bucket.rate, bucket.burst), (3, 6))
+            bucket = get_rate_limiter()._bucket('https://two.example/job/1')
+            self.assertEqual((bucket.rate, bucket.burst), (1, 1))
+
+    def test_unchanged_domain_keeps_its_bucket(self):
+        limiter = get_rate_limiter()
+        limiter.configure('https://three.example', 2, 4)
+        bucket = limiter._bucket('https://three.example/job/1')
+        limiter.configure('https://three.example', 2, 4)
+        self.assertIs(limiter._bucket('https://three.example/job/1'), bucket)
+
+
+JOB_POSTING_PAGE = """<html><head><script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [{"@type": "WebPage"}, {
+  "@type": "JobPosting", "title": "Accountant",
+  "hiringOrganization": {"@type": "Organization", "name": "Everest Bank"},
+  "jobLocation": {"@type": "Place", "address": {"addressLocality": "Kathmandu", "addressCountry": "Nepal"}},
+  "employmentType": "FULL_TIME",
+  "baseSalary": {"@type": "MonetaryAmount", "currency": "NPR",
+                 "value": {"minValue": 40000, "maxValue": %s, "unitText": "MONTH"}}
+}]}
+</script></head><body></body></html>"""
+
+
+class StructuredDataTests(TestCase):
+
+    def test_json_ld_job_posting(self):
+        job_data = extract_job_posting(BeautifulSoup(JOB_POSTING_PAGE % '60000', 'lxml'))
+        self.assertEqual(job_data['jobTitle'], 'Accountant')
+        self.assertEqual(job_data['company'], 'Everest Bank')
+        self.assertEqual(job_data['jobLocation'], 'Kathmandu, Nepal')
+        self.assertEqual(job_data['jobType'], 'Full-Time')
+        self.assertEqual(job_data['salary'], 'NPR 40,000 - 60,000 per month')
+
+    def test_number_formatting(self):
+        self.assertEqual(_number(40000), '40,000')
+        self.assertEqual(_number('1234.5'), '1,234.50')
+        self.assertEqual(_number('negotiable'), 'negotiable')
+
+    def test_non_finite_numbers_are_kept_as_text(self):
+        self.assertEqual(_number('NaN'), 'NaN')
+        self.assertEqual(_number('Infinity'), 'Infinity')
+        self.assertEqual(_number('1e400'), '1e400')
+        self.assertEqual(_number(float('inf')), 'inf')
+
+    def test_non_finite_salary_does_not_lose_the_posting(self):
+        for value in ('NaN', 'Infinity', '1e400'):
+            job_data = extract_job_posting(BeautifulSoup(JOB_POSTING_PAGE % value, 'lxml'))
+            self.assertEqual(job_data['jobTitle'], 'Accountant')
+            self.assertIn('40,000', job_data['salary'])
+
+
+class EnrichmentWorkerTests(TestCase):
+
+    def setUp(self):
+        for i in range(2):
+            JobData.objects.create(jobTitle=f'Job {i}', link=f'https://example.com/job/{i}',
+                                   enrichment_status=JobData.ENRICHMENT_PENDING, description='Python developer')
+        self.worker = EnrichmentWorker(batch_size=1, lease_seconds=60)
+        self.other = EnrichmentWorker(batch_size=1, lease_seconds=60)
+
+    def test_live_claims_are_not_reclaimed(self):
+        [job] = self.worker.claim_batch()
+        self.assertEqual(self.other.reclaim_running(), 0)
+        [other_job] = self.other.claim_batch()
+        self.assertNotEqual(job.pk, other_job.pk)
+
+    def test_expired_claims_are_reclaimed(self):
+        [job] = self.worker.claim_batch()
+        JobData.objects.filter(pk=job.pk).update(enrichment_claimed_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(self.other.reclaim_running(), 1)
+        self.assertEqual(JobData.objects.get(pk=job.pk).enrichment_status, JobData.ENRICHMENT_PENDING)
+
+    def test_lost_claim_is_not_written(self):
+        [job] = self.worker.claim_batch()
+        JobData.objects.filter(pk=job.pk).update(enrichment_claimed_at=timezone.now() - timedelta(seconds=61))
+        [reclaimed] = self.other.claim_batch()
+        self.assertEqual(reclaimed.pk, job.pk)
+
+        self.worker._record_failure(job)
+        self.worker._apply(job, {'skills': ['Python']})
+        job = JobData.objects.get(pk=job.pk)
+        self.assertEqual(job.enrichment_status, JobData.ENRICHMENT_RUNNING)
+        self.assertEqual(job.enrichment_attempts, 0)
+        self.assertIsNone(job.skill)
+
+    def test_claim_finished_elsewhere_is_not_overwritten(self):
+        [job] = self.worker.claim_batch()
+        JobData.objects.filter(pk=job.pk).update(enrichment_claimed_at=timezone.now() - timedelta(seconds=61))
+        [reclaimed] = self.other.claim_batch()
+        self.other._apply(reclaimed, {'skills': ['Django'], 'jobIndustry': 'Software'})
+
+        self.worker._apply(job, {'skills': ['Python'], 'jobIndustry': 'Finance'})
+        job = JobData.objects.get(pk=job.pk)
+        self.assertEqual(job.enrichment_status, JobData.ENRICHMENT_DONE)
+        self.assertEqual(job.enrichment_attempts, 1)
+        self.assertEqual(job.jobIndustry, 'Software')
+        self.assertEqual(job.skill.skill_1, 'Django')
+
+    def test_start_reuses_a_draining_thread(self):
+        release = threading.Event()
+        self.worker.run = lambda follow: release.wait(5)
+        self.worker.start()
+        thread = self.worker._thread
+        self.worker.stop(wait=False)
+        self.worker.start()
+        self.assertIs(self.worker._thread, thread)
+        release.set()
+        thread.join()
+
+
+class TokenBucketTests(TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('scraper.scrapers.rate_limiter.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_is_free_then_requests_queue_at_the_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        # Each caller past the burst waits its own turn
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.5, 1.0, 1.5])
+
+    def test_tokens_refill_up_to_the_burst(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        for _ in range(3):
+            bucket.reserve()
+        self.now += 1
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.5])
+        # A long idle spell never banks more than the burst
+        self.now += 60
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.0, 0.5])
+
+    def test_domains_have_their_own_buckets(self):
+        limiter = DomainRateLimiter(default_rate=1, default_burst=1)
+        limiter.configure('https://fast.example', rate=10, burst=1)
+        with override_settings(SCRAPER_RATE_LIMIT_ENABLED=True):
+            self.assertEqual(limiter.reserve('https://fast.example/jobs'), 0.0)
+            self.assertEqual(limiter.reserve('https://FAST.example/job/1'), 0.1)
+            self.assertEqual(limiter.reserve('https://slow.example/jobs'), 0.0)
+            self.assertEqual(limiter.reserve('https://slow.example/job/1'), 1.0)
+
+    def test_blank_csv_values_fall_back_to_the_defaults(self):
+        limiter = DomainRateLimiter(default_rate=1, default_burst=2)
+        limiter.configure('https://example.com', rate=float('nan'), burst='')
+        bucket = limiter._bucket('https://example.com/jobs')
+        self.assertEqual((bucket.rate, bucket.burst), (1.0, 2.0))
+
+
+class AdaptiveConcurrencyLimitTests(TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('scraper.scrapers.concurrency.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limit = AdaptiveConcurrencyLimit(4, min_limit=1, max_limit=8)
+
+    def test_stable_latency_adds_about_one_slot_per_window(self):
+        for _ in range(4):
+            self.limit.record_response(0.1, 200)
+        self.assertAlmostEqual(self.limit.limit, 5, delta=0.2)
+        for _ in range(200):
+            self.limit.record_response(0.1, 200)
+        self.assertEqual(self.limit.limit, 8)
+
+    def test_rising_latency_stops_the_increase(self):
+        for _ in range(50):
+            self.limit.record_response(0.1, 200)
+        grown = self.limit.limit
+        for _ in range(5):
+            self.limit.record_response(1.0, 200)
+        self.assertEqual(self.limit.limit, grown)
+
+    def test_overload_halves_once_per_round_trip(self):
+        self.limit.record_response(0.5, 429)
+        self.assertEqual(self.limit.limit, 2.0)
+        self.limit.record_response(0.5, 503)
+        self.assertEqual(self.limit.limit, 2.0)
+
+        # With no latency measured yet a round trip counts as one second
+        self.now += 1
+        self.limit.record_timeout()
+        self.assertEqual(self.limit.limit, 1.0)
+        self.now += 1
+        self.limit.record_response(0.5, 429)
+        self.assertEqual(self.limit.limit, 1.0)
+        self.assertEqual(self.limit.snapshot()['throttled'], 3)
+
+    def test_configure_keeps_requests_in_flight(self):
+        controller = ConcurrencyController()
+        controller.configure('https://example.com', 2)
+        limit = controller.limit_for('https://example.com/job/1')
+        self.assertTrue(limit.try_acquire())
+        self.assertTrue(limit.try_acquire())
+
+        controller.configure('https://example.com', 2)
+        self.assertIs(controller.limit_for('https://example.com/job/1'), limit)
+        self.assertFalse(limit.try_acquire())
+
+    def test_acquire_async_wakes_on_release(self):
+        limit = AdaptiveConcurrencyLimit(1)
+        limit.acquire()
+
+        async def acquire():
+            threading.Timer(0.01, limit.release).start()
+            await asyncio.wait_for(limit.acquire_async(), 1)
+
+        asyncio.run(acquire())
+        self.assertEqual(limit.in_flight, 1)
+        self.assertEqual(limit._async_waiters, [])
+
+
+def fail():
+    raise RuntimeError('503 Service Unavailable')
+
+
+class CircuitBreakerTests(TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('scraper.services.circuit_breaker.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('Test', failure_threshold=3, reset_timeout=60, half_open_calls=1)
+
+    def trip(self):
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(fail)
+
+    def test_opens_after_consecutive_failures(self):
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(fail)
+        self.breaker.call(lambda: 'ok')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.trip()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: 'ok')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.raise_if_open()
+        self.assertEqual(self.breaker.snapshot()['rejected'], 2)
+
+    def test_half_open_probe_success_closes(self):
+        self.trip()
+        self.now += 60
+        self.assertFalse(self.breaker.rejects())
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_failure_reopens(self):
+        self.trip()
+        self.now += 60
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(fail)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.snapshot()['retry_in_seconds'], 60)
+
+    def test_half_open_allows_limited_probes(self):
+        self.trip()
+        self.now += 60
+        self.breaker.before_call()
+        self.assertTrue(self.breaker.rejects())
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+
+class ExtractionCacheTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        patcher = mock.patch('scraper.services.gemini_cache.timezone.now', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ExtractionCache(max_age=timedelta(days=1))
+        self.key = self.cache.key('Python developer', 1)
+
+    def test_lru_hit_within_max_age(self):
+        self.cache.put(self.key, 1, {'skills': ['Python']})
+        self.now += timedelta(hours=23)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.get(self.key), {'skills': ['Python']})
+
+    def test_expired_lru_entry_is_a_miss(self):
+        self.cache.put(self.key, 1, {'skills': ['Python']})
+        self.now += timedelta(days=1, seconds=1)
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertFalse(GeminiExtraction.objects.filter(key=self.key).exists())
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_database_hit_keeps_the_row_age(self):
+        self.cache.put(self.key, 1, {'skills': ['Python']})
+        self.cache.clear()
+        self.now += timedelta(hours=12)
+        self.assertEqual(self.cache.get(self.key), {'skills': ['Python']})
+        # Loading the row into the LRU does not restart its max_age
+        self.now += timedelta(hours=13)
+        self.assertIsNone(self.cache.get(self.key))
+
+
+class PromptReducerTests(TestCase):
+
+    def test_drops_duplicates_and_page_furniture(self):
+        text = ('Apply now\nWe use cookies to improve your experience.\nAccountant needed for audits\n'
+                'Accountant needed for audits\nPrivacy Policy | Terms of Use\n© 2024 Everest Bank. All rights reserved.')
+        self.assertEqual(reduce_description(text), 'Accountant needed for audits')
+
+    def test_keeps_requirements_that_mention_furniture_words(self):
+        text = ('Requirements:\nKnowledge of copyright law and cookie consent tooling\n'
+                'Experience with privacy policy drafting')
+        self.assertEqual(reduce_description(text), text)
+
+    def test_budget_keeps_priority_sections_first(self):
+        about = '\n'.join(f'About the company paragraph number {i} with some filler text.' for i in range(20))
+        text = f'About us:\n{about}\nRequirements:\nThree years of Django experience.\nBenefits:\nHealth insurance.'
+        reduced = reduce_description(text, max_tokens=60)
+        self.assertLessEqual(estimate_tokens(reduced), 60)
+        for line in ('Requirements:', 'Three years of Django experience.', 'Benefits:', 'Health insurance.'):
+            self.assertIn(line, reduced.splitlines())
+        # Kept lines stay in page order
+        self.assertLess(reduced.index('Requirements:'), reduced.index('Benefits:'))
+
+
+class SkillVocabularyTests(TestCase):
+
+    def test_trie_matches_longest_first_alternation(self):
+        rng = random.Random(24)
+        for _ in range(200):
+            terms = {''.join(rng.choice('abc +') for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 8))}
+            trie = re.compile(trie_pattern(terms))
+            alternation = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+            for _ in range(20):
+                text = ''.join(rng.choice('abc +.') for _ in range(rng.randint(0, 20)))
+                for start in range(len(text) + 1):
+                    found, expected = trie.match(text, start), alternation.match(text, start)
+                    self.assertEqual(found and found.group(), expected and expected.group(), (terms, text, start))
+
+    def test_extract_reports_display_terms_in_order(self):
+        vocabulary = SkillVocabulary([
+            (SKILL, 'react', 'React'), (SKILL, 'reactjs', 'React'), (SKILL, 'c++', 'C++'),
+            (SKILL, 'java', 'Java'), (BENEFIT, 'health insurance', 'Health Insurance'),
+        ])
+        skills, benefits = vocabulary.extract('C++ and ReactJS, not JavaScript; React again. Health insurance.')
+        self.assertEqual(skills, ['C++', 'React'])
+        self.assertEqual(benefits, ['Health Insurance'])
+
+    def test_extract_limit_and_empty(self):
+        vocabulary = SkillVocabulary([(SKILL, term, term) for term in 'abcdef'])
+        self.assertEqual(vocabulary.extract('a b c d e f', limit=3), (['a', 'b', 'c'], []))
+        self.assertEqual(SkillVocabulary([]).extract('anything'), ([], []))
+
+
+class FakeLLMBackendTests(TestCase):
+
+    def test_single_and_batch_answers_agree(self):
+        client = GeminiClient(backend=FakeLLMBackend(latency=0))
+        descriptions = ['Python and SQL developer with health insurance', 'Staff nurse for a city hospital']
+        batch = client.extract_batch(descriptions)
+        self.assertEqual(batch, [client.extract_job_data(description) for description in descriptions])
+        self.assertIn('Python', batch[0]['skills'])
+        self.assertIn('Health Insurance', batch[0]['benefits'])
+
+    def test_answers_are_not_cached(self):
+        backend = FakeLLMBackend(latency=0)
+        client = GeminiClient(backend=backend)
+        client.extract_job_data('Python developer')
+        client.extract_job_data('Python developer')
+        self.assertEqual(backend.stats['calls'], 2)
+        self.assertFalse(GeminiExtraction.objects.exists())
+
+
+class FirstAnswerOnlyBackend(FakeLLMBackend):
+    """Stand-in whose batch answers leave out every description after the first"""
+
+    def answer(self, prompt):
+        return super().answer(prompt).split('\n### RESULT 2')[0]
+
+
+class AsyncGeminiClientTests(TestCase):
+
+    def descriptions(self, count):
+        return [f'Job {n}: Python developer with {n} years of SQL' for n in range(count)]
+
+    def test_queued_descriptions_share_a_batch_prompt(self):
+        backend = FakeLLMBackend(latency=0)
+        client = AsyncGeminiClient(GeminiClient(backend=backend), concurrency=1, requests_per_minute=6000,
+                                   batch_size=3, batch_wait=1)
+        self.addCleanup(client.close)
+        futures = [client.submit(description) for description in self.descriptions(3)]
+        results = [future.result(5) for future in futures]
+        self.assertEqual(backend.stats['calls'], 1)
+        single = GeminiClient(backend=FakeLLMBackend(latency=0))
+        self.assertEqual(results, [single.extract_job_data(description) for description in self.descriptions(3)])
+
+    def test_prompts_start_no_faster_than_the_quota(self):
+        backend = FakeLLMBackend(latency=0)
+        # One request every 0.1s, with a burst of one
+        client = AsyncGeminiClient(GeminiClient(backend=backend), concurrency=1, requests_per_minute=600,
+                                   batch_size=1, batch_wait=0)
+        self.addCleanup(client.close)
+        started = time.monotonic()
+        for future in [client.submit(description) for description in self.descriptions(4)]:
+            future.result(5)
+        self.assertEqual(backend.stats['calls'], 4)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_batch_fallback_calls_reserve_quota(self):
+        backend = FirstAnswerOnlyBackend(latency=0)
+        client = AsyncGeminiClient(GeminiClient(backend=backend), concurrency=1, requests_per_minute=6000,
+                                   batch_size=3, batch_wait=1)
+        self.addCleanup(client.close)
+        with mock.patch.object(client.requests, 'reserve', wraps=client.requests.reserve) as reserve:
+            futures = [client.submit(description) for description in self.descriptions(3)]
+            for future in futures:
+                self.assertIn('Python', future.result(5)['skills'])
+        # One batch prompt, then the two descriptions it left out on their own
+        self.assertEqual(backend.stats['calls'], 3)
+        self.assertEqual(reserve.call_count, 3)
+
+
+@override_settings(SCRAPER_RATE_LIMIT_ENABLED=False, SCRAPER_USE_GEMINI=False, SCRAPER_VOCABULARY_MIN_SKILLS=100)
+class AsyncQuerySearchTests(TransactionTestCase):
+
+    def setUp(self):
+        server = ReplayServer(list(get_domain_registry()), pages=2, jobs_per_page=4).start()
+        self.addCleanup(server.stop)
+        client = get_fetch_client()
+        client.url_rewriter = server.rewrite
+        self.addCleanup(setattr, client, 'url_rewriter', None)
+        # Hold every domain at the cap the test sets instead of letting AIMD move it
+        patcher = mock.patch.object(AdaptiveConcurrencyLimit, 'record_response')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_job_pages_are_fetched_in_parallel_within_the_domain_cap(self):
+        engine = AsyncQuerySearch(domain_concurrency=2)
+        fetch_job_page = engine.job_description.fetch_job_page
+        in_flight, peak = {}, {}
+        lock = threading.Lock()
+
+        def tracked_fetch(job_url, **kwargs):
+            host = job_url.split('/')[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            try:
+                time.sleep(0.05)
+                return fetch_job_page(job_url, **kwargs)
+            finally:
+                with lock:
+                    in_flight[host] -= 1
+
+        engine.job_description.fetch_job_page = tracked_fetch
+        engine.search_many(['Accountant'])
+
+        jobs = JobData.objects.filter(link__contains=REPLAY_JOB_PATH)
+        self.assertEqual(jobs.count(), 8 * len(get_domain_registry()))
+        self.assertEqual(set(peak.values()), {2})
+
+
+@override_settings(SCRAPER_RATE_LIMIT_ENABLED=False, SCRAPER_USE_GEMINI=True, LLM_BACKEND='fake',
+                   FAKE_LLM_LATENCY_MS=100, GEMINI_ENRICHMENT_MODE='sync', GEMINI_REQUESTS_PER_MINUTE=6000,
+                   GEMINI_ENRICHMENT_POLL_SECONDS=0.1, SCRAPER_VOCABULARY_MIN_SKILLS=100)
+class PipelineQuerySearchTests(TransactionTestCase):
+
+    def setUp(self):
+        server = ReplayServer(list(get_domain_registry()), pages=1, jobs_per_page=2).start()
+        self.addCleanup(server.stop)
+        client = get_fetch_client()
+        client.url_rewriter = server.rewrite
+        self.addCleanup(setattr, client, 'url_rewriter', None)
+        # A fresh async Gemini client on the stand-in backend
+        patcher = mock.patch.object(gemini_async, '_client', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: gemini_async._client and gemini_async._client.close())
+
+    def test_sync_mode_enriches_off_the_writer_thread(self):
+        PipelineQuerySearch(fetch_workers=4, parse_workers=1).search_many(['Accountant'])
+
+        jobs = JobData.objects.filter(link__contains=REPLAY_JOB_PATH)
+        self.assertEqual(jobs.count(), 2 * len(get_domain_registry()))
+        # Every job is enriched by the time the crawl returns
+        self.assertFalse(jobs.exclude(enrichment_status=JobData.ENRICHMENT_DONE).exists())
+        self.assertFalse(jobs.filter(skill__isnull=True).exists())
+        # ...through batch prompts rather than one inline call per job
+        self.assertLess(get_llm_backend().stats['calls'], jobs.count() / 2)
 
-# Create your tests here.
\ No newline at end of file
@@ -1,16 +1,22 @@
-import time
 import threading
 from django.shortcuts import render, redirect
 from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
 from django.conf import settings
-import pandas as pd
-import csv
-import os
+from django.db.models import Count
 from datetime import datetime
 
 from .models import JobData, Skill, Benefit
 from .scrapers.query_search import QuerySearch
+from .scrapers.async_query_search import AsyncQuerySearch
+from .scrapers.queue_query_search import QueueQuerySearch
+from .scrapers.pipeline_query_search import PipelineQuerySearch
+from .scrapers.crawl_queue import CrawlQueue
+from .scrapers.concurrency import get_concurrency_controller
+from .scrapers.config_cache import get_job_titles
+from .scrapers.enrichment_worker import EnrichmentWorker
+from .services.circuit_breaker import get_gemini_breaker
+from .services.llm_usage import get_llm_usage
 from .forms import CustomScraperForm
 
 # Global variable to track scraper status
@@ -19,6 +25,9 @@ scraper_progress = 0
 scraper_total = 0
 scraper_current_job = ""
 
+# Deferred-mode enrichment worker, kept across crawls so only one runs at a time
+enrichment_worker = None
+
 def run_scraper(request):
     """Run the predefined job title scraper"""
     global scraper_running, scraper_progress, scraper_total, scraper_current_job
@@ -28,10 +37,8 @@ def run_scraper(request):
         return redirect('web:index')
     
     # Read predefined job titles from CSV
-    job_titles_file = os.path.join(settings.CSV_FILE_DIR, 'jobtitlestosearch.csv')
     try:
-        job_titles_df = pd.read_csv(job_titles_file)
-        job_titles = job_titles_df['job_title'].tolist()
+        job_titles = get_job_titles()
     except Exception as e:
         messages.error(request, f"Error reading job titles file: {str(e)}")
         return redirect('web:index')
@@ -82,7 +89,38 @@ def run_scraper_task(job_titles):
     """Background task to run the scraper"""
     global scraper_running, scraper_progress, scraper_total, scraper_current_job
     
+    global enrichment_worker
+    
+    worker_started = False
     try:
+        if getattr(settings, 'GEMINI_ENRICHMENT_MODE', 'sync') == 'deferred' and getattr(settings, 'SCRAPER_USE_GEMINI', True):
+            # Fills in Gemini fields for jobs as the crawl saves them; a worker
+            # still draining the previous crawl's jobs carries on instead
+            if enrichment_worker is None:
+                enrichment_worker = EnrichmentWorker()
+            enrichment_worker.start()
+            worker_started = True
+        
+        engine = getattr(settings, 'SCRAPER_ENGINE', 'sequential')
+        
+        if engine == 'queue':
+            # Resumes an interrupted crawl before searching anything again
+            QueueQuerySearch().search_many(job_titles)
+            scraper_progress = scraper_total
+            return
+        
+        if engine in ('async', 'pipeline'):
+            scraper = AsyncQuerySearch() if engine == 'async' else PipelineQuerySearch()
+            
+            def on_query_done(job_title):
+                global scraper_progress, scraper_current_job
+                scraper_progress += 1
+                scraper_current_job = job_title
+            
+            # Job titles are crawled concurrently across all domains
+            scraper.search_many(job_titles, on_query_done=on_query_done)
+            return
+        
         scraper = QuerySearch()
         
         for i, job_title in enumerate(job_titles):
@@ -91,14 +129,14 @@ def run_scraper_task(job_titles):
             
             # Run the scraper for this job title
             scraper.search(job_title)
-            
-            # Sleep to prevent rate limiting
-            time.sleep(2)
     
     except Exception as e:
         print(f"Scraper error: {str(e)}")
     
     finally:
+        if worker_started:
+            # Jobs still pending are enriched in the background after the crawl
+            enrichment_worker.stop(wait=False)
         scraper_running = False
         scraper_current_job = ""
 
@@ -111,7 +149,19 @@ def scraper_status(request):
         'progress': scraper_progress,
         'total': scraper_total,
         'current_job': scraper_current_job,
-        'percentage': int((scraper_progress / max(scraper_total, 1)) * 100)
+        'percentage': int((scraper_progress / max(scraper_total, 1)) * 100),
+        # Adaptive per-domain concurrency limits and response times
+        'domains': get_concurrency_controller().snapshot(),
+        # Durable crawl queue task counts per kind and state
+        'queue': CrawlQueue().counts(),
+        # Gemini circuit breaker state
+        'gemini': get_gemini_breaker().snapshot(),
+        # Gemini prompt/response sizes and latency per domain
+        'llm_usage': get_llm_usage().snapshot(),
+        # Jobs per Gemini enrichment status
+        'enrichment': dict(
+            JobData.objects.values_list('enrichment_status').annotate(count=Count('id')).order_by()
+        ),
     })
 
 def export_data(request):
@@ -153,7 +203,8 @@ def export_data(request):
         
         data.append(job_data)
     
-    # Create DataFrame and export to Excel
+    # Create DataFrame and export to Excel; pandas is only needed here
+    import pandas as pd
     df = pd.DataFrame(data)
     
     # Create response with Excel file